@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark: wall time and peak RSS of importing the app in a
+fresh interpreter, i.e. what each new uvicorn worker pays before serving.
+
+    python -m app.benchmarks.bench_import_time [--runs 7] [--module app.main]
+
+Also reports which heavy SDKs were imported eagerly; with the lazy client
+registry (app/core/clients.py) none of them should load at import time.
+Run `python -X importtime -c "import app.main"` for a per-module breakdown.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+HEAVY_MODULES = ("deepgram", "supabase", "postgrest", "sounddevice", "soundfile")
+
+_CHILD = """
+import json, resource, sys, time
+started = time.perf_counter()
+import {module}
+elapsed_ms = (time.perf_counter() - started) * 1000
+print(json.dumps({{
+    "ms": elapsed_ms,
+    "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "heavy": [m for m in {heavy!r} if m in sys.modules],
+}}))
+"""
+
+
+def _env():
+    env = dict(os.environ)
+    # Client construction is lazy, but some modules still read these at import
+    env.setdefault("SUPABASE_URL", "https://example.supabase.co")
+    env.setdefault("SUPABASE_KEY", "placeholder")
+    env.setdefault("DEEPGRAM_API_KEY", "placeholder")
+    return env
+
+
+def measure(module: str, runs: int):
+    code = _CHILD.format(module=module, heavy=HEAVY_MODULES)
+    samples = []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", code], env=_env(), capture_output=True, text=True, check=True
+        ).stdout
+        samples.append(json.loads(out.strip().splitlines()[-1]))
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--module", default="app.main")
+    args = parser.parse_args()
+
+    samples = measure(args.module, args.runs)
+    times = [s["ms"] for s in samples]
+    print(f"import {args.module} x{args.runs}")
+    print(f"  median {statistics.median(times):8.1f} ms   min {min(times):8.1f} ms")
+    print(f"  peak RSS {max(s['rss_mb'] for s in samples):6.1f} MB")
+    print(f"  eager heavy SDKs: {samples[0]['heavy'] or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: per-turn cost of parsing and post-processing a Groq reply.
+
+    python -m app.benchmarks.bench_llm_output
+
+Compares the single-pass helpers in app/utils/llm_output.py against the
+sequential re.sub / greedy-search steps they replaced.
+"""
+import json
+import re
+import timeit
+
+from app.utils.llm_output import (
+    JSONObjectExtractor,
+    extract_json_object,
+    normalize_ai_response,
+    strip_inline_fillers,
+)
+
+REPLY = {
+    "original_text": "My mom needs help with medication reminders, maybe 20 hours a week",
+    "translated_text": "My mom needs help with medication reminders, maybe 20 hours a week",
+    "detected_language": "en",
+    "intent": "scheduling",
+    "urgent": False,
+    "ai_response": "Perfect! — Thank you for that information.  We can   absolutely help with "
+                   "medication reminders. What days would work best for visits?",
+    "ai_response_translated": "",
+}
+CLEAN_OUTPUT = json.dumps(REPLY)
+WRAPPED_OUTPUT = "Here is the JSON you asked for:\n" + CLEAN_OUTPUT + "\nLet me know if you need more."
+STREAMED_CHUNKS = [WRAPPED_OUTPUT[i:i + 16] for i in range(0, len(WRAPPED_OUTPUT), 16)]
+
+
+# ---------- Previous implementation, kept here for comparison ----------
+
+def legacy_parse(raw_output: str):
+    try:
+        return json.loads(raw_output)
+    except json.JSONDecodeError:
+        match = re.search(r'{.*}', raw_output, re.DOTALL)
+        return json.loads(match.group()) if match else None
+
+
+def legacy_post_process(ai_response: str) -> str:
+    ai_response = re.sub(r'^(Perfect[\.!]*\s*[\-—]?\s*)', '', ai_response)
+    ai_response = re.sub(r'^(Perfecto[\.!]*\s*[\-—]?\s*)', '', ai_response)
+    ai_response = re.sub(r'^(Got it[\-—]\s*)', '', ai_response)
+    ai_response = re.sub(r'^(Entendido[\-—]\s*)', '', ai_response)
+    ai_response = re.sub(r'^(Thank you for that information\.?\s*)', '', ai_response)
+    ai_response = re.sub(r'^(Gracias por esa información\.?\s*)', '', ai_response)
+    ai_response = re.sub(r'\s+', ' ', ai_response).strip()
+    if ai_response:
+        ai_response = ai_response[0].upper() + ai_response[1:]
+    return ai_response
+
+
+def legacy_enhance(response: str) -> str:
+    response = response.replace("Perfect - ", "")
+    response = response.replace("Perfect. ", "")
+    response = re.sub(r"Got it[\-—]\s*", "", response)
+    response = re.sub(r"Entendido[\-—]\s*", "", response)
+    return response
+
+
+# ---------- Per-turn pipelines ----------
+
+def legacy_turn(raw_output: str) -> str:
+    parsed = legacy_parse(raw_output)
+    return legacy_enhance(legacy_post_process(parsed["ai_response"]))
+
+
+def current_turn(raw_output: str) -> str:
+    parsed = extract_json_object(raw_output)
+    return strip_inline_fillers(normalize_ai_response(parsed["ai_response"]))
+
+
+def streamed_turn(chunks) -> str:
+    extractor = JSONObjectExtractor()
+    for chunk in chunks:
+        objects = extractor.feed(chunk)
+        if objects:
+            return strip_inline_fillers(normalize_ai_response(objects[0]["ai_response"]))
+    return ""
+
+
+def _per_call_us(fn, arg, number: int) -> float:
+    best = min(timeit.repeat(lambda: fn(arg), number=number, repeat=5))
+    return best / number * 1e6
+
+
+def main(number: int = 20000):
+    print(f"{'case':<28}{'legacy µs':>12}{'current µs':>12}{'speedup':>10}")
+    for label, raw in (("clean JSON reply", CLEAN_OUTPUT), ("JSON wrapped in prose", WRAPPED_OUTPUT)):
+        legacy = _per_call_us(legacy_turn, raw, number)
+        current = _per_call_us(current_turn, raw, number)
+        print(f"{label:<28}{legacy:>12.2f}{current:>12.2f}{legacy / current:>9.1f}x")
+    streamed = _per_call_us(streamed_turn, STREAMED_CHUNKS, number)
+    print(f"{'streamed (16-char chunks)':<28}{'n/a':>12}{streamed:>12.2f}{'':>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+# app/core/clients.py
+# One lazily-created instance per external client, shared by the whole worker.
+# Heavy SDK imports happen on first use, not when a module is imported.
+
+import os
+import threading
+from typing import Any, Callable, Dict
+
+from app.core.config import DEEPGRAM_API_KEY, logger
+
+
+def _make_deepgram():
+    from deepgram import DeepgramClient
+    return DeepgramClient(DEEPGRAM_API_KEY)
+
+
+def _make_supabase():
+    from supabase import create_client
+    return create_client(os.getenv("SUPABASE_URL"), os.getenv("SUPABASE_KEY"))
+
+
+class ClientRegistry:
+    def __init__(self):
+        self._factories: Dict[str, Callable[[], Any]] = {}
+        self._instances: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, factory: Callable[[], Any]):
+        self._factories[name] = factory
+
+    def get(self, name: str) -> Any:
+        """Return the shared client, creating it on first use (thread-safe)."""
+        client = self._instances.get(name)
+        if client is not None:
+            return client
+        with self._lock:
+            client = self._instances.get(name)
+            if client is None:
+                client = self._factories[name]()
+                self._instances[name] = client
+                logger.info(f"🔌 Client '{name}' initialized")
+        return client
+
+    def lazy(self, name: str) -> "LazyClient":
+        """A stand-in usable as a module-level global; resolves on first attribute access."""
+        return LazyClient(self, name)
+
+    def is_initialized(self, name: str) -> bool:
+        return name in self._instances
+
+    def reset(self, name: str):
+        """Drop a client so the next use creates a fresh one."""
+        with self._lock:
+            self._instances.pop(name, None)
+
+
+class LazyClient:
+    __slots__ = ("_registry", "_name")
+
+    def __init__(self, registry: ClientRegistry, name: str):
+        object.__setattr__(self, "_registry", registry)
+        object.__setattr__(self, "_name", name)
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._registry.get(self._name), attr)
+
+    def __repr__(self) -> str:
+        state = "ready" if self._registry.is_initialized(self._name) else "pending"
+        return f"<LazyClient {self._name} ({state})>"
+
+
+clients = ClientRegistry()
+clients.register("deepgram", _make_deepgram)
+clients.register("supabase", _make_supabase)
@@ -1,8 +1,6 @@
 import os
 import logging
 from dotenv import load_dotenv
-# In your config or settings file
-from supabase import create_client, Client
 
 load_dotenv()
 
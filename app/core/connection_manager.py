@@ -1,33 +1,234 @@
 import asyncio
+import itertools
 import json
-from typing import Set, Dict, Any
+import os
+from collections import deque
+from typing import Dict, Any, List, Optional, Tuple
 from fastapi import WebSocket
 from concurrent.futures import ThreadPoolExecutor
 from app.core.config import logger
+from app.core.pubsub import build_pubsub
+from app.core.wire_format import Outgoing, common_prefix, hello_frame, session_frame
+
+BROADCAST_CHANNEL = "broadcast"
+DASHBOARD_QUEUE_SIZE = int(os.getenv("DASHBOARD_QUEUE_SIZE", "256"))
+
+ALL = ("*",)
+
+
+def _topic_key(company_id=None, office_id=None, session_id=None) -> Tuple:
+    """Index key for a subscriber: its most specific filter wins."""
+    if session_id:
+        return ("session", session_id)
+    if office_id:
+        return ("office", office_id)
+    if company_id:
+        return ("company", company_id)
+    return ALL
+
+
+def _is_droppable(message: Dict[str, Any]) -> bool:
+    # Interim transcripts are superseded by the next one; everything else must arrive
+    return message.get("type") == "transcript" and message.get("is_final") is False
+
+
+class Subscriber:
+    """One dashboard socket with its own bounded send queue and writer task."""
+
+    def __init__(self, websocket: WebSocket, key: Tuple, maxsize: int = DASHBOARD_QUEUE_SIZE,
+                 compact: bool = False):
+        self.websocket = websocket
+        self.key = key
+        self.maxsize = maxsize
+        self.compact = compact
+        self.queue: deque = deque()
+        self.dropped = 0
+        # compact mode: sid -> last interim seq delivered (None = announced, no interim base)
+        self.seen: Dict[int, Optional[int]] = {}
+        self._wakeup = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+
+    def offer(self, out: Outgoing) -> bool:
+        """Queue a frame; when full, drop the oldest interim. False if nothing could be dropped."""
+        if len(self.queue) >= self.maxsize:
+            for i, old in enumerate(self.queue):
+                if old.droppable:
+                    del self.queue[i]
+                    self.dropped += 1
+                    break
+            else:
+                if out.droppable:
+                    self.dropped += 1
+                    return True
+                return False
+        self.queue.append(out)
+        self._wakeup.set()
+        return True
+
+    async def run(self):
+        while True:
+            await self._wakeup.wait()
+            while self.queue:
+                await self._send(self.queue.popleft())
+            self._wakeup.clear()
+
+    async def _send(self, out: Outgoing):
+        if not self.compact:
+            await self.websocket.send_text(out.json())
+            return
+        if out.sid is not None and out.sid not in self.seen:
+            await self.websocket.send_bytes(session_frame(out.sid, out.session_id))
+            self.seen[out.sid] = None
+        # A delta is only usable if this socket saw its base (nothing dropped in between)
+        use_delta = out.base is not None and self.seen.get(out.sid) == out.base
+        await self.websocket.send_bytes(out.compact(delta=use_delta))
+        if out.sid is not None:
+            self.seen[out.sid] = out.seq
+
 
 class ConnectionManager:
-    def __init__(self):
-        self.active_connections: Set[WebSocket] = set()
-        self.loop = asyncio.get_event_loop()
+    def __init__(self, pubsub=None):
+        # topic key -> {websocket: Subscriber}; each socket sits under exactly one key
+        self.topics: Dict[Tuple, Dict[WebSocket, Subscriber]] = {}
+        self.subscribers: Dict[WebSocket, Subscriber] = {}
+        # compact wire format: small stable id per call, last interim per call
+        self._sids: Dict[str, int] = {}
+        self._next_sid = itertools.count(1)
+        self._interims: Dict[str, Tuple[int, str]] = {}
+        self._loop = None  # captured from the server loop; none exists at import time
         self.executor = ThreadPoolExecutor(max_workers=4)
+        # Dashboards may be attached to any worker; broadcasts from other
+        # workers arrive here and are delivered to this worker's sockets only.
+        self.pubsub = pubsub or build_pubsub()
+        self.pubsub.subscribe(BROADCAST_CHANNEL, self._on_remote)
 
-    async def connect(self, websocket: WebSocket):
-        await websocket.accept()
-        self.active_connections.add(websocket)
-        logger.info("✅ New WebSocket connection")
+    @property
+    def loop(self):
+        if self._loop is None:
+            try:
+                self._loop = asyncio.get_running_loop()
+            except RuntimeError:
+                return asyncio.get_event_loop()
+        return self._loop
+
+    @property
+    def active_connections(self):
+        return set(self.subscribers)
+
+    async def connect(self, websocket: WebSocket, company_id: Optional[str] = None,
+                      office_id: Optional[str] = None, session_id: Optional[str] = None,
+                      compact: bool = False, subprotocol: Optional[str] = None):
+        self._loop = asyncio.get_running_loop()
+        await websocket.accept(subprotocol=subprotocol)
+        if compact:
+            await websocket.send_bytes(hello_frame())
+        self._add(websocket, _topic_key(company_id, office_id, session_id), compact)
+        logger.info(f"✅ New WebSocket connection{' (msgpack)' if compact else ''}")
+
+    def subscribe(self, websocket: WebSocket, company_id: Optional[str] = None,
+                  office_id: Optional[str] = None, session_id: Optional[str] = None):
+        """Move an already-connected socket to a different topic."""
+        sub = self.subscribers.get(websocket)
+        if not sub:
+            return
+        self.topics.get(sub.key, {}).pop(websocket, None)
+        sub.key = _topic_key(company_id, office_id, session_id)
+        self.topics.setdefault(sub.key, {})[websocket] = sub
+
+    def _add(self, websocket: WebSocket, key: Tuple, compact: bool = False):
+        sub = Subscriber(websocket, key, compact=compact)
+        sub.task = asyncio.create_task(self._writer(sub))
+        self.subscribers[websocket] = sub
+        self.topics.setdefault(key, {})[websocket] = sub
+
+    async def _writer(self, sub: Subscriber):
+        try:
+            await sub.run()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.info(f"🔌 Dashboard send failed, dropping client: {e}")
+            self._remove(sub.websocket)
+
+    def _remove(self, websocket: WebSocket) -> Optional[Subscriber]:
+        sub = self.subscribers.pop(websocket, None)
+        if sub:
+            self.topics.get(sub.key, {}).pop(websocket, None)
+            if not self.topics.get(sub.key):
+                self.topics.pop(sub.key, None)
+        return sub
 
     async def disconnect(self, websocket: WebSocket):
-        if websocket in self.active_connections:    
-            self.active_connections.remove(websocket)
+        sub = self._remove(websocket)
+        if sub:
+            if sub.task and sub.task is not asyncio.current_task():
+                sub.task.cancel()
             logger.info("🔌 WebSocket disconnected")
 
-    async def broadcast(self, message: Dict[str, Any]):
-        if not self.active_connections:
-            return
-        data = json.dumps(message)
-        await asyncio.gather(
-            *(conn.send_text(data) for conn in self.active_connections.copy()),
-            return_exceptions=True
-        )
+    def _audience(self, company_id, office_id, session_id) -> List[Subscriber]:
+        keys = [ALL]
+        if company_id:
+            keys.append(("company", company_id))
+        if office_id:
+            keys.append(("office", office_id))
+        if session_id:
+            keys.append(("session", session_id))
+        audience = []
+        for key in keys:
+            audience.extend(self.topics.get(key, {}).values())
+        return audience
+
+    async def broadcast(self, message: Dict[str, Any], company_id: Optional[str] = None,
+                        office_id: Optional[str] = None, session_id: Optional[str] = None):
+        """
+        Deliver to sockets subscribed to this call's session, office, company
+        or to everything. Serialized once; never waits on a slow client.
+        """
+        session_id = session_id or message.get("session_id")
+        out = Outgoing(message, droppable=_is_droppable(message))
+        self._deliver(out, company_id, office_id, session_id)
+        header = json.dumps([company_id, office_id, session_id, out.droppable])
+        await self.pubsub.publish(BROADCAST_CHANNEL, f"{header}\n{out.json()}")
+
+    async def _on_remote(self, payload: str):
+        header, data = payload.split("\n", 1)
+        company_id, office_id, session_id, droppable = json.loads(header)
+        self._deliver(Outgoing(data=data, droppable=droppable), company_id, office_id, session_id)
+
+    def _sequence(self, out: Outgoing, session_id: str):
+        """Assign the call's sid and, for interims, the delta against the previous partial."""
+        out.session_id = session_id
+        out.sid = self._sids.get(session_id)
+        if out.sid is None:
+            out.sid = self._sids[session_id] = next(self._next_sid)
+        if out.droppable:
+            text = out.message.get("transcript") or ""
+            prev = self._interims.get(session_id)
+            out.seq = prev[0] + 1 if prev else 0
+            if prev:
+                out.base, out.keep = prev[0], common_prefix(prev[1], text)
+            self._interims[session_id] = (out.seq, text)
+        else:
+            self._interims.pop(session_id, None)
+            if out.message.get("session_closed"):
+                self._sids.pop(session_id, None)
+
+    def _deliver(self, out: Outgoing, company_id, office_id, session_id):
+        audience = self._audience(company_id, office_id, session_id)
+        if session_id and any(sub.compact for sub in audience):
+            self._sequence(out, session_id)
+        for sub in audience:
+            if not sub.offer(out):
+                logger.warning(f"⚠️ Dashboard client stalled ({sub.maxsize} queued), disconnecting")
+                self._remove(sub.websocket)
+                if sub.task:
+                    sub.task.cancel()
+                asyncio.create_task(self._close(sub.websocket))
+
+    async def _close(self, websocket: WebSocket):
+        try:
+            await websocket.close(code=1013)  # try again later
+        except Exception:
+            pass
 
 manager = ConnectionManager()
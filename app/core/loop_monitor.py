@@ -0,0 +1,194 @@
+# app/core/loop_monitor.py
+# Event-loop lag monitor and blocking-call detector.
+#
+# A heartbeat task sleeps LOOP_MONITOR_INTERVAL_MS and records how late it
+# wakes up (scheduling delay) into a histogram. A watchdog thread checks
+# the heartbeat; once it is more than LOOP_MONITOR_THRESHOLD_MS overdue,
+# the loop thread is stuck in something synchronous (a Supabase
+# .execute(), requests.post, the Deepgram SDK...), so the watchdog grabs
+# that thread's stack right then. When the loop recovers, the stall is
+# attributed to the innermost app/ frame of that stack and counted per call
+# site. Off by default; LOOP_MONITOR_ENABLED at startup or
+# POST /debug/loop-monitor at runtime.
+
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from typing import Any, Dict, List, Optional
+
+from app.core.config import logger
+from app.core.metrics import registry
+
+LOOP_MONITOR_INTERVAL_MS = float(os.getenv("LOOP_MONITOR_INTERVAL_MS", "50"))
+LOOP_MONITOR_THRESHOLD_MS = float(os.getenv("LOOP_MONITOR_THRESHOLD_MS", "100"))
+LOOP_MONITOR_STACK_DEPTH = 25
+LOOP_MONITOR_MIN_THRESHOLD_MS = 20.0   # below this, ordinary timer jitter reads as stalls
+
+LOOP_LAG_SECONDS = registry.histogram(
+    "servoice_event_loop_lag_seconds", "How late the event loop ran a timer scheduled to fire.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0))
+LOOP_STALLS_TOTAL = registry.counter(
+    "servoice_event_loop_stalls_total", "Event-loop stalls over the threshold, by blocking call site.", ["site"])
+LOOP_STALL_SECONDS_TOTAL = registry.counter(
+    "servoice_event_loop_stall_seconds_total", "Time the event loop spent stalled, by blocking call site.", ["site"])
+
+_APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_ROOT_DIR = os.path.dirname(_APP_DIR)
+_THIS_FILE = os.path.abspath(__file__)
+UNKNOWN_SITE = "unknown"
+
+
+def _where(frame: traceback.FrameSummary) -> str:
+    path = frame.filename
+    if path.startswith(_ROOT_DIR + os.sep):
+        path = os.path.relpath(path, _ROOT_DIR)
+    return f"{path}:{frame.lineno} {frame.name}"
+
+
+def _call_site(stack: List[traceback.FrameSummary]) -> str:
+    """Innermost frame in our own code: the line that made the blocking call."""
+    for frame in reversed(stack):
+        if frame.filename.startswith(_APP_DIR + os.sep) and frame.filename != _THIS_FILE:
+            return _where(frame)
+    return _where(stack[-1]) if stack else UNKNOWN_SITE
+
+
+class LoopMonitor:
+    def __init__(self, interval_ms: float = LOOP_MONITOR_INTERVAL_MS,
+                 threshold_ms: float = LOOP_MONITOR_THRESHOLD_MS):
+        self.interval = interval_ms / 1000
+        self.threshold = threshold_ms / 1000
+        self.beats = 0
+        self.max_lag = 0.0
+        self.sites: Dict[str, Dict[str, Any]] = {}
+        self._loop_thread: Optional[int] = None
+        self._due: Optional[float] = None        # monotonic time the next heartbeat should run
+        self._capture: Optional[Dict[str, Any]] = None   # stack grabbed during the current stall
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._halt = threading.Event()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._task and not self._task.done())
+
+    # ---------- Heartbeat (loop thread) ----------
+
+    async def _heartbeat(self):
+        while True:
+            self._due = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.monotonic() - self._due)
+            self.beats += 1
+            self.max_lag = max(self.max_lag, lag)
+            LOOP_LAG_SECONDS.observe(lag)
+            if lag >= self.threshold:
+                self._record_stall(lag)
+
+    def _record_stall(self, lag: float):
+        with self._lock:
+            capture, self._capture = self._capture, None
+        site = capture["site"] if capture else UNKNOWN_SITE
+        stats = self.sites.setdefault(site, {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+        stats["count"] += 1
+        stats["total_ms"] += lag * 1000
+        stats["max_ms"] = max(stats["max_ms"], lag * 1000)
+        stats["last_at"] = time.time()
+        if capture:
+            stats["blocked_in"] = capture["blocked_in"]
+            stats["stack"] = capture["stack"]
+        LOOP_STALLS_TOTAL.inc(site=site)
+        LOOP_STALL_SECONDS_TOTAL.inc(lag, site=site)
+        logger.warning(f"🐢 Event loop blocked {lag * 1000:.0f}ms at {site}")
+
+    # ---------- Watchdog (own thread) ----------
+
+    def _watch(self):
+        poll = max(0.005, self.threshold / 4)
+        while not self._halt.wait(poll):
+            due = self._due
+            if due is None or time.monotonic() - due < self.threshold:
+                continue
+            with self._lock:
+                if self._capture is None or self._capture["due"] != due:
+                    self._capture = self._grab(due)
+
+    def _grab(self, due: float) -> Optional[Dict[str, Any]]:
+        frame = sys._current_frames().get(self._loop_thread)
+        if frame is None:
+            return None
+        stack = traceback.extract_stack(frame)[-LOOP_MONITOR_STACK_DEPTH:]
+        return {
+            "due": due,
+            "site": _call_site(stack),
+            "blocked_in": _where(stack[-1]) if stack else UNKNOWN_SITE,
+            "stack": [line.rstrip("\n") for line in traceback.format_list(stack)],
+        }
+
+    # ---------- Control ----------
+
+    def start(self):
+        """Must be called from the event loop thread."""
+        if self.enabled:
+            return
+        self._loop_thread = threading.get_ident()
+        self._due = None
+        self._halt.clear()
+        self._task = asyncio.get_running_loop().create_task(self._heartbeat())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-monitor", daemon=True)
+        self._watchdog.start()
+        logger.info(f"🩺 Loop monitor started (every {self.interval * 1000:.0f}ms, "
+                    f"stalls over {self.threshold * 1000:.0f}ms)")
+
+    async def stop(self):
+        self._halt.set()
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._watchdog:
+            self._watchdog.join(timeout=1)
+            self._watchdog = None
+        self._due = None
+
+    async def configure(self, enabled: Optional[bool] = None, threshold_ms: Optional[float] = None,
+                        reset: bool = False):
+        """Runtime toggle for the debug endpoint."""
+        if threshold_ms is not None and threshold_ms < LOOP_MONITOR_MIN_THRESHOLD_MS:
+            raise ValueError(f"threshold_ms must be at least {LOOP_MONITOR_MIN_THRESHOLD_MS:g}")
+        if threshold_ms is not None:
+            self.threshold = threshold_ms / 1000
+            if self.enabled:
+                await self.stop()   # the watchdog's poll rate follows the threshold
+                self.start()
+        if reset:
+            self.sites = {}
+            self.beats = 0
+            self.max_lag = 0.0
+        if enabled is True:
+            self.start()
+        elif enabled is False:
+            await self.stop()
+
+    def snapshot(self) -> Dict[str, Any]:
+        sites = sorted(self.sites.items(), key=lambda item: item[1]["total_ms"], reverse=True)
+        return {
+            "enabled": self.enabled,
+            "interval_ms": self.interval * 1000,
+            "threshold_ms": self.threshold * 1000,
+            "beats": self.beats,
+            "max_lag_ms": round(self.max_lag * 1000, 1),
+            "stalls": sum(stats["count"] for _, stats in sites),
+            "sites": [{"site": site, **stats, "total_ms": round(stats["total_ms"], 1),
+                       "max_ms": round(stats["max_ms"], 1)} for site, stats in sites],
+        }
+
+
+loop_monitor = LoopMonitor()
@@ -0,0 +1,113 @@
+# app/core/metrics.py
+# Prometheus counters and histograms rendered in the text exposition format (0.0.4).
+#
+# Small enough not to need prometheus_client: per-label-set totals and
+# cumulative bucket counts, _sum and _count, rendered on scrape. Each worker exposes
+# its own series, as with the client library's default (non-multiprocess)
+# mode.
+
+import bisect
+import threading
+from typing import Dict, List, Sequence, Tuple, Union
+
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(pairs: Sequence[Tuple[str, str]]) -> str:
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if value != float("inf") else "+Inf"
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            snapshot = sorted(self._values.items())
+        for key, value in snapshot:
+            lines.append(f"{self.name}{_format_labels(list(zip(self.labelnames, key)))} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts (+Inf last), sum]
+        self._series: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = [(key, list(counts), total) for key, (counts, total) in self._series.items()]
+        for key, counts, total in sorted(snapshot):
+            pairs = list(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                labels = _format_labels(pairs + [("le", _format_value(bound))])
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(pairs)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(pairs)} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, Union[Counter, Histogram]] = {}
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        if name not in self._metrics:
+            self._metrics[name] = Counter(name, documentation, labelnames)
+        return self._metrics[name]
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        """Get or create; modules register their metrics at import time."""
+        if name not in self._metrics:
+            self._metrics[name] = Histogram(name, documentation, labelnames, buckets)
+        return self._metrics[name]
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
@@ -0,0 +1,140 @@
+# app/core/pubsub.py
+# Cross-worker fan-out for dashboard broadcasts.
+#
+# publish() only reaches *other* workers; each worker delivers to its own
+# WebSocket clients directly. The memory backend is a no-op for single-process
+# deployments; the SQLite backend shares an append-only events table. Its
+# queries run in worker threads so a busy database never stalls the loop.
+
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import defaultdict
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from app.core.config import logger
+from app.core.session_store import STATE_BACKEND, STATE_SQLITE_PATH
+
+PUBSUB_POLL_MS = float(os.getenv("PUBSUB_POLL_MS", "50"))
+PUBSUB_RETENTION_S = float(os.getenv("PUBSUB_RETENTION_S", "60"))
+
+Handler = Callable[[str], Awaitable[None]]
+
+
+class LocalPubSub:
+    """Single-process default: there are no other workers to reach."""
+
+    def __init__(self):
+        self.worker_id = f"{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self._handlers: Dict[str, List[Handler]] = defaultdict(list)
+
+    def subscribe(self, channel: str, handler: Handler):
+        self._handlers[channel].append(handler)
+
+    async def publish(self, channel: str, payload: str):
+        pass
+
+    async def start(self):
+        pass
+
+    async def stop(self):
+        pass
+
+    async def _dispatch(self, channel: str, payload: str):
+        for handler in self._handlers.get(channel, ()):
+            try:
+                await handler(payload)
+            except Exception as e:
+                logger.error(f"❌ PubSub handler for '{channel}' failed: {e}")
+
+
+class SQLitePubSub(LocalPubSub):
+    """Events table in the shared SQLite file, tailed by each worker."""
+
+    def __init__(self, path: str = STATE_SQLITE_PATH, poll_interval: float = PUBSUB_POLL_MS / 1000):
+        super().__init__()
+        self.path = path
+        self.poll_interval = poll_interval
+        self._local = threading.local()
+        self._task: Optional[asyncio.Task] = None
+        self._last_id = 0
+        conn = self._conn()
+        conn.execute(
+            "create table if not exists events ("
+            " id integer primary key autoincrement, channel text not null,"
+            " origin text not null, payload text not null, created_at real not null)"
+        )
+        # Only deliver events published after this worker started
+        self._last_id = conn.execute("select coalesce(max(id), 0) from events").fetchone()[0]
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("pragma journal_mode=wal")
+            conn.execute("pragma synchronous=normal")
+            self._local.conn = conn
+        return conn
+
+    async def publish(self, channel: str, payload: str):
+        await asyncio.to_thread(self._insert, channel, payload)
+
+    def _insert(self, channel: str, payload: str):
+        self._conn().execute(
+            "insert into events (channel, origin, payload, created_at) values (?, ?, ?, ?)",
+            (channel, self.worker_id, payload, time.time()),
+        )
+
+    def _fetch_new(self):
+        rows = self._conn().execute(
+            "select id, channel, origin, payload from events where id > ? order by id", (self._last_id,)
+        ).fetchall()
+        if rows:
+            self._last_id = rows[-1][0]
+        return [(channel, payload) for _, channel, origin, payload in rows if origin != self.worker_id]
+
+    def _prune(self):
+        self._conn().execute("delete from events where created_at < ?", (time.time() - PUBSUB_RETENTION_S,))
+
+    async def poll_once(self) -> int:
+        events = await asyncio.to_thread(self._fetch_new)
+        for channel, payload in events:
+            await self._dispatch(channel, payload)
+        return len(events)
+
+    async def _run(self):
+        last_prune = time.monotonic()
+        while True:
+            try:
+                await self.poll_once()
+                if time.monotonic() - last_prune > PUBSUB_RETENTION_S:
+                    await asyncio.to_thread(self._prune)
+                    last_prune = time.monotonic()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ PubSub poll failed: {e}")
+            await asyncio.sleep(self.poll_interval)
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            logger.info(f"📡 SQLite pub/sub started for worker {self.worker_id}")
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+def build_pubsub(backend: str = STATE_BACKEND):
+    if backend == "sqlite":
+        return SQLitePubSub(STATE_SQLITE_PATH)
+    return LocalPubSub()
@@ -0,0 +1,213 @@
+# app/core/session_store.py
+# Pluggable backing store for ConversationManager sessions.
+#
+# Each Twilio call is pinned to the worker that accepted its WebSocket, so
+# that worker's in-memory dict stays the source of truth for the call. A
+# shared store only makes sessions visible to the other workers (history,
+# dashboards). The default memory backend keeps everything in-process.
+#
+# save() is called on the event loop for every session change, so the
+# SQLite backend only serializes what changed (the session header and new
+# messages) and queues it; a writer thread coalesces each session's
+# pending changes and writes them every STATE_WRITE_BEHIND_MS.
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from app.core.config import logger
+
+STATE_BACKEND = os.getenv("STATE_BACKEND", "memory")            # memory | sqlite
+STATE_SQLITE_PATH = os.getenv("STATE_SQLITE_PATH", "servoice_state.db")
+STATE_WRITE_BEHIND_MS = float(os.getenv("STATE_WRITE_BEHIND_MS", "100"))
+
+
+class MemorySessionStore:
+    """Single-process default: nothing leaves the worker."""
+
+    shared = False
+
+    def save(self, session_id: str, session: Dict[str, Any]):
+        pass
+
+    def load(self, session_id: str) -> Optional[Dict[str, Any]]:
+        return None
+
+    def load_all(self, status: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        return {}
+
+    def delete(self, session_id: str):
+        pass
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        return True
+
+
+class SQLiteSessionStore:
+    """
+    Sessions in a local SQLite file (WAL mode), shared by every worker on the
+    host: one JSON row per session without its messages, one per message.
+    """
+
+    shared = True
+
+    def __init__(self, path: str = STATE_SQLITE_PATH, write_behind: float = STATE_WRITE_BEHIND_MS / 1000):
+        self.path = path
+        self.write_behind = write_behind
+        self._local = threading.local()
+        conn = self._conn()
+        conn.execute(
+            "create table if not exists sessions ("
+            " id text primary key, status text, updated_at real, data text not null)"
+        )
+        conn.execute("create index if not exists sessions_status_idx on sessions (status)")
+        conn.execute(
+            "create table if not exists session_messages ("
+            " session_id text not null, seq integer not null, data text not null,"
+            " primary key (session_id, seq))"
+        )
+        self._saved: Dict[str, int] = {}                  # session -> messages already queued
+        self._pending: Dict[str, Optional[Dict[str, Any]]] = {}   # None = delete
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._idle = threading.Event()
+        self._idle.set()
+        self._writer = threading.Thread(target=self._write_loop, name="session-store-writer", daemon=True)
+        self._writer.start()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("pragma journal_mode=wal")
+            conn.execute("pragma synchronous=normal")
+            self._local.conn = conn
+        return conn
+
+    # ---------- Event loop side ----------
+
+    def save(self, session_id: str, session: Dict[str, Any]):
+        """Queue the change; serializes the header and messages added since the last save."""
+        header = json.dumps({k: v for k, v in session.items() if k != "messages"}, default=str)
+        messages = session.get("messages") or []
+        saved = self._saved.get(session_id, 0)
+        # The latest turn's entry is still updated after add_message (latency, metadata)
+        start = max(0, min(saved, len(messages)) - 1)
+        rows = {seq: json.dumps(m, default=str) for seq, m in enumerate(messages[start:], start)}
+        self._saved[session_id] = len(messages)
+        with self._lock:
+            pending = self._pending.get(session_id) or {"messages": {}}
+            pending.update(status=session.get("status"), header=header, count=len(messages))
+            pending["messages"].update(rows)
+            self._pending[session_id] = pending
+            self._idle.clear()
+        self._wake.set()
+
+    def delete(self, session_id: str):
+        self._saved.pop(session_id, None)
+        with self._lock:
+            self._pending[session_id] = None
+            self._idle.clear()
+        self._wake.set()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until queued changes are written (tests, shutdown)."""
+        self._wake.set()
+        return self._idle.wait(timeout)
+
+    # ---------- Writer thread ----------
+
+    def _write_loop(self):
+        while True:
+            self._wake.wait()
+            time.sleep(self.write_behind)   # let a turn's saves coalesce
+            self._wake.clear()
+            with self._lock:
+                batch, self._pending = self._pending, {}
+            try:
+                self._write(batch)
+            except Exception as e:
+                logger.error(f"❌ Session store write failed for {len(batch)} session(s), retrying: {e}")
+                self._requeue(batch)
+                time.sleep(1.0)
+                continue
+            with self._lock:
+                if not self._pending:
+                    self._idle.set()
+
+    def _requeue(self, batch: Dict[str, Optional[Dict[str, Any]]]):
+        """Put a failed batch back under anything queued since; newer changes win."""
+        with self._lock:
+            for session_id, change in batch.items():
+                newer = self._pending.get(session_id, change)
+                if newer is not None and change is not None and newer is not change:
+                    newer["messages"] = {**change["messages"], **newer["messages"]}
+                self._pending[session_id] = newer
+        self._wake.set()
+
+    def _write(self, batch: Dict[str, Optional[Dict[str, Any]]]):
+        conn = self._conn()
+        conn.execute("begin")
+        try:
+            for session_id, change in batch.items():
+                if change is None:
+                    conn.execute("delete from sessions where id = ?", (session_id,))
+                    conn.execute("delete from session_messages where session_id = ?", (session_id,))
+                    continue
+                conn.execute(
+                    "insert into sessions (id, status, updated_at, data) values (?, ?, ?, ?) "
+                    "on conflict(id) do update set status = excluded.status, "
+                    "updated_at = excluded.updated_at, data = excluded.data",
+                    (session_id, change["status"], time.time(), change["header"]),
+                )
+                conn.executemany(
+                    "insert or replace into session_messages (session_id, seq, data) values (?, ?, ?)",
+                    [(session_id, seq, data) for seq, data in change["messages"].items()],
+                )
+                conn.execute("delete from session_messages where session_id = ? and seq >= ?",
+                             (session_id, change["count"]))
+            conn.execute("commit")
+        except Exception:
+            conn.execute("rollback")
+            raise
+
+    # ---------- Reads ----------
+
+    def _with_messages(self, rows) -> Dict[str, Dict[str, Any]]:
+        sessions = {sid: json.loads(data) for sid, data in rows}
+        if not sessions:
+            return sessions
+        marks = ",".join("?" * len(sessions))
+        messages = self._conn().execute(
+            f"select session_id, data from session_messages where session_id in ({marks}) order by session_id, seq",
+            list(sessions),
+        )
+        loaded: Dict[str, list] = {}
+        for sid, data in messages:
+            loaded.setdefault(sid, []).append(json.loads(data))
+        for sid, session in sessions.items():
+            # Rows written before messages had their own table still embed them
+            if sid in loaded or "messages" not in session:
+                session["messages"] = loaded.get(sid, [])
+        return sessions
+
+    def load(self, session_id: str) -> Optional[Dict[str, Any]]:
+        rows = self._conn().execute("select id, data from sessions where id = ?", (session_id,)).fetchall()
+        return self._with_messages(rows).get(session_id)
+
+    def load_all(self, status: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        if status:
+            rows = self._conn().execute("select id, data from sessions where status = ?", (status,)).fetchall()
+        else:
+            rows = self._conn().execute("select id, data from sessions").fetchall()
+        return self._with_messages(rows)
+
+
+def build_session_store(backend: str = STATE_BACKEND):
+    if backend == "sqlite":
+        logger.info(f"🗄️ Session store: SQLite at {STATE_SQLITE_PATH}")
+        return SQLiteSessionStore(STATE_SQLITE_PATH)
+    return MemorySessionStore()
@@ -0,0 +1,140 @@
+# app/core/wire_format.py
+# Wire encodings for /transcripts/stream.
+#
+# "json" is the original text frame: the full message entry. "msgpack" is
+# the compact binary mode a dashboard can negotiate:
+#   - map keys are small integer field ids (sent once in the hello frame),
+#   - calls are referenced by a small per-worker sid, announced once per
+#     socket with a "session" frame carrying the full session_id,
+#   - fields that repeat another field (ai_response_translated when equal
+#     to ai_response, translated_text when equal to transcript) and None
+#     values are omitted,
+#   - interim transcripts are deltas: text = previous[:keep] + transcript,
+#     valid when the client's last seq for that sid equals base.
+
+import json
+from typing import Any, Dict, Optional
+
+try:
+    import msgpack
+except ImportError:  # compact mode is optional; clients fall back to JSON
+    msgpack = None
+
+SUBPROTOCOL = "servoice.msgpack.v1"
+WIRE_VERSION = 1
+
+FIELDS = (
+    "type", "session_id", "transcript", "is_final", "language", "timestamp",
+    "id", "translated_text", "intent", "ai_response", "ai_response_translated",
+    "urgent", "sentiment", "audio_id", "session_closed",
+)
+FIELD_IDS = {name: i for i, name in enumerate(FIELDS)}
+
+# Control keys live above the field-id range
+SID, SEQ, BASE, KEEP = 100, 101, 102, 103
+CONTROL = {"sid": SID, "seq": SEQ, "base": BASE, "keep": KEEP}
+
+# Dropped when they only repeat another field
+_DUPLICATES = {"ai_response_translated": "ai_response", "translated_text": "transcript"}
+
+
+def compact_available() -> bool:
+    return msgpack is not None
+
+
+def negotiate(websocket) -> Optional[str]:
+    """Return the accepted subprotocol if the client asked for compact mode."""
+    if not compact_available():
+        return None
+    if SUBPROTOCOL in websocket.scope.get("subprotocols", ()):
+        return SUBPROTOCOL
+    return None
+
+
+def wants_compact(websocket) -> bool:
+    return compact_available() and (
+        negotiate(websocket) is not None or websocket.query_params.get("format") == "msgpack"
+    )
+
+
+def _pack(obj: Dict[Any, Any]) -> bytes:
+    return msgpack.packb(obj, use_bin_type=True)
+
+
+def hello_frame() -> bytes:
+    return _pack({"type": "hello", "version": WIRE_VERSION, "fields": list(FIELDS), "control": CONTROL})
+
+
+def session_frame(sid: int, session_id: str) -> bytes:
+    return _pack({FIELD_IDS["type"]: "session", SID: sid, FIELD_IDS["session_id"]: session_id})
+
+
+def _compact_fields(message: Dict[str, Any]) -> Dict[Any, Any]:
+    out: Dict[Any, Any] = {}
+    for key, value in message.items():
+        if value is None or key == "session_id":
+            continue
+        dup_of = _DUPLICATES.get(key)
+        if dup_of and message.get(dup_of) == value:
+            continue
+        out[FIELD_IDS.get(key, key)] = value
+    return out
+
+
+class Outgoing:
+    """
+    One broadcast, encoded lazily and at most once per format no matter how
+    many sockets receive it.
+    """
+
+    __slots__ = ("droppable", "sid", "session_id", "seq", "base", "keep",
+                 "_message", "_json", "_full", "_delta")
+
+    def __init__(self, message: Optional[Dict[str, Any]] = None, data: Optional[str] = None,
+                 droppable: bool = False):
+        self._message = message
+        self._json = data
+        self.droppable = droppable
+        self.session_id: Optional[str] = None
+        self.sid: Optional[int] = None
+        self.seq: Optional[int] = None     # interim sequence number for this sid
+        self.base: Optional[int] = None    # seq the delta applies to
+        self.keep = 0                      # shared prefix length with the base text
+        self._full = None
+        self._delta = None
+
+    @property
+    def message(self) -> Dict[str, Any]:
+        if self._message is None:
+            self._message = json.loads(self._json)
+        return self._message
+
+    def json(self) -> str:
+        if self._json is None:
+            self._json = json.dumps(self._message)
+        return self._json
+
+    def compact(self, delta: bool = False) -> bytes:
+        if delta and self.base is not None:
+            if self._delta is None:
+                fields = _compact_fields(self.message)
+                fields[FIELD_IDS["transcript"]] = self.message.get("transcript", "")[self.keep:]
+                fields.update({SID: self.sid, SEQ: self.seq, BASE: self.base, KEEP: self.keep})
+                self._delta = _pack(fields)
+            return self._delta
+        if self._full is None:
+            fields = _compact_fields(self.message)
+            if self.sid is not None:
+                fields[SID] = self.sid
+            if self.seq is not None:
+                fields[SEQ] = self.seq
+            self._full = _pack(fields)
+        return self._full
+
+
+def common_prefix(a: str, b: str) -> int:
+    n = min(len(a), len(b))
+    i = 0
+    while i < n and a[i] == b[i]:
+        i += 1
+    return i
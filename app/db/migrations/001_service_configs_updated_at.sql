@@ -0,0 +1,18 @@
+-- Change feed for service_configs: the config watcher polls updated_at.
+
+alter table service_configs
+    add column if not exists updated_at timestamptz not null default now();
+
+create or replace function set_updated_at() returns trigger as $$
+begin
+    new.updated_at = now();
+    return new;
+end;
+$$ language plpgsql;
+
+drop trigger if exists service_configs_set_updated_at on service_configs;
+create trigger service_configs_set_updated_at
+    before update on service_configs
+    for each row execute function set_updated_at();
+
+create index if not exists service_configs_updated_at_idx on service_configs (updated_at);
@@ -0,0 +1,15 @@
+-- Keyset pagination for GET /conversation-history (app/services/history_service.py).
+-- Pages are ordered by (started_at desc, id desc) with optional tenant filters.
+
+create index if not exists conversations_tenant_started_idx
+    on conversations (company_id, office_id, started_at desc, id desc);
+
+create index if not exists conversations_started_idx
+    on conversations (started_at desc, id desc);
+
+create index if not exists conversations_status_started_idx
+    on conversations (status, started_at desc, id desc);
+
+-- Embedded message bodies are fetched per conversation in timestamp order.
+create index if not exists messages_session_timestamp_idx
+    on messages (session_id, timestamp);
@@ -0,0 +1,60 @@
+-- Hourly call analytics per tenant/office, incremented as sessions close
+-- (app/services/call_rollups.py). Served by GET /analytics/rollups.
+
+create table if not exists call_rollups_hourly (
+    company_id      uuid not null,
+    office_id       uuid,
+    hour            timestamp not null,
+    calls           integer not null default 0,
+    turns           integer not null default 0,
+    urgent_calls    integer not null default 0,
+    intents         jsonb not null default '{}'::jsonb,
+    closed_by       jsonb not null default '{}'::jsonb,
+    latency_ms_sum  double precision not null default 0,
+    latency_samples integer not null default 0
+);
+
+create unique index if not exists call_rollups_hourly_key
+    on call_rollups_hourly (company_id, coalesce(office_id, '00000000-0000-0000-0000-000000000000'::uuid), hour);
+
+create index if not exists call_rollups_hourly_tenant_hour_idx
+    on call_rollups_hourly (company_id, hour);
+
+-- {"a": 1} + {"a": 2, "b": 1} = {"a": 3, "b": 1}
+create or replace function jsonb_add_counts(a jsonb, b jsonb) returns jsonb as $$
+    select coalesce(jsonb_object_agg(key, total), '{}'::jsonb)
+    from (
+        select key, sum(value::numeric)::integer as total
+        from (
+            select * from jsonb_each_text(coalesce(a, '{}'::jsonb))
+            union all
+            select * from jsonb_each_text(coalesce(b, '{}'::jsonb))
+        ) pairs
+        group by key
+    ) sums;
+$$ language sql immutable;
+
+-- Atomic add of one worker's delta; concurrent workers serialize on the row lock.
+create or replace function increment_call_rollup(
+    p_company_id uuid, p_office_id uuid, p_hour timestamp,
+    p_calls integer, p_turns integer, p_urgent_calls integer,
+    p_intents jsonb, p_closed_by jsonb,
+    p_latency_ms_sum double precision, p_latency_samples integer
+) returns void as $$
+    insert into call_rollups_hourly as r (
+        company_id, office_id, hour, calls, turns, urgent_calls,
+        intents, closed_by, latency_ms_sum, latency_samples
+    ) values (
+        p_company_id, p_office_id, p_hour, p_calls, p_turns, p_urgent_calls,
+        p_intents, p_closed_by, p_latency_ms_sum, p_latency_samples
+    )
+    on conflict (company_id, coalesce(office_id, '00000000-0000-0000-0000-000000000000'::uuid), hour)
+    do update set
+        calls           = r.calls + excluded.calls,
+        turns           = r.turns + excluded.turns,
+        urgent_calls    = r.urgent_calls + excluded.urgent_calls,
+        intents         = jsonb_add_counts(r.intents, excluded.intents),
+        closed_by       = jsonb_add_counts(r.closed_by, excluded.closed_by),
+        latency_ms_sum  = r.latency_ms_sum + excluded.latency_ms_sum,
+        latency_samples = r.latency_samples + excluded.latency_samples;
+$$ language sql;
@@ -0,0 +1,25 @@
+-- Indexed job-application lookup (app/services/job_lookup.py).
+
+-- Phone: one equality lookup on the last 10 digits, whatever format was stored.
+alter table job_applications
+    add column if not exists phone_key text
+    generated always as (right(regexp_replace(coalesce(phone_number, ''), '\D', '', 'g'), 10)) stored;
+
+create index if not exists job_applications_phone_key_idx on job_applications (phone_key);
+
+-- Name: trigram similarity tolerates STT misspellings ("Mariah Jonson").
+create extension if not exists pg_trgm;
+
+create index if not exists job_applications_name_trgm_idx
+    on job_applications using gin (lower(name) gin_trgm_ops);
+
+create or replace function search_job_applications_by_name(
+    q text, min_similarity real default 0.3, max_rows integer default 5
+) returns setof job_applications as $$
+    select *
+    from job_applications
+    where lower(name) % lower(q)
+      and similarity(lower(name), lower(q)) >= min_similarity
+    order by similarity(lower(name), lower(q)) desc, id
+    limit max_rows;
+$$ language sql stable;
@@ -0,0 +1,4 @@
+-- Change detection for the AxisCare sync (app/sync_applicants.py): the hash
+-- of each row as last written, used to rebuild a host's local hash index.
+
+alter table applicants add column if not exists content_hash text;
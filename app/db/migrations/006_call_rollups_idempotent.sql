@@ -0,0 +1,36 @@
+-- Idempotent rollup increments (app/services/call_rollups.py): each flushed
+-- delta carries a batch id, and a batch is applied at most once, so a
+-- worker can retry a flush whose response it never saw.
+
+create table if not exists call_rollup_batches (
+    batch_id   uuid primary key,
+    applied_at timestamptz not null default now()
+);
+
+create index if not exists call_rollup_batches_applied_at_idx
+    on call_rollup_batches (applied_at);
+
+create or replace function increment_call_rollup(
+    p_batch_id uuid,
+    p_company_id uuid, p_office_id uuid, p_hour timestamp,
+    p_calls integer, p_turns integer, p_urgent_calls integer,
+    p_intents jsonb, p_closed_by jsonb,
+    p_latency_ms_sum double precision, p_latency_samples integer
+) returns boolean as $$
+begin
+    insert into call_rollup_batches (batch_id) values (p_batch_id)
+    on conflict (batch_id) do nothing;
+    if not found then
+        return false;   -- already applied by an earlier attempt
+    end if;
+
+    perform increment_call_rollup(
+        p_company_id, p_office_id, p_hour, p_calls, p_turns, p_urgent_calls,
+        p_intents, p_closed_by, p_latency_ms_sum, p_latency_samples
+    );
+
+    -- Retries happen within minutes; a week of batch ids is plenty
+    delete from call_rollup_batches where applied_at < now() - interval '7 days';
+    return true;
+end;
+$$ language plpgsql;
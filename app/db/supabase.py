@@ -1,8 +1,10 @@
-from supabase import create_client
 import os
 
+from app.core.clients import clients
+
 # Environment variables
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 
-supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+# Shared client, created on first use (see app/core/clients.py)
+supabase = clients.lazy("supabase")
@@ -1,11 +1,21 @@
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles  # ✅ Add this import
 from contextlib import asynccontextmanager
+import asyncio
 import os
 
 # Absolute imports so it works in both pytest + uvicorn
+from app.core.connection_manager import manager
+from app.core.loop_monitor import loop_monitor
+from app.core.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, registry as metrics_registry
 from app.routers import websocket_routes, mock_routes, twilio_routes
+from app.services.applicant_sync import applicant_sync
+from app.services.call_rollups import call_rollups
+from app.services.config_watcher import config_watcher
+from app.services.conversation_manager import conversation_manager
+from app.services.warmup import run_warmup, warmup_state
 
 
 # Lifespan handler replaces deprecated @app.on_event
@@ -19,7 +29,43 @@ async def lifespan(app: FastAPI):
         os.makedirs(static_dir)
         print(f"📁 Created static directory: {static_dir}")
     
+    # ✅ Measure event-loop lag and catch blocking calls (also toggled via POST /debug/loop-monitor)
+    if os.getenv("LOOP_MONITOR_ENABLED", "false").lower() == "true":
+        loop_monitor.start()
+    
+    # ✅ Push config edits into the prompt cache instead of waiting for TTL expiry
+    if os.getenv("CONFIG_WATCH_ENABLED", "true").lower() == "true":
+        config_watcher.start()
+    
+    # ✅ Relay dashboard broadcasts between workers (no-op with the memory backend)
+    await manager.pubsub.start()
+    
+    # ✅ Flush closed-call analytics into the hourly rollup table in the background
+    if os.getenv("ROLLUPS_ENABLED", "true").lower() == "true":
+        call_rollups.start()
+    
+    # ✅ Keep applicants (and the job-status lookup cache) fresh; enable on one worker only.
+    # Every worker listens for the phones it changed and refreshes its own cache.
+    applicant_sync.listen(manager.pubsub)
+    if os.getenv("APPLICANT_SYNC_ENABLED", "false").lower() == "true":
+        applicant_sync.start(manager.pubsub)
+    
+    # ✅ Preload tenants, configs, prompts, connections and greeting audio; /ready flips when done
+    warmup_task = None
+    if os.getenv("WARMUP_ENABLED", "true").lower() == "true":
+        warmup_task = asyncio.create_task(run_warmup())
+    else:
+        warmup_state.mark_ready()
+    
     yield
+    if warmup_task and not warmup_task.done():
+        warmup_task.cancel()
+    await config_watcher.stop()
+    await manager.pubsub.stop()
+    await call_rollups.stop()
+    await applicant_sync.stop()
+    await loop_monitor.stop()
+    await asyncio.to_thread(conversation_manager.store.flush, 5)   # queued session writes
     print("🛑 Shutting down FastAPI server")
 
 
@@ -42,4 +88,16 @@ app.include_router(websocket_routes.router)
 app.include_router(mock_routes.router)
 app.include_router(twilio_routes.router)
 
+
+@app.get("/ready")
+async def ready():
+    """Readiness probe: 200 once startup warm-up has finished, 503 before."""
+    return JSONResponse(warmup_state.snapshot(), status_code=200 if warmup_state.ready else 503)
+
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus scrape endpoint (this worker's series)."""
+    return PlainTextResponse(metrics_registry.render(), media_type=METRICS_CONTENT_TYPE)
+
 # app.include_router(owner_routes.router)
\ No newline at end of file
@@ -1,13 +1,14 @@
-from collections import Counter
+import asyncio
 from datetime import datetime
+import hmac
 import os
 from typing import Optional
 from fastapi import APIRouter, Request, Response
-from deepgram import DeepgramClient, LiveOptions, LiveTranscriptionEvents, SpeakOptions
 import io
 import uuid
 
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field, StrictBool
 
 
 from app.models.mock_response import MOCK_RESPONSES
@@ -17,12 +18,18 @@ from app.core.connection_manager import manager
 from app.models.mock_stt import mock_stt
 from app.services.transcript_service import process_final_transcript
 from app.services.conversation_manager import conversation_manager
-from app.core.config import DEEPGRAM_API_KEY, logger
+from app.services import history_service
+from app.services.applicant_sync import APPLICANT_SYNC_CHANNEL, applicant_sync
+from app.services.call_rollups import call_rollups
+from app.services.job_lookup import job_lookup
+from app.core.clients import clients
+from app.core.loop_monitor import LOOP_MONITOR_MIN_THRESHOLD_MS, loop_monitor
+from app.core.config import logger
 from app.utils.parsers import extract_name, extract_phone
 
 
 router = APIRouter()
-deepgram = DeepgramClient(DEEPGRAM_API_KEY)
+deepgram = clients.lazy("deepgram")
 
 
 
@@ -30,19 +37,20 @@ from threading import Thread
 
 IS_RENDER = os.environ.get("RENDER", "").lower() == "true"
 
-if not IS_RENDER:
+# Local playback libs are only needed by speak_text(); import them on first use
+LOCAL_AUDIO_ENABLED = not IS_RENDER
+
+
+def _local_audio_libs():
+    """Return (sounddevice, soundfile), or (None, None) if unavailable."""
+    global LOCAL_AUDIO_ENABLED
     try:
         import sounddevice as sd
         import soundfile as sf
-        LOCAL_AUDIO_ENABLED = True
-    except ImportError:
-        sd = None
-        sf = None
+        return sd, sf
+    except (ImportError, OSError):
         LOCAL_AUDIO_ENABLED = False
-else:
-    sd = None
-    sf = None
-    LOCAL_AUDIO_ENABLED = False
+        return None, None
 
 
 def speak_text(text: str):
@@ -55,10 +63,14 @@ def speak_text(text: str):
         return
     if not text.strip():
         return
+    sd, sf = _local_audio_libs()
+    if sd is None:
+        logger.info("🎧 Local audio playback disabled on server.")
+        return
 
     def tts_thread():
         try:
-            deepgram = DeepgramClient(DEEPGRAM_API_KEY)
+            from deepgram import SpeakOptions
             temp_file = "temp_response.wav"
 
             options = SpeakOptions(
@@ -116,10 +128,6 @@ import uuid
 import os
 import logging
 from typing import Optional
-from deepgram import DeepgramClient, SpeakOptions
-from app.core.config import DEEPGRAM_API_KEY, logger
-
-deepgram = DeepgramClient(DEEPGRAM_API_KEY)
 
 
 # FIXED: synthesize_audio_file() function for mock_routes.py
@@ -303,6 +311,7 @@ async def synthesize_audio_file_legacy(text: str, language: str = "en") -> Optio
         
         model = "aura-asteria-es" if language == "es" else "aura-asteria-en"
         
+        from deepgram import SpeakOptions
         options = SpeakOptions(
             model=model,
             encoding="mulaw",        # ✅ Still use mu-law
@@ -514,6 +523,7 @@ async def generate_tts(request: Request):
         return {"error": "No text provided"}
 
     # Use Deepgram TTS
+    from deepgram import SpeakOptions
     options = SpeakOptions(model="aura-2-thalia-en")
     buf = io.BytesIO()
     deepgram.speak.v("1").stream(buf, {"text": text}, options)
@@ -535,83 +545,119 @@ from app.db.supabase import supabase
 async def get_conversation_history(
     session_id: Optional[str] = None,
     status: Optional[str] = None,
-    since: Optional[str] = None
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    company_id: Optional[str] = None,
+    office_id: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = history_service.DEFAULT_PAGE_SIZE,
+    summary_only: bool = False,
 ):
+    """
+    Newest-first page of persisted conversations. Pass next_cursor back as
+    ?cursor= for the following page; summary_only skips message bodies.
+    """
     try:
-        query = supabase.table("conversations").select(
-            "id, caller_id, start_time, end_time, status, "
-            "messages!messages_session_id_fkey(id, transcript, translated_text, intent, ai_response, "
-            "ai_response_translated, urgent, language, sentiment, is_final, timestamp, audio_id)"
+        return await asyncio.to_thread(
+            history_service.fetch_page,
+            supabase,
+            company_id=company_id,
+            office_id=office_id,
+            session_id=session_id,
+            status=status,
+            since=since,
+            until=until,
+            cursor=cursor,
+            limit=limit,
+            summary_only=summary_only,
         )
+    except history_service.InvalidCursor as e:
+        return JSONResponse(status_code=400, content={"error": str(e)})
+    except Exception as e:
+        return {"error": str(e)}
 
 
-        # Filter by session
-        if session_id:
-            query = query.eq("id", session_id)
-
-        # Filter by status
-        if status:
-            query = query.eq("status", status)
-
-        response = query.execute()
-        if not response.data:
-            return {"message": "No conversations found"}
+@router.get("/conversation-history/live")
+async def get_live_conversation_history(session_id: Optional[str] = None, status: Optional[str] = None):
+    """Calls not yet flushed to Supabase, from every worker sharing the session store."""
+    return await conversation_manager.get_history(session_id, status)
 
-        results = {}
-        # In your /conversation-history endpoint
-        for conv in response.data:
-            messages = conv.get("messages", [])
-            
-            # Generate analysis on the fly
-            intents = [m.get("intent") for m in messages if m.get("intent")]
-            counter = Counter(intents)
-            
-            analysis = {
-                "summary": f"Conversation with {len(messages)} messages",
-                "main_intent": counter.most_common(1)[0][0] if counter else "unknown",
-                "urgent": any(m.get("urgent") for m in messages),
-                "total_messages": len(messages),
-                "intents_distribution": dict(counter),
-                "ended_with_closure": any(m.get("intent") in ["polite_closure", "goodbye"] for m in messages),
-            }
-            
-            results[conv["id"]] = {
-                "caller_id": conv["caller_id"],
-                "start_time": conv["start_time"],
-                "end_time": conv["end_time"],
-                "status": conv["status"],
-                "analysis": analysis,  # ✅ Add this
-                "messages": messages,
-            }
-        # for conv in response.data:
-        #     messages = conv.get("messages", [])
-
-        #     # ⏳ If "since" param is provided, filter messages
-        #     if since:
-        #         try:
-        #             cutoff = datetime.fromisoformat(since)
-        #             messages = [
-        #                 m for m in messages
-        #                 if datetime.fromisoformat(m["timestamp"]) > cutoff
-        #             ]
-        #         except Exception as e:
-        #             return {"error": f"Invalid 'since' timestamp format: {e}"}
-
-        #     results[conv["id"]] = {
-        #         "caller_id": conv["caller_id"],
-        #         "start_time": conv["start_time"],
-        #         "end_time": conv["end_time"],
-        #         "status": conv["status"],
-        #         "analysis": conv.get("analysis"),
-        #         "messages": messages,
-        #     }
-
-        return results
 
+@router.get("/analytics/rollups")
+async def get_call_rollups(
+    company_id: str,
+    office_id: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+):
+    """Hourly call analytics for a tenant (default: last 24h) from precomputed rollups."""
+    try:
+        return await asyncio.to_thread(call_rollups.query, company_id, office_id, since, until)
     except Exception as e:
         return {"error": str(e)}
 
 
+@router.post("/webhooks/axiscare/applicants")
+async def axiscare_applicant_webhook(request: Request):
+    """AxisCare change notification: sync now instead of at the next poll."""
+    secret = os.getenv("AXISCARE_WEBHOOK_SECRET")
+    if secret and not hmac.compare_digest(request.headers.get("x-webhook-secret", ""), secret):
+        return JSONResponse({"error": "invalid webhook secret"}, status_code=401)
+    # Wake the local daemon, and whichever worker runs it if it isn't this one
+    applicant_sync.notify()
+    await manager.pubsub.publish(APPLICANT_SYNC_CHANNEL, (await request.body()).decode(errors="replace"))
+    return JSONResponse({"queued": True}, status_code=202)
+
+
+@router.get("/applicant-sync/status")
+async def applicant_sync_status():
+    return applicant_sync.snapshot()
+
+
+@router.get("/conversation-history/export")
+async def export_conversation_history(
+    format: str = "ndjson",
+    kind: str = "conversations",
+    status: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    company_id: Optional[str] = None,
+    office_id: Optional[str] = None,
+    cursor: Optional[str] = None,
+):
+    """
+    Stream conversations (or, with kind=messages, one row per message) as
+    NDJSON or CSV. Rows carry a cursor; pass the last complete conversation's
+    cursor back as ?cursor= to resume an interrupted export.
+    """
+    if format not in ("ndjson", "csv") or kind not in ("conversations", "messages"):
+        return JSONResponse(status_code=400, content={"error": "format must be ndjson|csv, kind conversations|messages"})
+    if cursor:
+        try:
+            history_service.decode_cursor(cursor)
+        except history_service.InvalidCursor as e:
+            return JSONResponse(status_code=400, content={"error": str(e)})
+
+    rows = history_service.iter_export_rows(
+        supabase,
+        kind=kind,
+        company_id=company_id,
+        office_id=office_id,
+        status=status,
+        since=since,
+        until=until,
+        cursor=cursor,
+    )
+    filename = f"{kind}-{datetime.utcnow():%Y%m%dT%H%M%S}.{format}"
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+    # Sync generators are iterated in Starlette's threadpool, so the blocking
+    # page fetches never run on the event loop.
+    if format == "csv":
+        fields = history_service.MESSAGE_EXPORT_FIELDS if kind == "messages" else history_service.CONVERSATION_EXPORT_FIELDS
+        return StreamingResponse(history_service.export_csv(rows, fields), media_type="text/csv", headers=headers)
+    return StreamingResponse(history_service.export_ndjson(rows), media_type="application/x-ndjson", headers=headers)
+
+
 
 
 
@@ -656,23 +702,7 @@ async def debug_parse_test(request: Request):
     name = extract_name(text)
     
     # Test database lookup with the extracted data
-    found_applications = []
-    if phone:
-        # Try digits-only format
-        result = supabase.table("job_applications").select("*").eq("phone_number", phone).execute()
-        if result.data:
-            found_applications.extend(result.data)
-        else:
-            # Try formatted phone
-            formatted_phone = f"{phone[:3]}-{phone[3:6]}-{phone[6:]}" if phone and len(phone) == 10 else phone
-            result = supabase.table("job_applications").select("*").eq("phone_number", formatted_phone).execute()
-            if result.data:
-                found_applications.extend(result.data)
-    
-    if not found_applications and name:
-        result = supabase.table("job_applications").select("*").ilike("name", f"%{name}%").execute()
-        if result.data:
-            found_applications.extend(result.data)
+    found_applications = await asyncio.to_thread(job_lookup.search, phone, name)
     
     return {
         "input_text": text,
@@ -683,6 +713,41 @@ async def debug_parse_test(request: Request):
     }
 
 
+def _debug_authorized(request: Request) -> bool:
+    """Admin debug controls need DEBUG_API_TOKEN in x-debug-token; closed when it isn't set."""
+    token = os.getenv("DEBUG_API_TOKEN")
+    return bool(token) and hmac.compare_digest(request.headers.get("x-debug-token", ""), token)
+
+
+class LoopMonitorSettings(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    enabled: Optional[StrictBool] = None
+    threshold_ms: Optional[float] = Field(None, ge=LOOP_MONITOR_MIN_THRESHOLD_MS, le=60000)
+    reset: StrictBool = False
+
+
+@router.get("/debug/loop-monitor")
+async def debug_loop_monitor(request: Request):
+    """Event-loop stalls per blocking call site, worst first."""
+    if not _debug_authorized(request):
+        return JSONResponse({"error": "invalid debug token"}, status_code=401)
+    return loop_monitor.snapshot()
+
+
+@router.post("/debug/loop-monitor")
+async def debug_configure_loop_monitor(settings: LoopMonitorSettings, request: Request):
+    """Toggle the loop monitor at runtime: {"enabled": bool, "threshold_ms": float, "reset": bool}"""
+    if not _debug_authorized(request):
+        return JSONResponse({"error": "invalid debug token"}, status_code=401)
+    await loop_monitor.configure(
+        enabled=settings.enabled,
+        threshold_ms=settings.threshold_ms,
+        reset=settings.reset,
+    )
+    return loop_monitor.snapshot()
+
+
 @router.get("/debug/job-applications")
 async def debug_job_applications():
     """Debug endpoint to see what job applications are in the database"""
@@ -751,10 +816,9 @@ async def test_job_application_logic(request: Request):
             job_response, job_found = await _handle_job_application_lookup(test_text)
         
         # Test database search directly
-        from app.services.transcript_service import _search_job_applications
         phone = extraction_result.get('phone')
         name = extraction_result.get('name')
-        db_results = await _search_job_applications(phone, name) if (phone or name) else []
+        db_results = await asyncio.to_thread(job_lookup.search, phone, name) if (phone or name) else []
         
         return {
             "test_input": test_text,
@@ -868,9 +932,8 @@ async def _synthesize_to_static(text: str) -> Optional[str]:
     if not text or not text.strip():
         return None
     try:
-        from deepgram import DeepgramClient
-        from app.core.config import DEEPGRAM_API_KEY
-        dg = DeepgramClient(DEEPGRAM_API_KEY)
+        from deepgram import SpeakOptions
+        dg = clients.get("deepgram")
         audio_id = f"{uuid.uuid4()}.wav"
         path = os.path.join("app/static", audio_id)
         os.makedirs(os.path.dirname(path), exist_ok=True)
@@ -3,19 +3,14 @@
 from fastapi import APIRouter, Form, Request
 from fastapi.responses import Response, PlainTextResponse
 from twilio.twiml.voice_response import VoiceResponse, Start, Stream
-from supabase import create_client, Client
 from dotenv import load_dotenv
 import os, logging
 
 load_dotenv()
 router = APIRouter(prefix="/twilio", tags=["Twilio"])
 
-SUPABASE_URL = os.getenv("SUPABASE_URL")
-SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 PUBLIC_URL = os.getenv("PUBLIC_URL")
 
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
-
 @router.get("/debug/twiml")
 async def debug_twiml():
     """
@@ -1,23 +1,30 @@
 # app/routers/websocket_routes.py - FULLY CORRECTED
 
 import base64
+import json
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Response
 from datetime import datetime
 import time
 import uuid
 import io
 import asyncio
-from deepgram import DeepgramClient, LiveOptions, LiveTranscriptionEvents, SpeakOptions
+from contextlib import nullcontext
+from typing import Dict, Optional
 
-from app.core.config import DEEPGRAM_API_KEY, logger
+from app.core.clients import clients
+from app.core.config import logger
+from app.core import wire_format
 from app.core.connection_manager import manager
 from app.models.mock_stt import mock_stt
 from app.services.groq_client import groq_client
 from app.services.transcript_service import process_final_transcript, end_active_session
 from app.services.conversation_manager import conversation_manager
+from app.services.interim_coalescer import InterimCoalescer
+from app.services import turn_timing
+from app.services.tenant_directory import tenant_directory
 
 router = APIRouter()
-deepgram = DeepgramClient(DEEPGRAM_API_KEY)
+deepgram = clients.lazy("deepgram")
 
 READ_TIMEOUT_SECONDS = 15
 
@@ -57,11 +64,14 @@ async def send_audio_response_to_twilio(websocket: WebSocket, text: str, session
         logger.error("❌ No websocket connection to send audio")
         return
     
+    trace = turn_timing.current_turn()
+    span = trace.span if trace else (lambda stage: nullcontext())
     try:
         logger.info(f"🔊 Converting AI response to audio: {text[:50]}...")
         
         # Generate TTS audio (returns bytes in mu-law format)
-        audio_data = await synthesize_audio_file(text, language="en")
+        with span("tts"):
+            audio_data = await synthesize_audio_file(text, language="en")
         
         if not audio_data:
             logger.error("❌ TTS generation failed - audio_data is None or empty")
@@ -82,28 +92,48 @@ async def send_audio_response_to_twilio(websocket: WebSocket, text: str, session
         }
         
         # Send audio back through WebSocket
-        await websocket.send_json(media_event)
+        with span("send"):
+            await websocket.send_json(media_event)
         logger.info("✅ Audio response sent to caller")
         
     except Exception as e:
         logger.error(f"❌ Failed to send audio response: {e}", exc_info=True)
 
 
+def _topic(session_id: Optional[str]) -> Dict[str, Optional[str]]:
+    """Broadcast routing keys for a call: its tenant, office and session."""
+    sess = conversation_manager.sessions.get(session_id) or {}
+    return {
+        "company_id": sess.get("company_id"),
+        "office_id": sess.get("office_id"),
+        "session_id": session_id,
+    }
+
+
 async def handle_real_time_transcript(
     transcript: str, 
     stt_lang_hint: str = "en",
-    websocket: WebSocket = None  # ✅ CRITICAL PARAMETER
+    websocket: WebSocket = None,  # ✅ CRITICAL PARAMETER
+    session_id: Optional[str] = None,
+    speech_end: Optional[float] = None,
 ):
     """
     Process transcript, generate TTS, send audio to caller, and broadcast to clients
     
-    CRITICAL: websocket parameter MUST be passed from on_transcript() callback
+    CRITICAL: websocket parameter MUST be passed from on_transcript() callback.
+    session_id pins the turn to this call's session; without it the process-wide
+    "active" session is used, which is wrong with concurrent calls or workers.
+    speech_end (time.monotonic()) is when the caller stopped talking, for turn timing.
     """
+    trace = turn_timing.start_turn(speech_end)
     try:
         logger.info(f"🎯 Processing real-time transcript: {transcript}")
         
         # 1. Process the transcript to get AI response
-        session_id, entry = await process_final_transcript(transcript, stt_lang_hint=stt_lang_hint)
+        if session_id:
+            session_id, entry = await process_final_transcript(session_id, transcript, stt_lang_hint)
+        else:
+            session_id, entry = await process_final_transcript(transcript, stt_lang_hint=stt_lang_hint)
         
         # 2. ✅ CRITICAL: Send audio response back to caller
         if entry.get("ai_response") and websocket:
@@ -114,13 +144,17 @@ async def handle_real_time_transcript(
         elif not entry.get("ai_response"):
             logger.warning(f"⚠️ NO AI RESPONSE - Nothing to convert to audio")
         
-        # 3. Add session context
+        # 3. Add session context and this turn's latency breakdown
+        if entry.get("id"):
+            timings = trace.finish()
+            conversation_manager.record_turn_timing(session_id, entry, timings)
+            logger.info(f"⏱️ Turn latency {timings['total_ms']:.0f}ms: {timings}")
         entry["session_id"] = session_id
         entry["sentiment"] = conversation_manager.sessions.get(session_id, {}).get("overall_sentiment", "neutral")
         
-        # 4. Broadcast to all connected clients (for dashboard/UI)
+        # 4. Broadcast to dashboards subscribed to this call, office or company
         logger.info("📡 Broadcasting to connected clients")
-        await manager.broadcast(entry)
+        await manager.broadcast(entry, **_topic(session_id))
         
         return entry
         
@@ -130,13 +164,26 @@ async def handle_real_time_transcript(
         logger.error(traceback.format_exc())
 
 
+GREETING_TEXT = "Hello, welcome to Servoice. How may I help you?"
+_greeting_audio: Dict[str, bytes] = {}  # language → mu-law bytes, filled at startup
+
+
+async def prepare_greeting_audio(language: str = "en") -> Optional[bytes]:
+    """Synthesize the greeting once and keep it for every call."""
+    audio_data = _greeting_audio.get(language)
+    if audio_data is None:
+        audio_data = await synthesize_audio_file(GREETING_TEXT, language)
+        if audio_data:
+            _greeting_audio[language] = audio_data
+    return audio_data
+
+
 async def _send_greeting_to_caller(websocket: WebSocket):
     """Send welcome greeting to caller via TTS"""
     try:
-        greeting = "Hello, welcome to Servoice. How may I help you?"
-        logger.info(f"🎤 Sending greeting: {greeting}")
+        logger.info(f"🎤 Sending greeting: {GREETING_TEXT}")
         
-        audio_data = await synthesize_audio_file(greeting, "en")
+        audio_data = await prepare_greeting_audio("en")
         if audio_data:
             audio_payload = base64.b64encode(audio_data).decode('utf-8')
             media_event = {
@@ -194,12 +241,37 @@ async def audio_stream_test(websocket: WebSocket):
 
 @router.websocket("/transcripts/stream")
 async def transcript_stream(websocket: WebSocket):
-    """Stream for real-time transcript updates"""
-    await manager.connect(websocket)
+    """
+    Stream for real-time transcript updates.
+    Filter with ?company_id=, ?office_id= or ?session_id= (no filter = everything);
+    send {"type": "subscribe", ...same keys} to change it on an open socket.
+    Compact binary frames: request subprotocol servoice.msgpack.v1 or ?format=msgpack
+    (see app/core/wire_format.py).
+    """
+    params = websocket.query_params
+    await manager.connect(
+        websocket,
+        company_id=params.get("company_id"),
+        office_id=params.get("office_id"),
+        session_id=params.get("session_id"),
+        compact=wire_format.wants_compact(websocket),
+        subprotocol=wire_format.negotiate(websocket),
+    )
     try:
         while True:
             data = await websocket.receive_text()
             logger.debug(f"Received on transcript stream: {data}")
+            try:
+                msg = json.loads(data)
+            except ValueError:
+                continue
+            if isinstance(msg, dict) and msg.get("type") == "subscribe":
+                manager.subscribe(
+                    websocket,
+                    company_id=msg.get("company_id"),
+                    office_id=msg.get("office_id"),
+                    session_id=msg.get("session_id"),
+                )
     except WebSocketDisconnect:
         logger.info("Transcript stream client disconnected")
     finally:
@@ -212,6 +284,7 @@ async def tts_endpoint(request: dict):
         return {"error": "No text provided"}
 
     try:
+        from deepgram import SpeakOptions
         options = SpeakOptions(model="aura-2-thalia-en")
         buffer = io.BytesIO()
         deepgram.speak.v("1").stream(
@@ -259,6 +332,7 @@ async def audio_stream(websocket: WebSocket):
     dg_socket = None
     session_id = None
     last_activity = {"ts": time.time()}
+    audio_clock = {"t0": None}  # monotonic time of the first media frame = stream offset 0
     watchdog_task = None
     current_loop = asyncio.get_event_loop()
 
@@ -307,16 +381,10 @@ async def audio_stream(websocket: WebSocket):
                     receiver_number = normalize_e164(receiver_id)
                     logger.info(f"📞 Caller: {caller_number} → Receiver: {receiver_number}")
 
-                    # ── 1️⃣ Lookup agency line
+                    # ── 1️⃣ Lookup agency line (preloaded at startup)
                     try:
-                        result = (
-                            supabase.table("phone_numbers")
-                            .select("id, company_id, office_id, e164")
-                            .eq("e164", receiver_number)
-                            .execute()
-                        )
-                        if result.data:
-                            phone_data = result.data[0]
+                        phone_data = await tenant_directory.lookup_async(receiver_number)
+                        if phone_data:
                             company_id = phone_data["company_id"]
                             office_id = phone_data["office_id"]
                             phone_number_id = phone_data["id"]
@@ -363,6 +431,12 @@ async def audio_stream(websocket: WebSocket):
                     from deepgram import LiveTranscriptionEvents, LiveOptions
                     dg_socket = deepgram.listen.websocket.v("1")
 
+                    async def broadcast_transcript(message):
+                        await manager.broadcast(message, **_topic(session_id))
+
+                    # Partials are coalesced to INTERIM_BROADCAST_HZ; finals go out immediately
+                    coalescer = InterimCoalescer(current_loop, broadcast_transcript)
+
                     def on_transcript(self, result, **kwargs):
                         transcript = result.channel.alternatives[0].transcript
                         if not transcript.strip():
@@ -373,22 +447,27 @@ async def audio_stream(websocket: WebSocket):
                         if any(w in transcript.lower() for w in spanish_words):
                             stt_lang_hint = "es"
 
+                        message = {
+                            "type": "transcript",
+                            "session_id": session_id,
+                            "transcript": transcript,
+                            "is_final": is_final,
+                            "language": stt_lang_hint,
+                            "timestamp": datetime.now().isoformat(),
+                        }
                         if not is_final:
-                            asyncio.run_coroutine_threadsafe(
-                                manager.broadcast({
-                                    "type": "transcript",
-                                    "transcript": transcript,
-                                    "is_final": False,
-                                    "language": stt_lang_hint,
-                                    "timestamp": datetime.now().isoformat(),
-                                }),
-                                current_loop,
-                            )
+                            coalescer.interim(message)
                             last_activity["ts"] = time.time()
                         else:
                             logger.info(f"📝 Final transcript: {transcript}")
+                            coalescer.final(message)
+                            # Deepgram offsets are stream seconds; Twilio streams in real time
+                            speech_end = None
+                            if audio_clock["t0"] is not None:
+                                speech_end = audio_clock["t0"] + (getattr(result, "start", 0) or 0) \
+                                    + (getattr(result, "duration", 0) or 0)
                             asyncio.run_coroutine_threadsafe(
-                                handle_real_time_transcript(transcript, stt_lang_hint, websocket),
+                                handle_real_time_transcript(transcript, stt_lang_hint, websocket, session_id, speech_end),
                                 current_loop,
                             )
 
@@ -441,6 +520,8 @@ async def audio_stream(websocket: WebSocket):
                     audio_payload = event["media"]["payload"]
                     audio_bytes = base64.b64decode(audio_payload)
                     if dg_socket:
+                        if audio_clock["t0"] is None:
+                            audio_clock["t0"] = time.monotonic()
                         dg_socket.send(audio_bytes)
                         last_activity["ts"] = time.time()
                     else:
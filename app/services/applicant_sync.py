@@ -0,0 +1,176 @@
+# app/services/applicant_sync.py
+# Continuous AxisCare → applicants sync, so phone lookups aren't hours stale.
+#
+# Runs the incremental sync from app/sync_applicants.py every
+# APPLICANT_SYNC_INTERVAL_S (± jitter, so workers and restarts don't line
+# up), and earlier when AxisCare pushes a change notification. A burst of
+# notifications coalesces into one run. Every applicant the sync writes has
+# its phone number re-read into the job-status lookup cache, and the changed
+# phone keys are published so every other worker (listen()) re-reads them
+# too. Embedded in the FastAPI lifespan (APPLICANT_SYNC_ENABLED) or standalone
+# with `python -m app.sync_applicants --watch`.
+
+import asyncio
+import json
+import os
+import random
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from app.core.config import logger
+from app.services.job_lookup import JobApplicationLookup, job_lookup, normalize_phone
+
+APPLICANT_SYNC_CHANNEL = "applicant_sync"
+APPLICANT_PHONES_CHANNEL = "applicant_phones"   # JSON list of phone keys the sync changed
+APPLICANT_SYNC_INTERVAL_S = float(os.getenv("APPLICANT_SYNC_INTERVAL_S", "60"))
+APPLICANT_SYNC_JITTER = float(os.getenv("APPLICANT_SYNC_JITTER", "0.2"))        # ± fraction of the interval
+APPLICANT_SYNC_DEBOUNCE_S = float(os.getenv("APPLICANT_SYNC_DEBOUNCE_S", "2"))  # let notification bursts settle
+APPLICANT_SYNC_MAX_BACKOFF_S = 900.0
+
+
+class ApplicantSyncDaemon:
+    def __init__(self, sync: Optional[Callable[..., Awaitable[Dict[str, Any]]]] = None,
+                 lookup: JobApplicationLookup = job_lookup,
+                 interval: float = APPLICANT_SYNC_INTERVAL_S, jitter: float = APPLICANT_SYNC_JITTER,
+                 debounce: float = APPLICANT_SYNC_DEBOUNCE_S):
+        self._sync = sync   # defaults to sync_applicants.run_sync
+        self.lookup = lookup
+        self.interval = interval
+        self.jitter = jitter
+        self.debounce = debounce
+        self.checkpoint = None
+        self.hashes = None
+        self.runs = 0
+        self.failures = 0
+        self.notifications = 0
+        self.warmed = 0
+        self.last_stats: Optional[Dict[str, Any]] = None
+        self.last_run_at: Optional[float] = None
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._subscribed = False
+        self._listening = False
+        self._pubsub = None
+        self._changed: Set[str] = set()   # phone keys warmed here, not yet published
+        self._changed_lock = threading.Lock()
+
+    def next_delay(self) -> float:
+        """Jittered poll interval; backs off exponentially while runs keep failing."""
+        base = self.interval
+        if self.failures:
+            base = min(self.interval * 2 ** self.failures, APPLICANT_SYNC_MAX_BACKOFF_S)
+        return base * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    # ---------- Triggers ----------
+
+    def notify(self):
+        """A change was pushed: run soon instead of at the next poll."""
+        self.notifications += 1
+        self._wake.set()
+
+    async def _on_notification(self, payload: str):
+        self.notify()
+
+    async def _on_phones(self, payload: str):
+        """Another worker's sync changed these applicants: re-read them into our cache too."""
+        keys = json.loads(payload)
+        await asyncio.to_thread(self.lookup.refresh_phones, keys)
+
+    # ---------- Sync ----------
+
+    def _warm(self, rows: List[Dict[str, Any]]):
+        # Runs in the sync's worker thread, right after each batch is written
+        phones = [row.get("phone") for row in rows]
+        self.warmed += self.lookup.refresh_phones(phones)
+        with self._changed_lock:
+            self._changed.update(key for key in map(normalize_phone, phones) if key)
+
+    async def _publish_changed(self):
+        with self._changed_lock:
+            keys, self._changed = sorted(self._changed), set()
+        if keys and self._pubsub is not None:
+            try:
+                await self._pubsub.publish(APPLICANT_PHONES_CHANNEL, json.dumps(keys))
+            except Exception as e:
+                logger.error(f"❌ Publishing {len(keys)} changed applicant phone(s) failed: {e}")
+
+    async def sync_once(self) -> Dict[str, Any]:
+        from app import sync_applicants
+        if self.checkpoint is None:
+            self.checkpoint = sync_applicants.Checkpoint()
+            self.hashes = sync_applicants.HashIndex()
+        run = self._sync or sync_applicants.run_sync
+        try:
+            stats = await run(checkpoint=self.checkpoint, hashes=self.hashes, on_change=self._warm)
+        finally:
+            await self._publish_changed()   # batches written before a failure count too
+        self.runs += 1
+        self.last_stats = stats
+        self.last_run_at = time.time()
+        return stats
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.next_delay())
+                await asyncio.sleep(self.debounce)
+            except asyncio.TimeoutError:
+                pass
+            # Cleared before running: a notification that lands mid-run triggers a follow-up
+            self._wake.clear()
+            try:
+                await self.sync_once()
+                self.failures = 0
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.failures += 1
+                logger.error(f"❌ Applicant sync failed ({self.failures}x), retrying in ~{self.next_delay():.0f}s: {e}")
+
+    def listen(self, pubsub):
+        """Every worker: refresh the lookup cache for phones the syncing worker changed."""
+        if not self._listening:
+            pubsub.subscribe(APPLICANT_PHONES_CHANNEL, self._on_phones)
+            self._listening = True
+
+    def start(self, pubsub=None):
+        if pubsub is not None and not self._subscribed:
+            pubsub.subscribe(APPLICANT_SYNC_CHANNEL, self._on_notification)
+            self._subscribed = True
+            self._pubsub = pubsub
+        if self._task is None or self._task.done():
+            self._wake.set()   # first pass right away
+            self._task = asyncio.get_running_loop().create_task(self._run())
+            logger.info(f"🔁 Applicant sync started (every ~{self.interval:.0f}s)")
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def serve(self, pubsub=None):
+        """Standalone mode: run until cancelled."""
+        self.start(pubsub)
+        try:
+            await self._task
+        finally:
+            await self.stop()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "running": bool(self._task and not self._task.done()),
+            "runs": self.runs,
+            "failures": self.failures,
+            "notifications": self.notifications,
+            "warmed_phones": self.warmed,
+            "last_run_at": self.last_run_at,
+            "last_stats": self.last_stats,
+        }
+
+
+applicant_sync = ApplicantSyncDaemon()
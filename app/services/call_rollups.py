@@ -0,0 +1,208 @@
+# app/services/call_rollups.py
+# Per-tenant, per-office, per-hour call aggregates, updated as sessions close.
+#
+# Closing a session folds it into an in-memory pending delta for its
+# (company, office, hour) bucket; a background flusher adds the deltas to
+# call_rollups_hourly through the increment_call_rollup RPC (migrations 003
+# and 006), so every worker contributes to the same rows. Dashboards read the
+# rollup rows (plus this worker's unflushed deltas) instead of scanning calls.
+#
+# A flush seals each pending bucket into a batch with its own id. Batches
+# stay in flight (and visible to query) until the RPC confirms them, and a
+# failed batch is retried unchanged: the RPC applies a batch id at most
+# once, so a call that committed but timed out is not counted twice.
+
+import asyncio
+import os
+import threading
+import uuid
+from collections import Counter, OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Tuple
+
+from app.core.config import logger
+
+ROLLUP_FLUSH_INTERVAL_S = float(os.getenv("ROLLUP_FLUSH_INTERVAL_S", "30"))
+_RECENT_SESSIONS = 10_000
+
+BucketKey = Tuple[str, str, str]   # (company_id, office_id, hour ISO)
+COUNTERS = ("calls", "turns", "urgent_calls", "latency_ms_sum", "latency_samples")
+
+
+def _hour(ts: Optional[str]) -> str:
+    try:
+        dt = datetime.fromisoformat(ts) if ts else datetime.now()
+    except ValueError:
+        dt = datetime.now()
+    # Session timestamps are naive server time; compare DB rows on the same footing
+    return dt.replace(minute=0, second=0, microsecond=0, tzinfo=None).isoformat()
+
+
+def _empty_bucket() -> Dict[str, Any]:
+    return {"calls": 0, "turns": 0, "urgent_calls": 0, "latency_ms_sum": 0.0, "latency_samples": 0,
+            "intents": Counter(), "closed_by": Counter()}
+
+
+def session_delta(session: Dict[str, Any]) -> Dict[str, Any]:
+    """One closed session's contribution to its hourly bucket."""
+    messages = session.get("messages") or []
+    analysis = session.get("analysis") or {}
+    latencies = [m["latency_ms"] for m in messages if isinstance(m.get("latency_ms"), (int, float))]
+    delta = _empty_bucket()
+    delta.update({
+        "calls": 1,
+        "turns": sum(1 for m in messages if m.get("transcript")),
+        "urgent_calls": int(bool(analysis.get("urgent"))),
+        "latency_ms_sum": float(sum(latencies)),
+        "latency_samples": len(latencies),
+    })
+    delta["intents"][analysis.get("main_intent") or "unknown"] += 1
+    delta["closed_by"][analysis.get("closed_by") or "unknown"] += 1
+    return delta
+
+
+def _merge(into: Dict[str, Any], delta: Dict[str, Any]):
+    for field in COUNTERS:
+        into[field] += delta.get(field) or 0
+    into["intents"].update(delta.get("intents") or {})
+    into["closed_by"].update(delta.get("closed_by") or {})
+
+
+def _summarize(bucket: Dict[str, Any]) -> Dict[str, Any]:
+    samples = bucket["latency_samples"]
+    return {
+        "calls": bucket["calls"],
+        "turns": bucket["turns"],
+        "urgent_calls": bucket["urgent_calls"],
+        "intents": dict(bucket["intents"]),
+        "closed_by": dict(bucket["closed_by"]),
+        "avg_turn_latency_ms": round(bucket["latency_ms_sum"] / samples, 1) if samples else None,
+    }
+
+
+class CallRollups:
+    def __init__(self, client=None):
+        self._client = client
+        self.pending: Dict[BucketKey, Dict[str, Any]] = {}
+        self.inflight: Dict[str, Tuple[BucketKey, Dict[str, Any]]] = {}   # batch id -> sealed delta
+        self._recorded: "OrderedDict[str, None]" = OrderedDict()   # end_session + mark_closed both fire
+        self._lock = threading.Lock()   # flush runs in a worker thread
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            from app.db.supabase import supabase
+            self._client = supabase
+        return self._client
+
+    # ---------- Write path ----------
+
+    def record_session(self, session_id: str, session: Dict[str, Any]) -> bool:
+        """Fold a closed session into its bucket once. O(messages), no I/O."""
+        if session_id in self._recorded or not session.get("company_id"):
+            return False
+        self._recorded[session_id] = None
+        if len(self._recorded) > _RECENT_SESSIONS:
+            self._recorded.popitem(last=False)
+        key = (session["company_id"], session.get("office_id") or "", _hour(session.get("start_time")))
+        delta = session_delta(session)
+        with self._lock:
+            _merge(self.pending.setdefault(key, _empty_bucket()), delta)
+        return True
+
+    def flush(self) -> int:
+        """Push pending deltas to the DB (blocking). Failed batches are retried as-is next time."""
+        with self._lock:
+            for key, delta in self.pending.items():
+                self.inflight[str(uuid.uuid4())] = (key, delta)
+            self.pending = {}
+            batches = list(self.inflight.items())
+        flushed = 0
+        for batch_id, (key, delta) in batches:
+            company_id, office_id, hour = key
+            try:
+                self.client.rpc("increment_call_rollup", {
+                    "p_batch_id": batch_id,
+                    "p_company_id": company_id,
+                    "p_office_id": office_id or None,
+                    "p_hour": hour,
+                    "p_calls": delta["calls"],
+                    "p_turns": delta["turns"],
+                    "p_urgent_calls": delta["urgent_calls"],
+                    "p_intents": dict(delta["intents"]),
+                    "p_closed_by": dict(delta["closed_by"]),
+                    "p_latency_ms_sum": delta["latency_ms_sum"],
+                    "p_latency_samples": delta["latency_samples"],
+                }).execute()
+            except Exception as e:
+                # Maybe applied, maybe not: keep the batch id so the retry can't double count
+                logger.error(f"❌ Rollup flush failed for {key}, will retry batch {batch_id}: {e}")
+                continue
+            with self._lock:
+                self.inflight.pop(batch_id, None)
+            flushed += 1
+        return flushed
+
+    async def _run(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            if self.pending or self.inflight:
+                await asyncio.to_thread(self.flush)
+
+    def start(self, interval: float = ROLLUP_FLUSH_INTERVAL_S):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(interval))
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self.pending or self.inflight:
+            await asyncio.to_thread(self.flush)
+
+    # ---------- Read path ----------
+
+    def query(self, company_id: str, office_id: Optional[str] = None,
+              since: Optional[str] = None, until: Optional[str] = None) -> Dict[str, Any]:
+        """Hourly buckets for a tenant (blocking); cost follows hours in range, not calls."""
+        since = since or (datetime.now() - timedelta(hours=24)).replace(minute=0, second=0, microsecond=0).isoformat()
+        query = self.client.table("call_rollups_hourly").select("*").eq("company_id", company_id).gte("hour", since)
+        if office_id:
+            query = query.eq("office_id", office_id)
+        if until:
+            query = query.lt("hour", until)
+        rows = query.order("hour").execute().data or []
+
+        buckets: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        for row in rows:
+            bucket = buckets.setdefault((row.get("office_id") or "", _hour(row["hour"])), _empty_bucket())
+            _merge(bucket, row)
+        with self._lock:
+            pending = list(self.pending.items()) + list(self.inflight.values())
+        for (c, o, hour), delta in pending:
+            if c == company_id and (not office_id or o == office_id) and hour >= _hour(since) \
+                    and (not until or hour < until):
+                _merge(buckets.setdefault((o, hour), _empty_bucket()), delta)
+
+        totals = _empty_bucket()
+        for bucket in buckets.values():
+            _merge(totals, bucket)
+        return {
+            "company_id": company_id,
+            "office_id": office_id,
+            "since": since,
+            "until": until,
+            "totals": _summarize(totals),
+            "buckets": [
+                {"office_id": o, "hour": hour, **_summarize(bucket)}
+                for (o, hour), bucket in sorted(buckets.items(), key=lambda kv: (kv[0][1], kv[0][0]))
+            ],
+        }
+
+
+call_rollups = CallRollups()
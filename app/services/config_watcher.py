@@ -0,0 +1,151 @@
+# app/services/config_watcher.py
+# Change feed for service_configs: polls updated_at and refreshes changed
+# tenants in the background, so config edits land within seconds and no
+# caller ever pays for a refetch.
+
+import asyncio
+import json
+import os
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from app.core.config import logger
+from app.services.prompt_manager import PromptManager, prompt_manager
+
+CONFIG_POLL_INTERVAL_S = float(os.getenv("CONFIG_POLL_INTERVAL_S", "5"))
+CONFIG_WATCH_FILE = os.getenv("CONFIG_WATCH_FILE")  # local stand-in for the table
+# updated_at is now(), the *transaction start*: a row can commit after a
+# later-stamped row was already read. Each poll re-reads this far behind the
+# cursor and skips rows it has already returned.
+CONFIG_CHANGE_OVERLAP_S = float(os.getenv("CONFIG_CHANGE_OVERLAP_S", "10"))
+
+Change = Dict[str, Any]  # {"company_id", "office_id", "updated_at"}
+EPOCH = "1970-01-01T00:00:00+00:00"  # cursor for an empty table: every row is newer
+
+
+# ---------- Sources ----------
+
+class SupabaseConfigSource:
+    """Reads the service_configs change feed from Supabase."""
+
+    def __init__(self, client=None, table: str = "service_configs", overlap: float = CONFIG_CHANGE_OVERLAP_S):
+        self._client = client
+        self.table = table
+        self.overlap = overlap
+        self._seen: Set[Tuple] = set()   # rows already returned that the overlap window re-reads
+
+    @property
+    def client(self):
+        if self._client is None:
+            from app.db.supabase import supabase
+            self._client = supabase
+        return self._client
+
+    def changed_since(self, cursor: Optional[str]) -> Tuple[List[Change], Optional[str]]:
+        """
+        Rows updated after `cursor` (or late commits stamped up to `overlap`
+        before it) not returned yet, oldest first, plus the new cursor.
+        With no cursor, return no rows and just the current high-water mark.
+        """
+        q = self.client.table(self.table).select("company_id, office_id, updated_at")
+        if cursor is None:
+            result = q.order("updated_at", desc=True).limit(1).execute()
+            rows = result.data or []
+            return [], rows[0]["updated_at"] if rows else EPOCH
+        result = q.gte("updated_at", _rewind(cursor, self.overlap)).order("updated_at").execute()
+        rows = result.data or []
+        keys = [(r.get("company_id"), r.get("office_id"), r["updated_at"]) for r in rows]
+        fresh = [r for r, key in zip(rows, keys) if key not in self._seen]
+        # Everything the next poll can re-read was in this window
+        self._seen = set(keys)
+        return fresh, max(cursor, rows[-1]["updated_at"]) if rows else cursor
+
+
+def _rewind(timestamp: str, seconds: float) -> str:
+    """timestamptz string moved back by `seconds`, in the same ISO form PostgREST returns."""
+    parsed = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+    return (parsed - timedelta(seconds=seconds)).isoformat()
+
+
+class FileConfigSource:
+    """JSON file of service_configs rows; used in tests and local development."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def changed_since(self, cursor: Optional[str]) -> Tuple[List[Change], Optional[str]]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                rows = json.load(f)
+        except FileNotFoundError:
+            rows = []
+        rows = sorted(rows, key=lambda r: r["updated_at"])
+        high_water = rows[-1]["updated_at"] if rows else (cursor or EPOCH)
+        if cursor is None:
+            return [], high_water
+        return [r for r in rows if r["updated_at"] > cursor], high_water
+
+
+# ---------- Watcher ----------
+
+class ConfigWatcher:
+    def __init__(self, manager: PromptManager, source, interval: float = CONFIG_POLL_INTERVAL_S):
+        self.manager = manager
+        self.source = source
+        self.interval = interval
+        self.cursor: Optional[str] = None
+        self.refreshed = 0
+        self._task: Optional[asyncio.Task] = None
+        self._failures = 0
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+            logger.info(f"👀 Config watcher started (every {self.interval}s)")
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def poll_once(self) -> int:
+        """Apply one batch of changes; returns how many tenants were refreshed."""
+        loop = asyncio.get_running_loop()
+        changes, cursor = await loop.run_in_executor(None, self.source.changed_since, self.cursor)
+
+        tenants = {(c["company_id"], c.get("office_id")) for c in changes if c.get("company_id")}
+        for company_id, office_id in tenants:
+            await self.manager.refresh(company_id, office_id)
+        if tenants:
+            self.manager.bump_version()
+            self.refreshed += len(tenants)
+            logger.info(f"🔄 Config change feed: refreshed {len(tenants)} tenant(s), version={self.manager.version}")
+
+        self.cursor = cursor
+        return len(tenants)
+
+    async def _run(self):
+        while True:
+            try:
+                await self.poll_once()
+                self._failures = 0
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._failures += 1
+                if self._failures == 1 or self._failures % 60 == 0:
+                    logger.error(f"❌ Config watcher poll failed ({self._failures}x): {e}")
+            await asyncio.sleep(self.interval)
+
+
+def _default_source():
+    if CONFIG_WATCH_FILE:
+        return FileConfigSource(CONFIG_WATCH_FILE)
+    return SupabaseConfigSource()
+
+
+config_watcher = ConfigWatcher(prompt_manager, _default_source())
@@ -1,5 +1,6 @@
 # app/core/conversation_manager.py
 
+import asyncio
 import uuid
 from datetime import datetime
 from collections import Counter
@@ -8,12 +9,37 @@ import re
 
 from dotenv.main import logger
 
+from app.core.session_store import build_session_store
+from app.services import intake_slots, turn_timing
+from app.services.call_rollups import call_rollups
+
 class ConversationManager:
-    def __init__(self):
+    def __init__(self, store=None):
         # sessions: {session_id: {...}}
         # Each session keeps everything in memory until you explicitly flush.
+        # Sessions owned by this worker live here; with a shared store they are
+        # also written through so other workers can read them.
         self.sessions: Dict[str, Dict[str, Any]] = {}
         self.active_session_id: Optional[str] = None  # last active session
+        self.store = store or build_session_store()
+        self._latency: Dict[str, turn_timing.LatencyStats] = {}   # live sessions' turn timings
+
+    def _persist(self, session_id: str):
+        if self.store.shared and session_id in self.sessions:
+            try:
+                self.store.save(session_id, self.sessions[session_id])
+            except Exception as e:
+                logger.error(f"❌ Session store write failed for {session_id}: {e}")
+
+    async def _all_sessions(self, status: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """Sessions from every worker; this worker's in-memory copy wins."""
+        # The shared store is a blocking read; self.sessions is only touched on the loop
+        merged = await asyncio.to_thread(self.store.load_all, status) if self.store.shared else {}
+        if status:
+            merged.update({sid: s for sid, s in self.sessions.items() if s.get("status") == status})
+        else:
+            merged.update(self.sessions)
+        return merged
 
     # -------- Session lifecycle --------
 
@@ -29,14 +55,10 @@ class ConversationManager:
             "analysis": None,         # cached analysis
             "last_activity": now,     # updated on add_message
             "conversation_context": {},  # slot-filling memory
-            "slots": {               # lightweight slot-filling memory
-                "care_needs": set(),
-                "hours_per_week": None,
-                "days": set(),
-                "time_of_day": None
-            }
+            "slots": intake_slots.new_slots(),  # updated incrementally on add_message
         }
         self.active_session_id = session_id
+        self._persist(session_id)
         return session_id
 
     # def get_or_create_active_session(self, caller_id: str = "unknown") -> str:
@@ -64,6 +86,9 @@ class ConversationManager:
             self.sessions[session_id]["analysis"] = self._analyze_session(self.sessions[session_id])
             if self.active_session_id == session_id:
                 self.active_session_id = None
+            self._latency.pop(session_id, None)
+            self._persist(session_id)
+            call_rollups.record_session(session_id, self.sessions[session_id])
 
     def mark_closed(self, session_id: str, analysis: Optional[Dict[str, Any]] = None):
         """Explicitly close the session and set analysis if provided."""
@@ -76,6 +101,9 @@ class ConversationManager:
                 self.sessions[session_id]["analysis"] = self._analyze_session(self.sessions[session_id])
             if self.active_session_id == session_id:
                 self.active_session_id = None
+            self._latency.pop(session_id, None)
+            self._persist(session_id)
+            call_rollups.record_session(session_id, self.sessions[session_id])
 
     # -------- Messages & analysis --------
 
@@ -85,8 +113,25 @@ class ConversationManager:
             session_id = self.start_session("unknown")  # create a new one if missing
         self.sessions[session_id]["messages"].append(message)
         self.sessions[session_id]["last_activity"] = datetime.now().isoformat()
+        # fold only the new utterance into the intake slots
+        intake_slots.sync_slots(self.sessions[session_id])
         # optional: keep rolling analysis cached
         self.sessions[session_id]["analysis"] = self._analyze_session(self.sessions[session_id])
+        self._persist(session_id)
+
+    def record_turn_timing(self, session_id: str, entry: dict, timings: Dict[str, float]):
+        """
+        Attach a finished turn's latency spans to its message and the session
+        metadata. No write of its own: the next persist (next turn or close) carries it.
+        """
+        entry["latency_ms"] = timings["total_ms"]   # read by call_rollups
+        entry["metadata"] = {**(entry.get("metadata") or {}), "timings": timings}
+        sess = self.sessions.get(session_id)
+        if sess is None:
+            return
+        stats = self._latency.setdefault(session_id, turn_timing.LatencyStats())
+        stats.add(timings)
+        sess["metadata"] = {**(sess.get("metadata") or {}), "latency": stats.summary()}
 
     def _analyze_session(self, session: dict) -> Dict[str, Any]:
         """Generate a comprehensive summary of one session."""
@@ -265,10 +310,12 @@ class ConversationManager:
 
     # -------- Inspection APIs --------
 
-    def get_history(self, session_id: Optional[str] = None, status: Optional[str] = None):
-        """Return in-memory sessions (no DB reads)."""
+    async def get_history(self, session_id: Optional[str] = None, status: Optional[str] = None):
+        """Return in-memory sessions (no DB reads), plus other workers' via the shared store."""
         if session_id:
             session = self.sessions.get(session_id)
+            if not session and self.store.shared:
+                session = await asyncio.to_thread(self.store.load, session_id)
             if not session:
                 return {"error": "Session not found"}
             return {
@@ -279,11 +326,11 @@ class ConversationManager:
 
         # Filter by status if provided
         if status == "active":
-            filtered = {sid: s for sid, s in self.sessions.items() if s.get("status") == "live"}
+            filtered = await self._all_sessions("live")
         elif status == "closed":
-            filtered = {sid: s for sid, s in self.sessions.items() if s.get("status") == "closed"}
+            filtered = await self._all_sessions("closed")
         else:
-            filtered = self.sessions
+            filtered = await self._all_sessions()
 
         return {
             sid: {
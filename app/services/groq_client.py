@@ -425,13 +425,15 @@
 # app/services/groq_client.py
 # Complete Groq client with unified proactive system prompt
 
-import json, re, random, time
+import json, os, random, time
 from typing import Dict, Any, List, Optional
 import requests
+from requests.adapters import HTTPAdapter
 from app.core.config import GROQ_API_KEY, logger
-from app.services.prompt_manager import PromptManager
-
-prompt_manager = PromptManager()
+from app.services.prompt_manager import prompt_manager
+from app.services.llm_router import LLMRouter, LLMRoute, env_list
+from app.services.resilience import AIMDLimiter, CircuitBreaker
+from app.utils.llm_output import extract_json_object, normalize_ai_response
 
 
 
@@ -439,12 +441,43 @@ prompt_manager = PromptManager()
 class GroqClient:
     def __init__(self):
         self.api_key = GROQ_API_KEY
-        self.model = "llama-3.1-8b-instant"
-        self.base_url = "https://api.groq.com/openai/v1/chat/completions"
+        # Ordered by preference; the router reorders by observed latency
+        self.models = env_list("GROQ_MODELS", "llama-3.1-8b-instant")
+        self.endpoints = env_list("GROQ_ENDPOINTS", "https://api.groq.com/openai/v1/chat/completions")
+        self.model = self.models[0]
+        self.base_url = self.endpoints[0]
         self.headers = {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json",
         }
+        # Keep-alive pool shared by the router's threads (opened at startup by warm_connections)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=max(1, len(self.endpoints)),
+            pool_maxsize=int(os.getenv("GROQ_HTTP_POOL_SIZE", "32")),
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.router = LLMRouter(
+            routes=[LLMRoute(model, url) for model in self.models for url in self.endpoints],
+            send=self._send_to_route,
+            hedge_percentile=float(os.getenv("GROQ_HEDGE_PERCENTILE", "90")),
+            default_hedge_delay=float(os.getenv("GROQ_HEDGE_DELAY_MS", "1500")) / 1000,
+        )
+        # Shared by every call in this worker so a Groq outage fails fast everywhere
+        self.breaker = CircuitBreaker(
+            "groq",
+            failure_threshold=int(os.getenv("GROQ_BREAKER_FAILURES", "5")),
+            reset_timeout=float(os.getenv("GROQ_BREAKER_RESET_S", "15")),
+        )
+        self.limiter = AIMDLimiter(
+            "groq",
+            initial=float(os.getenv("GROQ_CONCURRENCY_INITIAL", "8")),
+            max_limit=float(os.getenv("GROQ_CONCURRENCY_MAX", "64")),
+            max_wait=float(os.getenv("GROQ_CONCURRENCY_WAIT_MS", "1000")) / 1000,
+        )
+        # Rendered system prompts keyed by (config version, language, first turn)
+        self._system_prompts: Dict[tuple, str] = {}
 
     # ---------- Main API ----------
     def detect_intent(
@@ -453,16 +486,33 @@ class GroqClient:
         stt_lang_hint: str = "en",
         context_messages: Optional[List[dict]] = None,
         is_first_turn: bool = False,
+        timings: Optional[Dict[str, float]] = None,
         **kwargs  # Accept other params for compatibility but ignore them
     ) -> Dict[str, Any]:
         """
         Generate natural conversational response based on user input and context.
         Simplified approach - let the AI decide how to respond naturally.
+        `timings`, if given, receives started (monotonic), queue_s and Groq's reported
+        server_queue_s / generation_s, for turn_timing.
         """
-        try:
-            if not text_to_analyze or not text_to_analyze.strip():
-                return self._fallback_response(text_to_analyze, stt_lang_hint)
+        timings = timings if timings is not None else {}
+        timings["started"] = time.monotonic()
+        if not text_to_analyze or not text_to_analyze.strip():
+            return self._fallback_response(text_to_analyze, stt_lang_hint)
 
+        # Fail fast while Groq is degraded instead of stacking retries on every turn
+        acquired = self.limiter.acquire()
+        timings["queue_s"] = time.monotonic() - timings["started"]
+        if not acquired:
+            logger.warning("[Groq] ⚠️ Concurrency limit reached, using fallback response")
+            return self._fallback_response(text_to_analyze, stt_lang_hint)
+        if not self.breaker.allow():
+            self.limiter.release(None)
+            logger.warning("[Groq] 🔴 Circuit open, using fallback response")
+            return self._fallback_response(text_to_analyze, stt_lang_hint)
+
+        outcome = None
+        try:
             text = text_to_analyze.strip()
             if len(text) > 800:
                 text = text[:800]
@@ -482,8 +532,15 @@ class GroqClient:
                 "response_format": {"type": "json_object"},
             }
 
-            response = self._post_with_retry(payload, retries=2, backoff=2)
-            result = self._parse_response(response.json())
+            try:
+                response = self._post_with_retry(payload, retries=2, backoff=2)
+            except requests.exceptions.RequestException as e:
+                outcome = False if self._is_transient(e) else None
+                raise
+            outcome = True
+            body = response.json()
+            self._record_server_timings(body, timings)
+            result = self._parse_response(body)
 
             # Ensure consistent language
             result["detected_language"] = stt_lang_hint
@@ -497,6 +554,11 @@ class GroqClient:
             logger.error(f"[Groq] Error: {e}")
             return self._fallback_response(text_to_analyze, stt_lang_hint)
 
+        finally:
+            self.limiter.release(outcome)
+            if outcome is None:
+                self.breaker.release()
+
     # ---------- Message Building ----------
     def _build_natural_messages(
         self,
@@ -507,7 +569,7 @@ class GroqClient:
     ) -> List[dict]:
         """Build messages for natural conversation"""
         
-        system_prompt = self._create_natural_system_prompt(language, is_first_turn)
+        system_prompt = self._get_system_prompt(language, is_first_turn)
         
         messages = [{"role": "system", "content": system_prompt}]
         
@@ -523,6 +585,17 @@ class GroqClient:
         
         return messages
 
+    def _get_system_prompt(self, language: str, is_first_turn: bool) -> str:
+        """Render the system prompt once per config version instead of every turn."""
+        key = (prompt_manager.version, language, is_first_turn)
+        system_prompt = self._system_prompts.get(key)
+        if system_prompt is None:
+            if len(self._system_prompts) >= 64:
+                self._system_prompts.clear()  # only old versions accumulate
+            system_prompt = self._create_natural_system_prompt(language, is_first_turn)
+            self._system_prompts[key] = system_prompt
+        return system_prompt
+
     # def _create_natural_system_prompt(self, language: str, is_first_turn: bool, service_name: str = "caregiving") -> str:
     #     try:
     #         response = requests.get(f"{BACKEND_BASE_URL}/prompt-templates/{service_name}", timeout=5)
@@ -659,22 +732,9 @@ When they ask about next steps, be PROACTIVE and help them move forward."""
     def _post_process_response(self, result: Dict[str, Any], user_input: str, language: str) -> Dict[str, Any]:
         """Clean up and improve the response for naturalness"""
         
-        ai_response = result.get("ai_response", "")
-        
-        # Remove overly formal patterns
-        ai_response = re.sub(r'^(Perfect[\.!]*\s*[\-—]?\s*)', '', ai_response)
-        ai_response = re.sub(r'^(Perfecto[\.!]*\s*[\-—]?\s*)', '', ai_response)
-        ai_response = re.sub(r'^(Got it[\-—]\s*)', '', ai_response)
-        ai_response = re.sub(r'^(Entendido[\-—]\s*)', '', ai_response)
-        
-        # Remove redundant confirmations at the start
-        ai_response = re.sub(r'^(Thank you for that information\.?\s*)', '', ai_response)
-        ai_response = re.sub(r'^(Gracias por esa información\.?\s*)', '', ai_response)
-        
-        # Clean up multiple spaces and ensure proper capitalization
-        ai_response = re.sub(r'\s+', ' ', ai_response).strip()
-        if ai_response:
-            ai_response = ai_response[0].upper() + ai_response[1:]
+        # Remove formal openers / redundant confirmations, collapse spaces and
+        # capitalize - one precompiled pass
+        ai_response = normalize_ai_response(result.get("ai_response", ""))
         
         # Ensure we have a response
         if not ai_response:
@@ -699,33 +759,24 @@ When they ask about next steps, be PROACTIVE and help them move forward."""
 
     # ---------- HTTP & Parsing ----------
     def _post_with_retry(self, payload, retries: int = 2, backoff: float = 2.0):
-        """HTTP POST with retry logic for transient errors"""
+        """Routed (hedged, multi-model) POST with retry logic for transient errors"""
         last_error = None
         
         for attempt in range(retries + 1):
             try:
-                response = requests.post(
-                    self.base_url, 
-                    headers=self.headers, 
-                    json=payload, 
-                    timeout=15
-                )
-                
-                if response.status_code == 400:
-                    logger.error(f"[Groq 400] payload={json.dumps(payload, ensure_ascii=False)[:500]}")
-                    logger.error(f"[Groq 400] response={response.text[:500]}")
-                
-                response.raise_for_status()
+                response = self.router.post(payload)
+                self.breaker.record_success()
                 return response
                 
             except requests.exceptions.RequestException as e:
                 last_error = e
-                status = getattr(response, "status_code", None) if 'response' in locals() else None
                 
-                # Only retry on transient errors
-                transient = status in (429, 500, 502, 503, 504) if status else True
+                # Only transient errors count against Groq's health or get retried
+                transient = self._is_transient(e)
+                if transient:
+                    self.breaker.record_failure()
                 
-                if attempt < retries and transient:
+                if attempt < retries and transient and self.breaker.state == CircuitBreaker.CLOSED:
                     wait_time = backoff * (2 ** attempt) + random.uniform(0, 0.5)
                     logger.warning(f"[Groq] Attempt {attempt + 1} failed, retrying in {wait_time:.1f}s: {e}")
                     time.sleep(wait_time)
@@ -735,21 +786,58 @@ When they ask about next steps, be PROACTIVE and help them move forward."""
         
         raise last_error
 
+    @staticmethod
+    def _record_server_timings(body: Dict[str, Any], timings: Dict[str, float]):
+        """Groq reports its own queue/prompt/completion seconds in `usage`."""
+        usage = body.get("usage") or {}
+        try:
+            timings["server_queue_s"] = float(usage.get("queue_time") or 0.0)
+            timings["generation_s"] = float(usage.get("prompt_time") or 0.0) + float(usage.get("completion_time") or 0.0)
+        except (TypeError, ValueError):
+            pass
+
+    @staticmethod
+    def _is_transient(error: Exception) -> bool:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+        return status in (429, 500, 502, 503, 504) if status else True
+
+    def _send_to_route(self, route: LLMRoute, payload: Dict[str, Any]):
+        """Single HTTP POST to one model/endpoint route"""
+        body = {**payload, "model": route.model}
+        response = self.session.post(
+            route.base_url, 
+            headers=self.headers, 
+            json=body, 
+            timeout=15
+        )
+        
+        if response.status_code == 400:
+            logger.error(f"[Groq 400] payload={json.dumps(body, ensure_ascii=False)[:500]}")
+            logger.error(f"[Groq 400] response={response.text[:500]}")
+        
+        response.raise_for_status()
+        return response
+
+    def warm_connections(self) -> int:
+        """Open a pooled TLS connection to each endpoint so the first call skips the handshake."""
+        warmed = 0
+        for url in self.endpoints:
+            try:
+                self.session.head(url, headers=self.headers, timeout=5)
+                warmed += 1
+            except requests.exceptions.RequestException as e:
+                logger.warning(f"[Groq] Warm-up to {url} failed: {e}")
+        return warmed
+
     def _parse_response(self, response: Dict) -> Dict[str, Any]:
         """Parse Groq response and extract JSON"""
         try:
             raw_output = response["choices"][0]["message"]["content"]
             
-            # Try direct JSON parsing first
-            try:
-                parsed = json.loads(raw_output)
-            except json.JSONDecodeError:
-                # Extract JSON from text if wrapped in other content
-                json_match = re.search(r'{.*}', raw_output, re.DOTALL)
-                if json_match:
-                    parsed = json.loads(json_match.group())
-                else:
-                    raise ValueError("No valid JSON found in response")
+            # Direct JSON first, then the first object embedded in other content
+            parsed = extract_json_object(raw_output)
+            if parsed is None:
+                raise ValueError("No valid JSON found in response")
             
             # Ensure all required keys exist
             return {
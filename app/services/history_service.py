@@ -0,0 +1,217 @@
+# app/services/history_service.py
+# Keyset-paginated reads of persisted conversations for the dashboard.
+#
+# Pages are ordered newest first by (started_at, id); the cursor is the last
+# row's key, so page N costs the same as page 1 on the
+# (company_id, office_id, started_at desc, id desc) index (migration 002).
+# Analysis comes from the intent_summary written by flush_to_supabase.
+# The export helpers stream the same pages as NDJSON/CSV in constant memory.
+
+import base64
+import csv
+import io
+import json
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from app.services.conversation_manager import conversation_manager
+
+CONVERSATION_COLUMNS = (
+    "id, company_id, office_id, status, language, direction, "
+    "started_at, ended_at, intent_summary, metadata"
+)
+MESSAGE_COLUMNS = (
+    "id, transcript, translated_text, intent, ai_response, ai_response_translated, "
+    "urgent, language, sentiment, is_final, timestamp, audio_id"
+)
+MESSAGES_EMBED = f"messages!messages_session_id_fkey({MESSAGE_COLUMNS})"
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# Dashboard vocabulary → conversations.status
+_STATUS_ALIASES = {"active": "open", "live": "open"}
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(started_at: str, conversation_id: str) -> str:
+    raw = json.dumps([started_at, conversation_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        started_at, conversation_id = (str(v) for v in json.loads(raw))
+    except Exception as e:
+        raise InvalidCursor(f"Invalid cursor: {e}") from e
+    # Both values are spliced into a PostgREST or= filter
+    if any(c in started_at + conversation_id for c in '",()'):
+        raise InvalidCursor("Invalid cursor")
+    return started_at, conversation_id
+
+
+def _analysis_from_messages(messages: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Legacy rows without intent_summary: analyzed the way flush_to_supabase persists it."""
+    return conversation_manager._analyze_session({"messages": messages})
+
+
+def _to_item(row: Dict[str, Any], summary_only: bool) -> Dict[str, Any]:
+    messages = row.get("messages") or []
+    analysis = row.get("intent_summary")
+    if not analysis and not summary_only:
+        analysis = _analysis_from_messages(messages)
+    item = {
+        "id": row["id"],
+        "company_id": row.get("company_id"),
+        "office_id": row.get("office_id"),
+        "caller_id": (row.get("metadata") or {}).get("caller_id"),
+        "start_time": row.get("started_at"),
+        "end_time": row.get("ended_at"),
+        "status": row.get("status"),
+        "language": row.get("language"),
+        "analysis": analysis,
+    }
+    if not summary_only:
+        item["messages"] = messages
+    return item
+
+
+def fetch_page(
+    client,
+    *,
+    company_id: Optional[str] = None,
+    office_id: Optional[str] = None,
+    session_id: Optional[str] = None,
+    status: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    summary_only: bool = False,
+) -> Dict[str, Any]:
+    """One page of conversations, newest first (blocking). Returns items and next_cursor."""
+    limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+    columns = CONVERSATION_COLUMNS if summary_only else f"{CONVERSATION_COLUMNS}, {MESSAGES_EMBED}"
+    query = client.table("conversations").select(columns)
+
+    if session_id:
+        query = query.eq("id", session_id)
+    if company_id:
+        query = query.eq("company_id", company_id)
+    if office_id:
+        query = query.eq("office_id", office_id)
+    if status:
+        query = query.eq("status", _STATUS_ALIASES.get(status, status))
+    if since:
+        query = query.gte("started_at", since)
+    if until:
+        query = query.lt("started_at", until)
+    if cursor:
+        started_at, last_id = decode_cursor(cursor)
+        query = query.or_(
+            f'started_at.lt."{started_at}",and(started_at.eq."{started_at}",id.lt.{last_id})'
+        )
+
+    query = query.order("started_at", desc=True).order("id", desc=True)
+    if not summary_only:
+        query = query.order("timestamp", foreign_table="messages")
+    rows = query.limit(limit + 1).execute().data or []
+
+    page, more = rows[:limit], len(rows) > limit
+    next_cursor = encode_cursor(page[-1]["started_at"], page[-1]["id"]) if more else None
+    return {
+        "conversations": [_to_item(row, summary_only) for row in page],
+        "next_cursor": next_cursor,
+    }
+
+
+# ---------- Streaming export ----------
+
+EXPORT_PAGE_SIZE = MAX_PAGE_SIZE
+
+CONVERSATION_EXPORT_FIELDS = (
+    "id", "company_id", "office_id", "caller_id", "start_time", "end_time", "status",
+    "language", "main_intent", "urgent", "total_messages", "cursor",
+)
+MESSAGE_EXPORT_FIELDS = (
+    "conversation_id", "company_id", "office_id", "message_id", "timestamp", "language",
+    "intent", "urgent", "sentiment", "is_final", "transcript", "ai_response", "cursor",
+)
+
+
+def iter_conversations(client, *, summary_only: bool = True, cursor: Optional[str] = None, **filters):
+    """Yield (conversation, cursor_after_it) page by page; one page in memory at a time."""
+    while True:
+        page = fetch_page(client, cursor=cursor, limit=EXPORT_PAGE_SIZE, summary_only=summary_only, **filters)
+        for item in page["conversations"]:
+            yield item, encode_cursor(item["start_time"], item["id"])
+        cursor = page["next_cursor"]
+        if not cursor:
+            return
+
+
+def iter_export_rows(client, kind: str = "conversations", **filters):
+    """
+    Flat export rows. Each row carries the cursor of its conversation: pass
+    the cursor of the last fully written conversation to resume after it.
+    """
+    if kind == "messages":
+        for conv, cursor in iter_conversations(client, summary_only=False, **filters):
+            for m in conv.get("messages") or []:
+                yield {
+                    "conversation_id": conv["id"],
+                    "company_id": conv["company_id"],
+                    "office_id": conv["office_id"],
+                    "message_id": m.get("id"),
+                    "timestamp": m.get("timestamp"),
+                    "language": m.get("language"),
+                    "intent": m.get("intent"),
+                    "urgent": m.get("urgent"),
+                    "sentiment": m.get("sentiment"),
+                    "is_final": m.get("is_final"),
+                    "transcript": m.get("transcript"),
+                    "ai_response": m.get("ai_response"),
+                    "cursor": cursor,
+                }
+        return
+
+    for conv, cursor in iter_conversations(client, summary_only=True, **filters):
+        analysis = conv.get("analysis") or {}
+        # _analyze_session nests counts under "metrics"; very old summaries had them at the top
+        total_messages = (analysis.get("metrics") or {}).get("total_messages", analysis.get("total_messages"))
+        yield {
+            "id": conv["id"],
+            "company_id": conv["company_id"],
+            "office_id": conv["office_id"],
+            "caller_id": conv["caller_id"],
+            "start_time": conv["start_time"],
+            "end_time": conv["end_time"],
+            "status": conv["status"],
+            "language": conv["language"],
+            "main_intent": analysis.get("main_intent"),
+            "urgent": analysis.get("urgent"),
+            "total_messages": total_messages,
+            "cursor": cursor,
+        }
+
+
+def export_ndjson(rows) -> Iterator[str]:
+    for row in rows:
+        yield json.dumps(row, default=str) + "\n"
+
+
+def export_csv(rows, fields) -> Iterator[str]:
+    """CSV text in chunks of EXPORT_PAGE_SIZE rows, header first."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fields, extrasaction="ignore")
+    writer.writeheader()
+    for i, row in enumerate(rows, 1):
+        writer.writerow(row)
+        if i % EXPORT_PAGE_SIZE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
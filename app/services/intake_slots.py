@@ -0,0 +1,114 @@
+# app/services/intake_slots.py
+# Incremental slot filling for client intake.
+#
+# Each session carries a "slots" dict. Every new utterance is folded into it
+# once (via the cached intent_matcher features), so intake checks read slot
+# state instead of rebuilding the whole conversation on every turn.
+
+import re
+from typing import Any, Dict
+
+from app.services import intent_matcher
+
+_DAY_ORDER = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday", "weekdays", "weekend")
+# Spoken/abbreviated forms → canonical day. Whole words only: intent_matcher
+# keywords are substrings ("mon" is in "monday" and "money").
+_DAY_ALIASES = {
+    **{day: day for day in _DAY_ORDER},
+    "weekday": "weekdays", "weekends": "weekend",
+    "mon": "monday", "tue": "tuesday", "tues": "tuesday", "wed": "wednesday", "thu": "thursday",
+    "thur": "thursday", "thurs": "thursday", "fri": "friday", "sat": "saturday", "sun": "sunday",
+    "lunes": "monday", "martes": "tuesday", "miércoles": "wednesday", "miercoles": "wednesday",
+    "jueves": "thursday", "viernes": "friday", "sábado": "saturday", "sabado": "saturday",
+    "domingo": "sunday", "fin de semana": "weekend", "entre semana": "weekdays",
+}
+_DAY_RE = re.compile(r"\b(" + "|".join(sorted(_DAY_ALIASES, key=len, reverse=True)) + r")\b")
+
+
+def new_slots() -> Dict[str, Any]:
+    """Empty slot state for a fresh session (JSON-serializable)."""
+    return {
+        "care_needs": [],
+        "hours_per_week": None,
+        "days": [],
+        "time_of_day": None,
+        "caller_name": None,
+        "care_recipient": None,
+        "contact_phone": None,
+        "caller_introduced": False,
+        "care_recipient_mentioned": False,
+        "care_need_mentioned": False,
+        "messages_seen": 0,
+    }
+
+
+def update_slots(slots: Dict[str, Any], transcript: str, language: str = "en") -> Dict[str, Any]:
+    """Fold one caller utterance into the slots. O(len(transcript))."""
+    if not transcript:
+        return slots
+
+    features = intent_matcher.analyze(transcript, language)
+    keywords = features.keywords
+
+    # First value wins for identity/contact slots
+    if not slots["caller_name"] and features.caller_name:
+        slots["caller_name"] = features.caller_name
+    if not slots["care_recipient"]:
+        for pattern in intent_matcher.INTAKE_RECIPIENTS:
+            if pattern in keywords:
+                slots["care_recipient"] = pattern.replace("my ", "").title()
+                break
+    if not slots["contact_phone"] and features.phone:
+        slots["contact_phone"] = features.phone
+
+    for need_type, need_keywords in intent_matcher.CARE_NEED_TYPES:
+        if need_type not in slots["care_needs"] and not keywords.isdisjoint(need_keywords):
+            slots["care_needs"].append(need_type)
+
+    # Latest value wins for schedule slots
+    if features.hours_per_week:
+        slots["hours_per_week"] = features.hours_per_week
+    if features.time_range:
+        slots["time_of_day"] = f"{features.time_range[0]}am to {features.time_range[1]}pm"
+    mentioned = {_DAY_ALIASES[m] for m in _DAY_RE.findall(features.text_lower)}
+    for day in _DAY_ORDER:
+        if day in mentioned and day not in slots["days"]:
+            slots["days"].append(day)
+
+    slots["caller_introduced"] |= features.has_any(intent_matcher.NAME_INTRO)
+    slots["care_recipient_mentioned"] |= features.has_any(intent_matcher.CARE_RECIPIENTS)
+    slots["care_need_mentioned"] |= features.has_any(intent_matcher.CARE_NEEDS)
+    return slots
+
+
+def sync_slots(session: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Bring session["slots"] up to date with session["messages"], folding in
+    only the messages added since the last sync.
+    """
+    slots = session.get("slots")
+    if not slots or "messages_seen" not in slots:
+        slots = session["slots"] = new_slots()
+
+    messages = session.get("messages", [])
+    for msg in messages[slots["messages_seen"]:]:
+        update_slots(slots, msg.get("transcript", ""), msg.get("language") or "en")
+    slots["messages_seen"] = len(messages)
+    return slots
+
+
+def is_intake_complete(slots: Dict[str, Any]) -> bool:
+    """Caller introduced themselves, named a care recipient and a care need."""
+    return slots["caller_introduced"] and slots["care_recipient_mentioned"] and slots["care_need_mentioned"]
+
+
+def intake_info(slots: Dict[str, Any]) -> Dict[str, Any]:
+    """Intake summary in the shape the handoff responses expect."""
+    hours = slots["hours_per_week"]
+    return {
+        "caller_name": slots["caller_name"],
+        "care_recipient": slots["care_recipient"],
+        "care_needs": list(slots["care_needs"]),
+        "schedule_preference": f"{hours} hours per week" if hours else None,
+        "contact_phone": slots["contact_phone"],
+    }
@@ -0,0 +1,200 @@
+# app/services/intent_matcher.py
+# Precompiled, single-pass heuristics for transcript_service.
+#
+# Every keyword list used by the goodbye / handoff / intake checks is compiled
+# into one trie-shaped regex that is scanned once per utterance. The result is
+# cached per message text, so a turn only analyzes its new utterance and the
+# checks combine cached per-message features instead of re-joining history.
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import FrozenSet, Iterable, Optional, Tuple
+
+from app.utils.spoken_numbers import normalize_spoken_numbers
+
+# ---------- Keyword groups ----------
+
+GOODBYE_PHRASES = frozenset([
+    "goodbye", "good bye", "bye", "bye bye", "see you later", "talk to you later",
+    "that's all", "that's it", "that is all", "nothing else", "all set", "all good",
+    "thank you that's all", "thanks that's all", "thank you so much", "thanks so much",
+    "not that i know of", "nothing that i know of", "no that's it", "no thanks",
+    "have a good day", "have a great day", "take care",
+    "i'll wait for your call", "call me back", "talk to you soon",
+    "adiós", "hasta luego", "gracias", "eso es todo", "nada más",
+])
+SHORT_THANKS = frozenset(["thank you", "thanks", "gracias"])
+
+NAME_INTRO = frozenset(["my name is", "i am", "this is", "i'm"])
+
+PHONE_PROCESS_QUESTIONS = frozenset([
+    "do you need my phone", "need my number", "want my phone", "should i give you my phone",
+    "can i give you my number", "do you want my number",
+])
+
+SCHEDULING_CONTEXT = frozenset(["schedule", "appointment", "call me", "contact", "follow up"])
+SCHEDULING_PHRASES = frozenset([
+    "call me", "contact me", "schedule", "appointment", "phone number",
+    "number is", "reach me", "best time", "tomorrow", "next week",
+])
+
+CARE_RECIPIENTS = frozenset([
+    "my mom", "my mother", "my dad", "my father", "my husband", "my wife",
+    "my parent", "my grandmother", "my grandfather", "for my", "care for",
+])
+# Order matters: the first listed recipient present in a message wins
+INTAKE_RECIPIENTS = ("my mom", "my mother", "my dad", "my father", "my husband", "my wife", "my parent")
+
+CARE_NEEDS = frozenset([
+    "companionship", "medication", "housekeeping", "cooking", "meal",
+    "walking", "exercise", "personal care", "assistance", "help with",
+    "dementia", "alzheimer", "diabetic", "mobility", "safety",
+])
+# The schedule check also accepts "remind" as a care need
+CARE_NEEDS_WITH_REMINDERS = CARE_NEEDS | {"remind"}
+
+CARE_NEED_TYPES = (
+    ("companionship", ("companionship", "company", "conversation")),
+    ("medication_reminders", ("medication", "medicine", "pills", "remind")),
+    ("light_housekeeping", ("housekeeping", "cleaning")),
+    ("meal_preparation", ("meal", "cooking", "food")),
+    ("walking_support", ("walking", "walk", "exercise")),
+)
+
+DAYS = frozenset([
+    "monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday",
+    "weekday", "weekdays", "weekend", "mon", "tue", "wed", "thu", "fri", "sat", "sun",
+])
+
+JOB_APPLICATION_PHRASES = frozenset([
+    "job application", "applied for", "caregiver job", "hiring", "application status",
+    "follow up on my application", "i applied",
+])
+
+MOM = frozenset(["my mom", "my mother"])
+DAD = frozenset(["my dad", "my father"])
+
+_ALL_KEYWORDS = frozenset().union(
+    GOODBYE_PHRASES, NAME_INTRO, PHONE_PROCESS_QUESTIONS, SCHEDULING_CONTEXT,
+    SCHEDULING_PHRASES, CARE_RECIPIENTS, CARE_NEEDS_WITH_REMINDERS, DAYS,
+    JOB_APPLICATION_PHRASES, *(keywords for _, keywords in CARE_NEED_TYPES),
+)
+
+# ---------- Structured patterns ----------
+
+PHONE_RE = re.compile(r'\b(\d{3})[\s\-]?(\d{3})[\s\-]?(\d{4})\b')
+HOURS_PER_WEEK_RE = re.compile(r'(\d+)\s*hours?\s*(?:per\s*)?week')
+HOURS_PER_WEEK_LOOSE_RE = re.compile(r'(\d+)\s*(?:hours?|hrs?)\s*(?:a|per|/)\s*week')
+TIME_WINDOW_RE = re.compile(r'\d{1,2}\s*(?:to|-|am|pm)')
+SPECIFIC_TIME_RE = re.compile(r'\d{1,2}\s*(?:am|pm)')
+TIME_RANGE_RE = re.compile(r'(\d{1,2})\s*(?:am|a\.m\.)?\s*(?:to|-|–)\s*(\d{1,2})\s*(?:am|pm|p\.m\.)')
+CALLER_NAME_RES = (
+    re.compile(r"my name is ([a-z\s]+)"),
+    re.compile(r"i am ([a-z\s]+)"),
+    re.compile(r"this is ([a-z\s]+)"),
+)
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """Render words as a trie-shaped alternation so each position costs O(keyword length)."""
+    trie: dict = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def render(node: dict) -> str:
+        branches = [re.escape(ch) + render(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        # Greedy optional suffix: the longest keyword starting here wins
+        return f"(?:{body})?" if "" in node else body
+
+    return render(trie)
+
+
+# Zero-width lookahead reports a match at every position a keyword starts,
+# so overlapping keywords ("bye" inside "goodbye") are all seen.
+_KEYWORD_RE = re.compile(f"(?=({_trie_pattern(_ALL_KEYWORDS)}))")
+
+# At a given position only the longest keyword is captured; every shorter
+# keyword matching there is a prefix of it, so precompute those prefixes.
+_PREFIX_CLOSURE = {
+    keyword: frozenset(other for other in _ALL_KEYWORDS if keyword.startswith(other))
+    for keyword in _ALL_KEYWORDS
+}
+
+
+@dataclass(frozen=True)
+class UtteranceFeatures:
+    """Everything the heuristics need from one utterance, computed in one pass."""
+    text_lower: str
+    keywords: FrozenSet[str]
+    phone: Optional[str]
+    hours_per_week: Optional[str]
+    hours_per_week_loose: Optional[str]
+    has_time_window: bool
+    has_specific_time: bool
+    time_range: Optional[Tuple[str, str]]
+    caller_name: Optional[str]
+
+    def has_any(self, group: FrozenSet[str]) -> bool:
+        return not self.keywords.isdisjoint(group)
+
+
+@lru_cache(maxsize=4096)
+def analyze(text: str, language: Optional[str] = "en") -> UtteranceFeatures:
+    """
+    Scan one utterance once; cached so history is never rescanned.
+    language only picks the number words read for the phone ("once" is 11 in Spanish).
+    """
+    lower = (text or "").lower()
+
+    keywords = set()
+    for match in _KEYWORD_RE.finditer(lower):
+        keywords |= _PREFIX_CLOSURE[match.group(1)]
+
+    # Dictated numbers ("five five five, one two three...") only count for the phone;
+    # runs must come out as 7-11 digits
+    phone_match = PHONE_RE.search(normalize_spoken_numbers(lower, language))
+    phone = f"{phone_match.group(1)}-{phone_match.group(2)}-{phone_match.group(3)}" if phone_match else None
+    if any(ch.isdigit() for ch in lower):
+        hours = HOURS_PER_WEEK_RE.search(lower)
+        hours_loose = HOURS_PER_WEEK_LOOSE_RE.search(lower)
+        time_range = TIME_RANGE_RE.search(lower)
+        has_time_window = bool(TIME_WINDOW_RE.search(lower))
+        has_specific_time = bool(SPECIFIC_TIME_RE.search(lower))
+    else:
+        hours = hours_loose = time_range = None
+        has_time_window = has_specific_time = False
+
+    caller_name = None
+    if keywords & {"my name is", "i am", "this is"}:
+        for pattern in CALLER_NAME_RES:
+            name_match = pattern.search(lower)
+            if name_match:
+                caller_name = name_match.group(1).strip().title()
+                break
+
+    return UtteranceFeatures(
+        text_lower=lower,
+        keywords=frozenset(keywords),
+        phone=phone,
+        hours_per_week=hours.group(1) if hours else None,
+        hours_per_week_loose=hours_loose.group(1) if hours_loose else None,
+        has_time_window=has_time_window,
+        has_specific_time=has_specific_time,
+        time_range=(time_range.group(1), time_range.group(2)) if time_range else None,
+        caller_name=caller_name,
+    )
+
+
+def combined_keywords(features: Iterable[UtteranceFeatures]) -> FrozenSet[str]:
+    """Union of keywords across several analyzed utterances."""
+    found = set()
+    for f in features:
+        found |= f.keywords
+    return frozenset(found)
@@ -0,0 +1,75 @@
+# app/services/interim_coalescer.py
+# Latest-wins rate limiting of interim transcripts on their way to dashboards.
+#
+# Deepgram calls on_transcript from its own thread for every partial result.
+# Instead of scheduling one broadcast coroutine per partial, the coalescer
+# keeps only the newest partial and emits it at most INTERIM_BROADCAST_HZ
+# times per second. Finals bypass the rate limit and discard any pending
+# partial so a stale interim never lands after its final.
+
+import asyncio
+import os
+import threading
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from app.core.config import logger
+
+INTERIM_BROADCAST_HZ = float(os.getenv("INTERIM_BROADCAST_HZ", "10"))
+
+Emit = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+class InterimCoalescer:
+    def __init__(self, loop: asyncio.AbstractEventLoop, emit: Emit, hz: float = INTERIM_BROADCAST_HZ):
+        self.loop = loop
+        self.emit = emit
+        self.interval = 1.0 / hz if hz > 0 else 0.0
+        self._lock = threading.Lock()
+        self._pending: Optional[Dict[str, Any]] = None
+        self._scheduled = False
+        self._last_emit = float("-inf")
+        self.received = 0
+        self.emitted = 0
+
+    # ---------- Any thread ----------
+
+    def interim(self, message: Dict[str, Any]):
+        with self._lock:
+            self.received += 1
+            self._pending = message
+            if self._scheduled:
+                return
+            self._scheduled = True
+        self.loop.call_soon_threadsafe(self._schedule)
+
+    def final(self, message: Optional[Dict[str, Any]] = None):
+        """Drop the pending partial and, if given, send the final right away."""
+        with self._lock:
+            self._pending = None
+        if message is not None:
+            asyncio.run_coroutine_threadsafe(self._send(message), self.loop)
+
+    # ---------- Event loop ----------
+
+    def _schedule(self):
+        delay = self._last_emit + self.interval - self.loop.time()
+        if delay > 0:
+            self.loop.call_later(delay, self._flush)
+        else:
+            self._flush()
+
+    def _flush(self):
+        with self._lock:
+            message, self._pending = self._pending, None
+            self._scheduled = False
+        if message is None:
+            return
+        self._last_emit = self.loop.time()
+        self.loop.create_task(self._send(message))
+
+    async def _send(self, message: Dict[str, Any]):
+        self.emitted += 1
+        try:
+            await self.emit(message)
+        except Exception as e:
+            logger.error(f"❌ Interim broadcast failed: {e}")
@@ -1,7 +1,8 @@
+import asyncio
 from fastapi import APIRouter, Request
 from typing import Optional
-from app.db.supabase import supabase
 from app.core.config import logger
+from app.services.job_lookup import job_lookup
 
 router = APIRouter(prefix="/job-application", tags=["Job Applications"])
 
@@ -18,17 +19,12 @@ async def check_application_status(request: Request):
         return {"error": "Must provide either phone or name"}
 
     try:
-        query = supabase.table("job_applications").select("*")
-        if phone:
-            query = query.eq("phone_number", phone)
-        elif name:
-            query = query.ilike("name", f"%{name}%")
-
-        response = query.execute()
-        if not response.data:
+        # Normalized phone key, then fuzzy name (tolerates STT misspellings); cached
+        matches = await asyncio.to_thread(job_lookup.search, phone, name)
+        if not matches:
             return {"status": "not_found", "message": "No application found"}
 
-        app = response.data[0]  # take the first match
+        app = matches[0]  # best match first
 
         return {
             "status": "success",
@@ -0,0 +1,224 @@
+# app/services/job_lookup.py
+# Job-application status lookup by phone or (misheard) name.
+#
+# Phones are compared on a normalized key (last 10 digits), which the DB
+# stores as the indexed phone_key column (migration 004), so "501-444-5566",
+# "(501) 444 5566" and "+15014445566" are one equality lookup. Names go
+# through the pg_trgm search_job_applications_by_name RPC; if it is not
+# deployed, an in-memory trigram index over the applicant names is used
+# instead. Results (including misses) are cached in-process.
+
+import os
+import re
+import threading
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from app.core.config import logger
+from app.utils.cache import LRUTTLCache
+
+JOB_LOOKUP_CACHE_TTL_S = float(os.getenv("JOB_LOOKUP_CACHE_TTL_S", "300"))
+JOB_LOOKUP_NEGATIVE_TTL_S = float(os.getenv("JOB_LOOKUP_NEGATIVE_TTL_S", "30"))
+JOB_LOOKUP_MIN_SIMILARITY = float(os.getenv("JOB_LOOKUP_MIN_SIMILARITY", "0.3"))
+JOB_LOOKUP_MAX_RESULTS = 5
+
+_NON_DIGITS = re.compile(r"\D")
+_NON_LETTERS = re.compile(r"[^a-z\s]")
+_SPACES = re.compile(r"\s+")
+# PostgREST "function not found", Postgres undefined_function / undefined_column
+_MISSING_SCHEMA_CODES = ("PGRST202", "42883", "42703")
+
+
+def _missing_schema(error: Exception) -> bool:
+    """True if the DB lacks the RPC/column; anything else (timeouts, 5xx) is transient."""
+    code = str(getattr(error, "code", "") or "")
+    return code in _MISSING_SCHEMA_CODES or any(c in str(error) for c in _MISSING_SCHEMA_CODES)
+
+
+def normalize_phone(raw: Optional[str]) -> Optional[str]:
+    """Last 10 digits of a US number, or None if there aren't 10."""
+    digits = _NON_DIGITS.sub("", raw or "")
+    if len(digits) == 11 and digits.startswith("1"):
+        digits = digits[1:]
+    return digits if len(digits) == 10 else None
+
+
+def normalize_name(raw: Optional[str]) -> str:
+    return _SPACES.sub(" ", _NON_LETTERS.sub(" ", (raw or "").lower())).strip()
+
+
+def trigrams(text: str) -> Set[str]:
+    """pg_trgm-style trigrams: each word padded with two leading and one trailing space."""
+    grams: Set[str] = set()
+    for word in normalize_name(text).split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class NameIndex:
+    """In-memory trigram index used when the DB has no pg_trgm search."""
+
+    def __init__(self):
+        self.rows: Dict[Any, Dict[str, Any]] = {}
+        self._postings: Dict[str, Set[Any]] = defaultdict(set)
+        self._grams: Dict[Any, Set[str]] = {}
+
+    def add(self, row: Dict[str, Any]):
+        row_id = row.get("id")
+        self.remove(row_id)
+        grams = trigrams(row.get("name") or "")
+        self.rows[row_id] = row
+        self._grams[row_id] = grams
+        for gram in grams:
+            self._postings[gram].add(row_id)
+
+    def remove(self, row_id: Any):
+        for gram in self._grams.pop(row_id, ()):
+            self._postings[gram].discard(row_id)
+        self.rows.pop(row_id, None)
+
+    def search(self, name: str, min_similarity: float = JOB_LOOKUP_MIN_SIMILARITY,
+               limit: int = JOB_LOOKUP_MAX_RESULTS) -> List[Dict[str, Any]]:
+        query = trigrams(name)
+        if not query:
+            return []
+        shared: Dict[Any, int] = defaultdict(int)
+        for gram in query:
+            for row_id in self._postings.get(gram, ()):
+                shared[row_id] += 1
+        scored = []
+        for row_id, n in shared.items():
+            score = n / (len(query) + len(self._grams[row_id]) - n)
+            if score >= min_similarity:
+                scored.append((score, row_id))
+        scored.sort(key=lambda x: (-x[0], str(x[1])))
+        return [self.rows[row_id] for _, row_id in scored[:limit]]
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+
+class JobApplicationLookup:
+    def __init__(self, client=None):
+        self._client = client
+        self.cache = LRUTTLCache(maxsize=4096, ttl=JOB_LOOKUP_CACHE_TTL_S, negative_ttl=JOB_LOOKUP_NEGATIVE_TTL_S)
+        self.names = NameIndex()
+        self._names_loaded = False
+        self._db_trigram = True      # flips off once the RPC is found missing (not on transient errors)
+        self._db_phone_key = True    # flips off if migration 004 isn't applied
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        if self._client is None:
+            from app.db.supabase import supabase
+            self._client = supabase
+        return self._client
+
+    # ---------- Queries ----------
+
+    def by_phone(self, phone: Optional[str]) -> List[Dict[str, Any]]:
+        key = normalize_phone(phone)
+        if not key:
+            return []
+        return self._cached(("phone", key), lambda: self._query_phone(key))
+
+    def by_name(self, name: Optional[str]) -> List[Dict[str, Any]]:
+        key = normalize_name(name)
+        if len(key) < 3:
+            return []
+        return self._cached(("name", key), lambda: self._query_name(key))
+
+    def search(self, phone: Optional[str] = None, name: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Phone first (exact), then fuzzy name; best match first. Blocking."""
+        return self.by_phone(phone) or self.by_name(name)
+
+    def _cached(self, key, load) -> List[Dict[str, Any]]:
+        entry = self.cache.get_entry(key)
+        if entry is not None:
+            return [] if entry.negative else entry.value
+        rows = load()
+        if rows:
+            self.cache.set(key, rows)
+        else:
+            self.cache.set_negative(key)
+        return rows
+
+    def _query_phone(self, key: str) -> List[Dict[str, Any]]:
+        if self._db_phone_key:
+            try:
+                return self.client.table("job_applications").select("*").eq("phone_key", key).execute().data or []
+            except Exception as e:
+                if not _missing_schema(e):
+                    raise
+                logger.warning(f"⚠️ phone_key lookup unavailable, matching raw formats: {e}")
+                self._db_phone_key = False
+        formats = [key, f"{key[:3]}-{key[3:6]}-{key[6:]}", f"({key[:3]}) {key[3:6]}-{key[6:]}", f"+1{key}"]
+        return self.client.table("job_applications").select("*").in_("phone_number", formats).execute().data or []
+
+    def _query_name(self, key: str) -> List[Dict[str, Any]]:
+        if self._db_trigram:
+            try:
+                result = self.client.rpc("search_job_applications_by_name", {
+                    "q": key,
+                    "min_similarity": JOB_LOOKUP_MIN_SIMILARITY,
+                    "max_rows": JOB_LOOKUP_MAX_RESULTS,
+                }).execute()
+                return result.data or []
+            except Exception as e:
+                if not _missing_schema(e):
+                    raise
+                logger.warning(f"⚠️ Trigram name search unavailable, using in-memory index: {e}")
+                self._db_trigram = False
+        self._ensure_names()
+        return self.names.search(key)
+
+    def _ensure_names(self):
+        if self._names_loaded:
+            return
+        with self._lock:
+            if self._names_loaded:
+                return
+            rows = self.client.table("job_applications").select("*").execute().data or []
+            for row in rows:
+                self.names.add(row)
+            self._names_loaded = True
+            logger.info(f"📇 Job-application name index built: {len(rows)} applicants")
+
+    # ---------- Freshness ----------
+
+    def prime(self, rows: Iterable[Dict[str, Any]]):
+        """Apply fresh rows (e.g. from the applicant sync) to the index and phone cache."""
+        by_phone: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for row in rows:
+            if self._names_loaded:
+                self.names.add(row)
+            key = normalize_phone(row.get("phone_number"))
+            if key:
+                by_phone[key].append(row)
+        for key, fresh in by_phone.items():
+            merged = {row.get("id"): row for row in self.cache.get(("phone", key)) or []}
+            merged.update((row.get("id"), row) for row in fresh)
+            self.cache.set(("phone", key), list(merged.values()))
+        # Fuzzy name results may now rank differently
+        self.cache.invalidate_where(lambda k: k[0] == "name")
+
+    def refresh_phones(self, phones: Iterable[Optional[str]]) -> int:
+        """Re-read these numbers (e.g. applicants the sync just changed) so the next call hits a warm cache."""
+        keys = {key for key in map(normalize_phone, phones) if key}
+        for key in keys:
+            self.cache.invalidate(("phone", key))
+            self.by_phone(key)
+        if keys:
+            self.cache.invalidate_where(lambda k: k[0] == "name")
+            self._names_loaded = False   # in-memory fallback index rebuilds on next use
+        return len(keys)
+
+    def clear(self):
+        self.cache.clear()
+        self.names = NameIndex()
+        self._names_loaded = False
+
+
+job_lookup = JobApplicationLookup()
@@ -0,0 +1,174 @@
+# app/services/llm_router.py
+# Latency-aware routing for LLM chat completions: per-route percentiles,
+# hedged duplicate requests and fallback across a configurable model list.
+
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from app.core.config import logger
+
+
+def env_list(name: str, default: str) -> List[str]:
+    """Read a comma separated env var into a list, dropping blanks."""
+    raw = os.getenv(name) or default
+    return [item.strip() for item in raw.split(",") if item.strip()]
+
+
+@dataclass(frozen=True)
+class LLMRoute:
+    """One model served from one endpoint."""
+    model: str
+    base_url: str
+
+    @property
+    def key(self) -> str:
+        return f"{self.model}@{self.base_url}"
+
+
+class LatencyTracker:
+    """Rolling window of successful request latencies per route."""
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self.window = window
+        self.min_samples = min_samples
+        self._samples: Dict[str, deque] = {}
+        self._errors: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, key: str, seconds: float):
+        with self._lock:
+            samples = self._samples.get(key)
+            if samples is None:
+                samples = self._samples[key] = deque(maxlen=self.window)
+            samples.append(seconds)
+
+    def record_error(self, key: str):
+        with self._lock:
+            self._errors[key] = self._errors.get(key, 0) + 1
+
+    def percentile(self, key: str, pct: float) -> Optional[float]:
+        """Return the pct-th percentile in seconds, or None while still warming up."""
+        with self._lock:
+            samples = self._samples.get(key)
+            if not samples or len(samples) < self.min_samples:
+                return None
+            ordered = sorted(samples)
+        index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * len(ordered))) - 1))
+        return ordered[index]
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Per-route p50/p90/p99 (ms), sample and error counts for debugging."""
+        with self._lock:
+            keys = set(self._samples) | set(self._errors)
+            counts = {k: len(self._samples.get(k, ())) for k in keys}
+            errors = dict(self._errors)
+
+        report = {}
+        for key in sorted(keys):
+            entry = {"samples": counts[key], "errors": errors.get(key, 0)}
+            for pct in (50, 90, 99):
+                value = self.percentile(key, pct)
+                entry[f"p{pct}_ms"] = round(value * 1000, 1) if value is not None else None
+            report[key] = entry
+        return report
+
+
+class LLMRouter:
+    """
+    Sends a request to the fastest known route and hedges it.
+
+    If the in-flight request is still running after the route's p90 latency,
+    a duplicate is sent to the next route (or the same one if there is only
+    one) and whichever answers first wins. Errors fall through to the next
+    route in the list; the last error is raised once every route has failed.
+    """
+
+    def __init__(
+        self,
+        routes: List[LLMRoute],
+        send: Callable[[LLMRoute, Dict[str, Any]], Any],
+        tracker: Optional[LatencyTracker] = None,
+        hedge_percentile: float = 90.0,
+        default_hedge_delay: float = 1.5,
+        min_hedge_delay: float = 0.05,
+        max_workers: int = 16,
+    ):
+        if not routes:
+            raise ValueError("LLMRouter needs at least one route")
+        self.routes = list(routes)
+        self.send = send
+        self.tracker = tracker or LatencyTracker()
+        self.hedge_percentile = hedge_percentile
+        self.default_hedge_delay = default_hedge_delay
+        self.min_hedge_delay = min_hedge_delay
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="llm-route")
+
+    # ---------- Routing ----------
+    def ordered_routes(self) -> List[LLMRoute]:
+        """Routes sorted by observed p50; unmeasured routes keep their configured order at the back."""
+        def sort_key(indexed):
+            index, route = indexed
+            p50 = self.tracker.percentile(route.key, 50)
+            return (p50 if p50 is not None else float("inf"), index)
+
+        return [route for _, route in sorted(enumerate(self.routes), key=sort_key)]
+
+    def hedge_delay(self, route: LLMRoute) -> float:
+        threshold = self.tracker.percentile(route.key, self.hedge_percentile)
+        if threshold is None:
+            threshold = self.default_hedge_delay
+        return max(self.min_hedge_delay, threshold)
+
+    def post(self, payload: Dict[str, Any]) -> Any:
+        """Send payload and return the first successful response."""
+        pending_routes = self.ordered_routes()
+        primary = pending_routes.pop(0)
+        in_flight = {self._submit(primary, payload): primary}
+        hedged = False
+        last_error: Optional[BaseException] = None
+
+        while in_flight:
+            timeout = None if hedged else self.hedge_delay(primary)
+            done, _ = wait(in_flight, timeout=timeout, return_when=FIRST_COMPLETED)
+
+            if not done:
+                hedged = True
+                target = pending_routes.pop(0) if pending_routes else primary
+                logger.info(f"[LLMRouter] {primary.key} slower than {timeout:.2f}s, hedging to {target.key}")
+                in_flight[self._submit(target, payload)] = target
+                continue
+
+            for future in done:
+                route = in_flight.pop(future)
+                try:
+                    return future.result()
+                except Exception as e:
+                    last_error = e
+                    logger.warning(f"[LLMRouter] {route.key} failed: {e}")
+
+            if not in_flight and pending_routes:
+                primary = pending_routes.pop(0)
+                hedged = False   # the fallback gets its own hedge
+                logger.info(f"[LLMRouter] Falling back to {primary.key}")
+                in_flight[self._submit(primary, payload)] = primary
+
+        raise last_error
+
+    # ---------- Internals ----------
+    def _submit(self, route: LLMRoute, payload: Dict[str, Any]):
+        return self._executor.submit(self._timed_send, route, payload)
+
+    def _timed_send(self, route: LLMRoute, payload: Dict[str, Any]) -> Any:
+        started = time.perf_counter()
+        try:
+            response = self.send(route, payload)
+        except Exception:
+            self.tracker.record_error(route.key)
+            raise
+        self.tracker.record(route.key, time.perf_counter() - started)
+        return response
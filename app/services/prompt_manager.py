@@ -1,13 +1,35 @@
 import asyncio
-from datetime import datetime, timedelta
+import os
+from typing import Any, Dict, Optional, Tuple
+
 from app.db.supabase import supabase
 from app.core.config import logger
+from app.utils.cache import LRUTTLCache
+
+PROMPT_CACHE_TTL_S = float(os.getenv("PROMPT_CACHE_TTL_S", "600"))      # fresh for 10 minutes
+PROMPT_STALE_TTL_S = float(os.getenv("PROMPT_STALE_TTL_S", "3600"))     # then served stale while refreshing
+PROMPT_NEGATIVE_TTL_S = float(os.getenv("PROMPT_NEGATIVE_TTL_S", "60"))  # remember missing configs
+PROMPT_CACHE_MAX_ENTRIES = int(os.getenv("PROMPT_CACHE_MAX_ENTRIES", "1024"))
+
+PromptKey = Tuple[str, Optional[str]]
+
 
 class PromptManager:
-    def __init__(self):
-        # Cache format: { company_id: { data: dict, ts: datetime } }
-        self._cache = {}
-        self._lock = asyncio.Lock()
+    def __init__(self, ttl: float = PROMPT_CACHE_TTL_S, stale_ttl: float = PROMPT_STALE_TTL_S,
+                 negative_ttl: float = PROMPT_NEGATIVE_TTL_S, maxsize: int = PROMPT_CACHE_MAX_ENTRIES):
+        # Keyed by (company_id, office_id): the query filters by office, so must the cache.
+        # Entries live for ttl + stale_ttl; "no config" results for negative_ttl.
+        self._cache = LRUTTLCache(maxsize=maxsize, ttl=ttl + stale_ttl, negative_ttl=negative_ttl)
+        # Single-flight: one fetch task per key, shared by every concurrent miss
+        self._inflight: Dict[PromptKey, asyncio.Task] = {}
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        # Bumped on invalidate so fetches already in flight don't write back old data;
+        # per key, and per company for company-wide invalidation, so other tenants are unaffected
+        self._key_generations: Dict[PromptKey, int] = {}
+        self._company_generations: Dict[str, int] = {}
+        # Config version: bumped whenever cached configs change; keys downstream caches
+        self.version = 0
 
     async def get_prompt(self, company_id: str, office_id: str | None = None):
         """
@@ -22,56 +44,135 @@ class PromptManager:
             "business_type": str,
             "key_terms": dict
         }
+
+        Cache hits never wait. Entries past `ttl` are returned immediately
+        while one background refresh runs; only a cold or fully expired key
+        waits, and concurrent waiters for that key share a single query.
         """
         if not company_id:
             return self._default_data()
 
-        async with self._lock:
-            cached = self._cache.get(company_id)
-            if cached and datetime.now() - cached["ts"] < timedelta(minutes=10):
-                return cached["data"]
-
-            try:
-                loop = asyncio.get_running_loop()
-                def _query():
-                    q = (
-                        supabase.table("service_configs")
-                        .select(
-                            "prompt_template, services_description, tone, role, "
-                            "default_urgency, business_type, key_terms"
-                        )
-                        .eq("company_id", company_id)
-                    )
-                    # 👇 Add office_id filter only if provided
-                    if office_id:
-                        q = q.eq("office_id", office_id)
-                    return q.execute()
-
-                result = await loop.run_in_executor(None, _query)
-
-                if result.data and len(result.data) > 0:
-                    record = result.data[0]
-                    data = {
-                        "prompt_template": record.get("prompt_template"),
-                        "services_description": record.get("services_description"),
-                        "tone": record.get("tone", "Professional"),
-                        "role": record.get("role", "Receptionist"),
-                        "urgency": record.get("default_urgency", "Normal"),
-                        "business_type": record.get("business_type", "general"),
-                        "key_terms": record.get("key_terms") or {},
-                    }
-
-                    # cache for 10 minutes
-                    self._cache[company_id] = {"data": data, "ts": datetime.now()}
-                    return data
-
-                else:
-                    logger.warning(f"No prompt found for company_id={company_id}, office_id={office_id}")
-                    return self._default_data()
-
-            except Exception as e:
-                logger.error(f"Supabase prompt fetch failed: {e}")
+        key = (company_id, office_id or None)
+        entry = self._cache.get_entry(key)
+        if entry is not None:
+            if entry.negative:
                 return self._default_data()
+            if entry.age >= self.ttl:
+                self._start_fetch(key)
+            return entry.value
+
+        data = await asyncio.shield(self._start_fetch(key))
+        return data if data is not None else self._default_data()
+
+    def invalidate(self, company_id: str, office_id: Optional[str] = None) -> int:
+        """
+        Drop cached prompts so the next call refetches. With no office_id,
+        every office of the company is dropped. Returns entries removed.
+        """
+        if office_id:
+            self._bump_generation((company_id, office_id))
+            removed = int(self._cache.invalidate((company_id, office_id)))
+            self._inflight.pop((company_id, office_id), None)
+        else:
+            self._company_generations[company_id] = self._company_generations.get(company_id, 0) + 1
+            removed = self._cache.invalidate_where(lambda k: k[0] == company_id)
+            for key in [k for k in self._inflight if k[0] == company_id]:
+                self._inflight.pop(key, None)
+        self.bump_version()
+        logger.info(f"🧹 Prompt cache invalidated for company_id={company_id}, office_id={office_id} ({removed} entries)")
+        return removed
+
+    async def refresh(self, company_id: str, office_id: Optional[str] = None) -> int:
+        """
+        Refetch cached entries affected by a config change (the office's own
+        entry and the company-wide one). Callers keep being served the old
+        value until the new one lands. Returns how many entries were refreshed.
+        """
+        keys = [
+            k for k in self._cache.keys()
+            if k[0] == company_id and (office_id is None or k[1] in (office_id, None))
+        ]
+        for key in keys:
+            # Don't piggyback on a fetch that may have read the pre-change row,
+            # and don't let it write that row back after the new one lands
+            self._bump_generation(key)
+            self._inflight.pop(key, None)
+            await asyncio.shield(self._start_fetch(key))
+        return len(keys)
+
+    def _generation(self, key: PromptKey) -> Tuple[int, int]:
+        return self._company_generations.get(key[0], 0), self._key_generations.get(key, 0)
+
+    def _bump_generation(self, key: PromptKey):
+        self._key_generations[key] = self._key_generations.get(key, 0) + 1
+
+    def bump_version(self):
+        self.version += 1
+
+    def cache_stats(self) -> Dict[str, Any]:
+        return {**self._cache.stats(), "in_flight": len(self._inflight), "version": self.version}
+
+    def _start_fetch(self, key: PromptKey) -> asyncio.Task:
+        """Return the in-flight fetch for this key, starting one if needed."""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.get_running_loop().create_task(self._fetch(*key))
+            self._inflight[key] = task
+
+            def _done(finished: asyncio.Task):
+                if self._inflight.get(key) is finished:
+                    del self._inflight[key]
+
+            task.add_done_callback(_done)
+        return task
+
+    async def _fetch(self, company_id: str, office_id: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Query Supabase off the event loop; cache and return the data, or None."""
+        key = (company_id, office_id)
+        generation = self._generation(key)
+        try:
+            loop = asyncio.get_running_loop()
+            def _query():
+                q = (
+                    supabase.table("service_configs")
+                    .select(
+                        "prompt_template, services_description, tone, role, "
+                        "default_urgency, business_type, key_terms"
+                    )
+                    .eq("company_id", company_id)
+                )
+                # 👇 Add office_id filter only if provided
+                if office_id:
+                    q = q.eq("office_id", office_id)
+                return q.execute()
+
+            result = await loop.run_in_executor(None, _query)
+
+            if result.data and len(result.data) > 0:
+                record = result.data[0]
+                data = {
+                    "prompt_template": record.get("prompt_template"),
+                    "services_description": record.get("services_description"),
+                    "tone": record.get("tone", "Professional"),
+                    "role": record.get("role", "Receptionist"),
+                    "urgency": record.get("default_urgency", "Normal"),
+                    "business_type": record.get("business_type", "general"),
+                    "key_terms": record.get("key_terms") or {},
+                }
+
+                if generation == self._generation(key):
+                    self._cache.set(key, data)
+                return data
+
+            logger.warning(f"No prompt found for company_id={company_id}, office_id={office_id}")
+            if generation == self._generation(key):
+                self._cache.set_negative(key)
+            return None
+
+        except Exception as e:
+            # A failed refresh keeps serving the stale entry until it expires
+            logger.error(f"Supabase prompt fetch failed: {e}")
+            return None
 
 
     def _default_prompt(self, business_type: str = "general"):
@@ -107,3 +208,6 @@ class PromptManager:
                 "visit": "visit"
             },
         }
+
+
+prompt_manager = PromptManager()
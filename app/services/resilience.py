@@ -0,0 +1,132 @@
+# app/services/resilience.py
+# Circuit breaker and AIMD concurrency limiter shared by every call in a worker.
+
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from app.core.config import logger
+
+
+class CircuitBreaker:
+    """
+    Classic closed → open → half-open breaker.
+
+    Opens after `failure_threshold` consecutive failures, rejects everything
+    for `reset_timeout` seconds, then lets up to `half_open_max_calls` probe
+    requests through. A successful probe closes the circuit; a failed one
+    re-opens it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 15.0,
+                 half_open_max_calls: int = 1):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._maybe_half_open()
+            return self._state
+
+    def allow(self) -> bool:
+        """Reserve permission for one call; always pair with record_success/record_failure/release."""
+        with self._lock:
+            self._maybe_half_open()
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.HALF_OPEN and self._probes < self.half_open_max_calls:
+                self._probes += 1
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            if self._state != self.CLOSED:
+                logger.info(f"[Breaker:{self.name}] ✅ Probe succeeded, closing circuit")
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probes = 0
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    logger.warning(f"[Breaker:{self.name}] 🔴 Opening circuit after {self._failures} failures")
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._probes = 0
+
+    def release(self):
+        """Give back a reservation that never reached the backend (e.g. limiter rejected it)."""
+        with self._lock:
+            if self._state == self.HALF_OPEN and self._probes > 0:
+                self._probes -= 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            self._maybe_half_open()
+            return {"state": self._state, "consecutive_failures": self._failures}
+
+    def _maybe_half_open(self):
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            logger.info(f"[Breaker:{self.name}] 🟡 Reset timeout elapsed, probing")
+            self._state = self.HALF_OPEN
+            self._probes = 0
+
+
+class AIMDLimiter:
+    """
+    Adaptive concurrency limit: additive increase on success, multiplicative
+    decrease on failure. Callers that cannot get a slot within `max_wait`
+    seconds are rejected instead of queueing behind a degraded backend.
+    """
+
+    def __init__(self, name: str, initial: float = 8, min_limit: float = 1, max_limit: float = 64,
+                 backoff_ratio: float = 0.5, max_wait: float = 1.0):
+        self.name = name
+        self.limit = float(initial)
+        self.min_limit = float(min_limit)
+        self.max_limit = float(max_limit)
+        self.backoff_ratio = backoff_ratio
+        self.max_wait = max_wait
+        self.in_flight = 0
+        self._cond = threading.Condition()
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        wait = self.max_wait if timeout is None else timeout
+        deadline = time.monotonic() + wait
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+            self.in_flight += 1
+            return True
+
+    def release(self, success: Optional[bool]):
+        """Free a slot; success=None releases without adjusting the limit."""
+        with self._cond:
+            self.in_flight = max(0, self.in_flight - 1)
+            if success is True:
+                self.limit = min(self.max_limit, self.limit + 1.0 / max(self.limit, 1.0))
+            elif success is False:
+                self.limit = max(self.min_limit, self.limit * self.backoff_ratio)
+            self._cond.notify_all()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._cond:
+            return {"limit": round(self.limit, 2), "in_flight": self.in_flight}
@@ -0,0 +1,95 @@
+# app/services/tenant_directory.py
+# In-memory map of agency phone lines (E.164) → company/office, preloaded at
+# startup so the call START event doesn't wait on a Supabase round trip.
+# The whole map is reloaded in the background once it is TENANT_DIRECTORY_TTL_S
+# old, so moved or deleted lines stop resolving to their old tenant.
+
+import asyncio
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from app.core.config import logger
+
+TENANT_DIRECTORY_TTL_S = float(os.getenv("TENANT_DIRECTORY_TTL_S", "300"))
+TENANT_DIRECTORY_RETRY_S = 30.0
+
+
+class TenantDirectory:
+    def __init__(self, client=None, ttl: float = TENANT_DIRECTORY_TTL_S):
+        self._client = client
+        self._by_e164: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self.loaded = False
+        self.ttl = ttl
+        self._reload_at = 0.0   # monotonic; due immediately if never loaded
+        self._reload: Optional[asyncio.Future] = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            from app.db.supabase import supabase
+            self._client = supabase
+        return self._client
+
+    def load_all(self) -> int:
+        """Fetch every phone line (blocking). Returns how many were loaded."""
+        result = self.client.table("phone_numbers").select("id, company_id, office_id, e164").execute()
+        rows = result.data or []
+        with self._lock:
+            # Replaces lines cached from earlier misses too
+            self._by_e164 = {row["e164"]: row for row in rows if row.get("e164")}
+            self.loaded = True
+            self._reload_at = time.monotonic() + self.ttl
+        logger.info(f"📇 Tenant directory loaded: {len(rows)} phone lines")
+        return len(rows)
+
+    def lookup(self, e164: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Resolve a line from memory, falling back to (and caching) a DB query."""
+        if not e164:
+            return None
+        row = self._by_e164.get(e164)
+        if row is not None:
+            return row
+        result = (
+            self.client.table("phone_numbers")
+            .select("id, company_id, office_id, e164")
+            .eq("e164", e164)
+            .execute()
+        )
+        if not result.data:
+            return None
+        row = result.data[0]
+        with self._lock:
+            self._by_e164[e164] = row
+        return row
+
+    def _reload_quietly(self):
+        try:
+            self.load_all()
+        except Exception as e:
+            logger.error(f"❌ Tenant directory reload failed, keeping current lines: {e}")
+
+    def _maybe_reload(self):
+        """Start one background reload once the map is past its TTL; callers keep the current map."""
+        if time.monotonic() < self._reload_at or (self._reload and not self._reload.done()):
+            return
+        self._reload_at = time.monotonic() + TENANT_DIRECTORY_RETRY_S   # load_all pushes it to the TTL
+        self._reload = asyncio.get_running_loop().run_in_executor(None, self._reload_quietly)
+
+    async def lookup_async(self, e164: Optional[str]) -> Optional[Dict[str, Any]]:
+        """lookup() without blocking the event loop on a cache miss."""
+        self._maybe_reload()
+        row = self._by_e164.get(e164) if e164 else None
+        if row is not None:
+            return row
+        return await asyncio.get_running_loop().run_in_executor(None, self.lookup, e164)
+
+    def tenants(self) -> List[Dict[str, Any]]:
+        """Distinct (company_id, office_id) pairs of the known lines."""
+        seen = {(r.get("company_id"), r.get("office_id")) for r in self._by_e164.values()}
+        return [{"company_id": c, "office_id": o} for c, o in seen if c]
+
+
+tenant_directory = TenantDirectory()
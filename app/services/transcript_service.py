@@ -1333,15 +1333,20 @@
 # app/services/transcript_service.py
 # Complete natural conversation system with all fixes applied
 
+import asyncio
 import re
+import time
 import uuid
+from functools import partial
 from datetime import datetime
 from typing import Dict, Any, List, Optional, Tuple
 
 from app.core.config import logger
 from app.services.conversation_manager import conversation_manager
 from app.services.groq_client import groq_client
+from app.services import intake_slots, intent_matcher, turn_timing
 from app.db.supabase import supabase
+from app.utils.llm_output import strip_inline_fillers
 
 # ---------- Core conversation logic ----------
 
@@ -1351,6 +1356,7 @@ async def process_final_transcript(session_id_or_transcript: str,
     """
     Main entry point - processes user input and generates natural responses
     """
+    started = time.monotonic()
     # Handle back-compat signature
     if transcript is None:
         transcript = (session_id_or_transcript or "").strip()
@@ -1404,6 +1410,11 @@ async def process_final_transcript(session_id_or_transcript: str,
     session["preferred_language"] = user_language
     conversation_manager.add_message(session_id, entry)
     
+    trace = turn_timing.current_turn()
+    if trace:
+        groq_ms = sum(trace.spans.get(s, 0.0) for s in ("groq_queue", "groq_network", "groq_generation"))
+        trace.add("heuristics", (time.monotonic() - started) * 1000 - groq_ms)
+    
     return session_id, entry
 
 # ---------- Natural response generation ----------
@@ -1437,12 +1448,21 @@ async def _get_natural_response(transcript: str,
     
     # Use Groq with natural conversation approach
     try:
-        result = groq_client.detect_intent(
+        # Groq I/O is blocking; keep it off the event loop so concurrent calls keep streaming
+        loop = asyncio.get_running_loop()
+        groq_timings: Dict[str, float] = {}
+        submitted = time.monotonic()
+        result = await loop.run_in_executor(None, partial(
+            groq_client.detect_intent,
             transcript,
             stt_lang_hint=language,
             context_messages=context_messages,
             is_first_turn=is_first_turn,
-        )
+            timings=groq_timings,
+        ))
+        trace = turn_timing.current_turn()
+        if trace:
+            trace.add_groq(submitted, time.monotonic(), groq_timings)
         
         # Validate the response makes sense
         ai_response = result.get("ai_response", "").strip()
@@ -1523,20 +1543,18 @@ def _needs_admin_handoff(transcript: str, context_messages: List[dict]) -> bool:
     Detect if caller provided contact info OR complete care details that need admin follow-up
     BUT NOT if we already have contact info and they're just adding details
     """
-    transcript_lower = transcript.lower()
+    current = intent_matcher.analyze(transcript)
     
     # Check if they provided phone number in THIS message
-    has_phone = bool(re.search(r'\b\d{3}[\s\-]?\d{3}[\s\-]?\d{4}\b', transcript))
+    has_phone = current.phone is not None
     
     # Check if we already have contact info from PREVIOUS messages
-    all_previous_conversation = " ".join([
-        msg.get("content", "") for msg in context_messages 
+    previous = [
+        intent_matcher.analyze(msg.get("content", "")) for msg in context_messages
         if msg.get("role") == "user"
-    ])
-    already_have_phone = bool(re.search(r'\b\d{3}[\s\-]?\d{3}[\s\-]?\d{4}\b', all_previous_conversation))
-    already_have_name = any(pattern in all_previous_conversation.lower() for pattern in [
-        "my name is", "i am", "this is", "i'm"
-    ])
+    ]
+    already_have_phone = any(f.phone for f in previous)
+    already_have_name = any(f.has_any(intent_matcher.NAME_INTRO) for f in previous)
     
     # If we already have contact info, don't trigger handoff again
     # (they're just providing additional details)
@@ -1545,10 +1563,7 @@ def _needs_admin_handoff(transcript: str, context_messages: List[dict]) -> bool:
         return False
     
     # Check if they're ASKING about the process (don't trigger handoff)
-    asking_for_phone_process = any(phrase in transcript_lower for phrase in [
-        "do you need my phone", "need my number", "want my phone", "should i give you my phone",
-        "can i give you my number", "do you want my number"
-    ])
+    asking_for_phone_process = current.has_any(intent_matcher.PHONE_PROCESS_QUESTIONS)
     
     if asking_for_phone_process and not has_phone:
         return False
@@ -1557,17 +1572,13 @@ def _needs_admin_handoff(transcript: str, context_messages: List[dict]) -> bool:
     has_complete_care_schedule = _has_complete_care_and_schedule_details(transcript, context_messages)
     
     # Check if recent conversation mentioned scheduling
-    recent_context = " ".join([msg.get("content", "") for msg in context_messages[-4:]])
-    mentioned_scheduling = any(word in recent_context.lower() for word in [
-        "schedule", "appointment", "call me", "contact", "follow up"
-    ])
+    mentioned_scheduling = any(
+        intent_matcher.analyze(msg.get("content", "")).has_any(intent_matcher.SCHEDULING_CONTEXT)
+        for msg in context_messages[-4:]
+    )
     
     # Check for scheduling-related phrases in current message
-    scheduling_phrases = [
-        "call me", "contact me", "schedule", "appointment", "phone number", 
-        "number is", "reach me", "best time", "tomorrow", "next week"
-    ]
-    has_scheduling_intent = any(phrase in transcript_lower for phrase in scheduling_phrases)
+    has_scheduling_intent = current.has_any(intent_matcher.SCHEDULING_PHRASES)
     
     # Trigger handoff if: phone provided OR (scheduling intent + context) OR complete care details
     # BUT NOT if we already have all contact info
@@ -1577,35 +1588,24 @@ def _has_complete_care_and_schedule_details(transcript: str, context_messages: L
     """
     Check if the conversation contains complete care details AND schedule information
     """
-    # Combine current transcript with recent user messages
-    all_conversation = transcript + " " + " ".join([
-        msg.get("content", "") for msg in context_messages[-8:] 
+    # Combine current transcript with recent user messages (each analyzed once and cached)
+    features = [intent_matcher.analyze(transcript)] + [
+        intent_matcher.analyze(msg.get("content", "")) for msg in context_messages[-8:]
         if msg.get("role") == "user"
-    ])
-    
-    conversation_lower = all_conversation.lower()
+    ]
+    keywords = intent_matcher.combined_keywords(features)
     
     # Check for care recipient
-    has_care_recipient = any(pattern in conversation_lower for pattern in [
-        "my mom", "my mother", "my dad", "my father", "my husband", "my wife",
-        "my parent", "my grandmother", "my grandfather", "for my", "care for"
-    ])
+    has_care_recipient = not keywords.isdisjoint(intent_matcher.CARE_RECIPIENTS)
     
     # Check for specific care needs
-    care_needs_mentioned = any(need in conversation_lower for need in [
-        "companionship", "medication", "housekeeping", "cooking", "meal",
-        "walking", "exercise", "personal care", "assistance", "help with",
-        "dementia", "alzheimer", "diabetic", "mobility", "safety", "remind"
-    ])
+    care_needs_mentioned = not keywords.isdisjoint(intent_matcher.CARE_NEEDS_WITH_REMINDERS)
     
     # Check for specific schedule details
-    has_hours = bool(re.search(r'\d+\s*hours?\s*(?:per\s*)?week', conversation_lower))
-    has_days = any(day in conversation_lower for day in [
-        "monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday",
-        "weekday", "weekdays", "weekend", "mon", "tue", "wed", "thu", "fri", "sat", "sun"
-    ])
-    has_time_window = bool(re.search(r'\d{1,2}\s*(?:to|-|am|pm)', conversation_lower))
-    has_specific_time = bool(re.search(r'\d{1,2}\s*(?:am|pm)', conversation_lower))
+    has_hours = any(f.hours_per_week for f in features)
+    has_days = not keywords.isdisjoint(intent_matcher.DAYS)
+    has_time_window = any(f.has_time_window for f in features)
+    has_specific_time = any(f.has_specific_time for f in features)
     
     # Must have care recipient + care needs + schedule
     schedule_complete = (has_hours and has_days) or has_time_window or has_specific_time
@@ -1619,99 +1619,13 @@ def _is_client_intake_complete(session: Dict[str, Any]) -> bool:
     """
     Check if we have collected essential intake information
     """
-    messages = session.get("messages", [])
-    
-    full_conversation = " ".join([
-        msg.get("transcript", "") for msg in messages 
-        if msg.get("transcript")
-    ]).lower()
-    
-    has_caller_name = any(pattern in full_conversation for pattern in [
-        "my name is", "i am", "this is", "i'm"
-    ])
-    
-    has_care_recipient = any(pattern in full_conversation for pattern in [
-        "my mom", "my mother", "my dad", "my father", "my husband", "my wife",
-        "my parent", "my grandmother", "my grandfather", "for my", "care for"
-    ])
-    
-    care_need_keywords = [
-        "companionship", "medication", "housekeeping", "cooking", "meal",
-        "walking", "exercise", "personal care", "assistance", "help with",
-        "dementia", "alzheimer", "diabetic", "mobility", "safety"
-    ]
-    has_care_needs = any(keyword in full_conversation for keyword in care_need_keywords)
-    
-    return has_caller_name and has_care_recipient and has_care_needs
+    return intake_slots.is_intake_complete(intake_slots.sync_slots(session))
 
 def _extract_intake_information(session: Dict[str, Any]) -> Dict[str, Any]:
     """
     Extract key intake information from conversation
     """
-    messages = session.get("messages", [])
-    
-    intake_info = {
-        "caller_name": None,
-        "care_recipient": None,
-        "care_needs": [],
-        "schedule_preference": None,
-        "contact_phone": None
-    }
-    
-    for msg in messages:
-        transcript = msg.get("transcript", "").lower()
-        
-        # Extract caller name
-        if not intake_info["caller_name"]:
-            name_patterns = [
-                r"my name is ([a-z\s]+)",
-                r"i am ([a-z\s]+)",
-                r"this is ([a-z\s]+)"
-            ]
-            for pattern in name_patterns:
-                match = re.search(pattern, transcript)
-                if match:
-                    intake_info["caller_name"] = match.group(1).strip().title()
-                    break
-        
-        # Extract care recipient
-        if not intake_info["care_recipient"]:
-            recipient_patterns = [
-                "my mom", "my mother", "my dad", "my father", 
-                "my husband", "my wife", "my parent"
-            ]
-            for pattern in recipient_patterns:
-                if pattern in transcript:
-                    intake_info["care_recipient"] = pattern.replace("my ", "").title()
-                    break
-        
-        # Extract care needs
-        care_mappings = {
-            "companionship": ["companionship", "company", "conversation"],
-            "medication_reminders": ["medication", "medicine", "pills", "remind"],
-            "light_housekeeping": ["housekeeping", "cleaning"],
-            "meal_preparation": ["meal", "cooking", "food"],
-            "walking_support": ["walking", "walk", "exercise"],
-        }
-        
-        for need_type, keywords in care_mappings.items():
-            if need_type not in intake_info["care_needs"]:
-                if any(keyword in transcript for keyword in keywords):
-                    intake_info["care_needs"].append(need_type)
-        
-        # Extract phone number
-        if not intake_info["contact_phone"]:
-            phone_match = re.search(r'\b(\d{3})[\s\-]?(\d{3})[\s\-]?(\d{4})\b', transcript)
-            if phone_match:
-                intake_info["contact_phone"] = f"{phone_match.group(1)}-{phone_match.group(2)}-{phone_match.group(3)}"
-        
-        # Extract schedule
-        if "hour" in transcript and "week" in transcript:
-            hours_match = re.search(r'(\d+)\s*hours?\s*(?:per\s*)?week', transcript)
-            if hours_match:
-                intake_info["schedule_preference"] = f"{hours_match.group(1)} hours per week"
-    
-    return intake_info
+    return intake_slots.intake_info(intake_slots.sync_slots(session))
 
 def _create_intake_completion_response(intake_info: Dict[str, Any], language: str) -> Dict[str, Any]:
     """
@@ -1760,21 +1674,18 @@ def _create_admin_handoff_response(transcript: str, language: str, context_messa
     Create response for admin handoff with full context awareness
     """
     # Extract phone number if provided
-    phone_match = re.search(r'\b(\d{3})[\s\-]?(\d{3})[\s\-]?(\d{4})\b', transcript)
-    phone_number = f"{phone_match.group(1)}-{phone_match.group(2)}-{phone_match.group(3)}" if phone_match else None
+    # Same pattern as intent_matcher, which also reads dictated digits
+    phone_number = intent_matcher.analyze(transcript, language).phone
     
     # Extract name if provided
     name_match = re.search(r'\b(?:my\s+name\s+is|this\s+is|i\s+am)\s+([A-Za-z][A-Za-z\s\-\'\.]{1,20})', transcript, re.IGNORECASE)
     caller_name = name_match.group(1).strip().title() if name_match else None
     
     # Check conversation context for job application vs client care
-    all_conversation = " ".join([msg.get("content", "") for msg in context_messages[-10:]])
-    conversation_lower = all_conversation.lower()
-    
-    is_job_application = any(phrase in conversation_lower for phrase in [
-        "job application", "applied for", "caregiver job", "hiring", "application status",
-        "follow up on my application", "i applied"
-    ])
+    is_job_application = any(
+        intent_matcher.analyze(msg.get("content", "")).has_any(intent_matcher.JOB_APPLICATION_PHRASES)
+        for msg in context_messages[-10:]
+    )
     
     # Extract care context details
     care_context = _extract_care_context_from_conversation(context_messages)
@@ -1886,52 +1797,52 @@ def _extract_care_context_from_conversation(context_messages: List[dict]) -> str
     Extract and summarize care details from conversation
     """
     # Increase from 10 to 16 to capture more history
-    all_conversation = " ".join([msg.get("content", "") for msg in context_messages[-16:]])
-    conversation_lower = all_conversation.lower()
+    features = [intent_matcher.analyze(msg.get("content", "")) for msg in context_messages[-16:]]
+    keywords = intent_matcher.combined_keywords(features)
     
-    logger.info(f"[CONTEXT] Extracting care context from: {conversation_lower[:200]}...")
+    logger.info(f"[CONTEXT] Extracting care context from {len(features)} messages")
     
     context_parts = []
     
     # Extract care recipient
-    if "my mom" in conversation_lower or "my mother" in conversation_lower:
+    if not keywords.isdisjoint(intent_matcher.MOM):
         context_parts.append("care for your mom")
         logger.info("[CONTEXT] Found: care for your mom")
-    elif "my dad" in conversation_lower or "my father" in conversation_lower:
+    elif not keywords.isdisjoint(intent_matcher.DAD):
         context_parts.append("care for your dad")
         logger.info("[CONTEXT] Found: care for your dad")
     
     # Extract care needs
     needs = []
-    if "companionship" in conversation_lower:
+    if "companionship" in keywords:
         needs.append("companionship")
         logger.info("[CONTEXT] Found need: companionship")
-    if "medication" in conversation_lower and "remind" in conversation_lower:
+    if "medication" in keywords and "remind" in keywords:
         needs.append("medication reminders")
         logger.info("[CONTEXT] Found need: medication reminders")
     if needs:
         context_parts.append(" and ".join(needs))
     
-    # Extract schedule - IMPROVED REGEX
+    # Extract schedule
     # Match: "20 hours a week", "20 hours per week", "20 hrs/week", etc.
-    hours_match = re.search(r'(\d+)\s*(?:hours?|hrs?)\s*(?:a|per|/)\s*week', conversation_lower)
-    if hours_match:
-        context_parts.append(f"{hours_match.group(1)} hours per week")
-        logger.info(f"[CONTEXT] Found schedule: {hours_match.group(1)} hours per week")
+    hours = next((f.hours_per_week_loose for f in features if f.hours_per_week_loose), None)
+    if hours:
+        context_parts.append(f"{hours} hours per week")
+        logger.info(f"[CONTEXT] Found schedule: {hours} hours per week")
     
     # Extract days
-    if "monday" in conversation_lower and "friday" in conversation_lower:
+    if "monday" in keywords and "friday" in keywords:
         context_parts.append("Monday through Friday")
         logger.info("[CONTEXT] Found days: Monday through Friday")
-    elif "weekday" in conversation_lower:
+    elif "weekday" in keywords:
         context_parts.append("weekdays")
         logger.info("[CONTEXT] Found days: weekdays")
     
-    # Extract time window - IMPROVED REGEX
+    # Extract time window
     # Match: "8 am to 12 pm", "8am to 12pm", "8 to 12pm", "8-12pm"
-    time_match = re.search(r'(\d{1,2})\s*(?:am|a\.m\.)?\s*(?:to|-|–)\s*(\d{1,2})\s*(?:am|pm|p\.m\.)', conversation_lower)
-    if time_match:
-        time_str = f"{time_match.group(1)}am to {time_match.group(2)}{time_match.group(3) if len(time_match.groups()) > 2 else 'pm'}"
+    time_range = next((f.time_range for f in features if f.time_range), None)
+    if time_range:
+        time_str = f"{time_range[0]}am to {time_range[1]}pm"
         context_parts.append(time_str)
         logger.info(f"[CONTEXT] Found time: {time_str}")
     
@@ -1949,10 +1860,7 @@ def _enhance_response_naturalness(result: Dict[str, Any],
     response = result.get("ai_response", "")
     
     # Remove overly formal patterns
-    response = response.replace("Perfect - ", "")
-    response = response.replace("Perfect. ", "")
-    response = re.sub(r"Got it[\-—]\s*", "", response)
-    response = re.sub(r"Entendido[\-—]\s*", "", response)
+    response = strip_inline_fillers(response)
     
     # Check for inappropriate repetition
     if context and len(context) >= 6:
@@ -2029,22 +1937,12 @@ def _build_context_messages(messages: List[Dict[str, Any]]) -> List[dict]:
 
 def _is_goodbye(text: str) -> bool:
     """Check if user is ending the conversation"""
-    text_lower = text.lower().strip()
-    
-    goodbye_phrases = [
-        "goodbye", "good bye", "bye", "bye bye", "see you later", "talk to you later",
-        "that's all", "that's it", "that is all", "nothing else", "all set", "all good",
-        "thank you that's all", "thanks that's all", "thank you so much", "thanks so much",
-        "not that i know of", "nothing that i know of", "no that's it", "no thanks",
-        "have a good day", "have a great day", "take care",
-        "i'll wait for your call", "call me back", "talk to you soon",
-        "adiós", "hasta luego", "gracias", "eso es todo", "nada más"
-    ]
+    features = intent_matcher.analyze(text)
     
-    if any(phrase in text_lower for phrase in goodbye_phrases):
+    if features.has_any(intent_matcher.GOODBYE_PHRASES):
         return True
         
-    if text_lower in ["thank you", "thanks", "gracias"] and len(text.split()) <= 2:
+    if features.text_lower.strip() in intent_matcher.SHORT_THANKS and len(text.split()) <= 2:
         return True
         
     return False
@@ -0,0 +1,123 @@
+# app/services/turn_timing.py
+# Per-turn latency spans, from the caller's last word to our reply on the wire.
+#
+# A TurnTrace is started when Deepgram delivers a final transcript and is
+# carried through the turn in a context variable, so transcript_service
+# can add spans without threading it through every call. Stages:
+#   stt              end of caller speech → final transcript received
+#   heuristics       transcript_service work outside the Groq call
+#   groq_queue       executor + concurrency-limiter wait + Groq's own queue
+#   groq_network     rest of the Groq call (round trip, retries, parsing)
+#   groq_generation  Groq prompt + completion time
+#   tts              speech synthesis
+#   send             first outbound media frame written to Twilio
+# finish() feeds the /metrics histograms; the result is kept on the
+# message entry and folded into a running per-session LatencyStats.
+
+import bisect
+import contextvars
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+from app.core.metrics import registry
+
+STAGES = ("stt", "heuristics", "groq_queue", "groq_network", "groq_generation", "tts", "send")
+
+TURN_STAGE_SECONDS = registry.histogram(
+    "servoice_turn_stage_seconds", "Time spent in each stage of a caller turn.", ["stage"])
+TURN_SECONDS = registry.histogram(
+    "servoice_turn_seconds", "End of caller speech to first reply media frame.",
+    buckets=(0.25, 0.5, 0.75, 1.0, 1.25, 1.5, 2.0, 2.5, 3.0, 4.0, 6.0, 10.0))
+
+_current: contextvars.ContextVar[Optional["TurnTrace"]] = contextvars.ContextVar("turn_trace", default=None)
+
+
+class TurnTrace:
+    def __init__(self, speech_end: Optional[float] = None):
+        """speech_end: time.monotonic() at which the caller stopped talking, if known."""
+        now = time.monotonic()
+        self.origin = min(speech_end, now) if speech_end else now
+        self.spans: Dict[str, float] = {}   # stage -> ms
+        if speech_end:
+            self.add("stt", (now - self.origin) * 1000)
+
+    def add(self, stage: str, ms: float):
+        self.spans[stage] = self.spans.get(stage, 0.0) + max(0.0, ms)
+
+    @contextmanager
+    def span(self, stage: str):
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.add(stage, (time.monotonic() - started) * 1000)
+
+    def add_groq(self, submitted: float, returned: float, timings: Dict[str, float]):
+        """
+        Split one Groq call (see GroqClient.detect_intent timings) into
+        queue/network/generation; the three add up to its wall time.
+        """
+        wall = max(0.0, returned - submitted)
+        local_wait = max(0.0, timings.get("started", submitted) - submitted) + timings.get("queue_s", 0.0)
+        queue = min(wall, local_wait + timings.get("server_queue_s", 0.0))
+        generation = min(wall - queue, timings.get("generation_s", 0.0))
+        self.add("groq_queue", queue * 1000)
+        self.add("groq_generation", generation * 1000)
+        self.add("groq_network", (wall - queue - generation) * 1000)
+
+    def finish(self) -> Dict[str, float]:
+        """Close the turn: record histograms and return {stage_ms..., total_ms}."""
+        total_ms = (time.monotonic() - self.origin) * 1000
+        for stage, ms in self.spans.items():
+            TURN_STAGE_SECONDS.observe(ms / 1000, stage=stage)
+        TURN_SECONDS.observe(total_ms / 1000)
+        timings = {f"{stage}_ms": round(ms, 1) for stage, ms in self.spans.items()}
+        timings["total_ms"] = round(total_ms, 1)
+        return timings
+
+
+def start_turn(speech_end: Optional[float] = None) -> TurnTrace:
+    trace = TurnTrace(speech_end)
+    _current.set(trace)
+    return trace
+
+
+def current_turn() -> Optional[TurnTrace]:
+    return _current.get()
+
+
+def _percentile(ordered: List[float], q: float) -> float:
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class LatencyStats:
+    """One session's timed turns, kept sorted per stage so each turn is folded in once."""
+
+    KEYS = tuple(f"{stage}_ms" for stage in STAGES) + ("total_ms",)
+
+    def __init__(self):
+        self.turns = 0
+        self._values: Dict[str, List[float]] = {}
+        self._sums: Dict[str, float] = {}
+
+    def add(self, timings: Dict[str, float]):
+        self.turns += 1
+        for key in self.KEYS:
+            if key in timings:
+                bisect.insort(self._values.setdefault(key, []), timings[key])
+                self._sums[key] = self._sums.get(key, 0.0) + timings[key]
+
+    def summary(self) -> Dict[str, Any]:
+        """Per-stage avg/p50/p95/max, for conversation metadata."""
+        summary: Dict[str, Any] = {"turns": self.turns}
+        for key in self.KEYS:
+            values = self._values.get(key)
+            if values:
+                summary[key] = {
+                    "avg": round(self._sums[key] / len(values), 1),
+                    "p50": _percentile(values, 0.5),
+                    "p95": _percentile(values, 0.95),
+                    "max": values[-1],
+                }
+        return summary
@@ -0,0 +1,119 @@
+# app/services/warmup.py
+# Startup warm-up: preload everything the first call would otherwise load
+# lazily, and report readiness once it's done.
+
+import asyncio
+import os
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from app.core.config import logger
+
+WARMUP_TIMEOUT_S = float(os.getenv("WARMUP_TIMEOUT_S", "30"))
+WARMUP_CONFIG_CONCURRENCY = int(os.getenv("WARMUP_CONFIG_CONCURRENCY", "8"))
+
+
+class WarmupState:
+    def __init__(self):
+        self.ready = False
+        self.started_at: Optional[str] = None
+        self.finished_at: Optional[str] = None
+        self.steps: Dict[str, Dict[str, Any]] = {}
+
+    def mark_ready(self):
+        self.ready = True
+        self.finished_at = datetime.now().isoformat()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "steps": self.steps,
+        }
+
+
+warmup_state = WarmupState()
+
+
+async def _step(name: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+    """Run one warm-up step; failures are recorded, never raised."""
+    started = time.perf_counter()
+    try:
+        detail = await fn()
+        warmup_state.steps[name] = {"ok": True, "ms": round((time.perf_counter() - started) * 1000, 1), "detail": detail}
+        logger.info(f"🔥 Warm-up {name}: {detail} ({warmup_state.steps[name]['ms']} ms)")
+        return detail
+    except Exception as e:
+        warmup_state.steps[name] = {"ok": False, "ms": round((time.perf_counter() - started) * 1000, 1), "error": str(e)}
+        logger.warning(f"⚠️ Warm-up {name} failed: {e}")
+        return None
+
+
+async def _load_tenants():
+    from app.services.tenant_directory import tenant_directory
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, tenant_directory.load_all)
+
+
+async def _load_configs():
+    from app.services.prompt_manager import prompt_manager
+    from app.services.tenant_directory import tenant_directory
+    sem = asyncio.Semaphore(WARMUP_CONFIG_CONCURRENCY)
+
+    async def load(tenant):
+        async with sem:
+            await prompt_manager.get_prompt(tenant["company_id"], tenant["office_id"])
+
+    tenants = tenant_directory.tenants()
+    await asyncio.gather(*(load(t) for t in tenants))
+    return len(tenants)
+
+
+async def _render_prompts():
+    from app.services.groq_client import groq_client
+    for language in ("en", "es"):
+        for is_first_turn in (True, False):
+            groq_client._get_system_prompt(language, is_first_turn)
+    return 4
+
+
+async def _warm_groq():
+    from app.services.groq_client import groq_client
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, groq_client.warm_connections)
+
+
+async def _synthesize_greeting():
+    # Also opens the Deepgram TTS connection
+    from app.routers.websocket_routes import prepare_greeting_audio
+    audio = await prepare_greeting_audio("en")
+    if not audio:
+        raise RuntimeError("greeting synthesis returned no audio")
+    return len(audio)
+
+
+async def _tenant_chain():
+    await _step("tenant_directory", _load_tenants)
+    await _step("tenant_configs", _load_configs)
+    await _step("system_prompts", _render_prompts)
+
+
+async def run_warmup(timeout: float = WARMUP_TIMEOUT_S):
+    """Run all warm-up steps concurrently, then flip readiness (even if degraded)."""
+    warmup_state.started_at = datetime.now().isoformat()
+    started = time.perf_counter()
+    try:
+        await asyncio.wait_for(
+            asyncio.gather(
+                _tenant_chain(),
+                _step("groq_connections", _warm_groq),
+                _step("greeting_audio", _synthesize_greeting),
+            ),
+            timeout=timeout,
+        )
+    except asyncio.TimeoutError:
+        logger.warning(f"⚠️ Warm-up exceeded {timeout}s; accepting calls with a partially warm cache")
+    warmup_state.mark_ready()
+    logger.info(f"✅ Warm-up finished in {time.perf_counter() - started:.2f}s — ready for calls")
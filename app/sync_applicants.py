@@ -1,21 +1,49 @@
-import os, httpx, time
+import asyncio
+import hashlib
+import json
+import os
+import random
+import sqlite3
+import sys
+import time
 from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
 from dateutil.parser import isoparse
-from supabase import create_client, Client
 from dotenv import load_dotenv
 
+from app.core.clients import clients
+from app.core.config import logger
+
 load_dotenv()
 
-SUPABASE_URL = os.environ["SUPABASE_URL"]
-SUPABASE_SERVICE_KEY = os.environ["SUPABASE_SERVICE_KEY"]
+SUPABASE_URL = os.getenv("SUPABASE_URL")
+SUPABASE_SERVICE_KEY = os.getenv("SUPABASE_SERVICE_KEY")
 AGENCY_ID = os.getenv("AGENCY_ID", "wondercare")
 
-AXISCARE_SITE = os.environ["AXISCARE_SITE"]
+AXISCARE_SITE = os.getenv("AXISCARE_SITE")
 AXISCARE_VERSION = os.getenv("AXISCARE_VERSION", "v1")
 AXISCARE_BASE = f"https://{AXISCARE_SITE}.axiscare.com/api/{AXISCARE_VERSION}"
-AXISCARE_TOKEN = os.environ["AXISCARE_TOKEN"]
+AXISCARE_TOKEN = os.getenv("AXISCARE_TOKEN")
 
 PAGE_SIZE = 200
+SYNC_CONCURRENCY = int(os.getenv("SYNC_CONCURRENCY", "4"))          # pages in flight
+SYNC_RATE_PER_S = float(os.getenv("SYNC_RATE_PER_S", "5"))          # AxisCare requests/second
+SYNC_UPSERT_BATCH = int(os.getenv("SYNC_UPSERT_BATCH", "1000"))
+SYNC_MAX_RETRIES = int(os.getenv("SYNC_MAX_RETRIES", "5"))
+SYNC_CHECKPOINT_PATH = os.getenv("SYNC_CHECKPOINT_PATH", ".sync_applicants_checkpoint.json")
+SYNC_HASH_INDEX_PATH = os.getenv("SYNC_HASH_INDEX_PATH", ".sync_applicants_hashes.db")
+
+
+def _make_service_client():
+    from supabase import create_client
+    return create_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
+
+
+# One pooled service-role client for every batch (was one per upsert)
+clients.register("supabase_service", _make_service_client)
+
 
 def axis_headers():
     # If AxisCare uses a different header than Bearer, change it here
@@ -46,57 +74,291 @@ def normalize(row: dict) -> dict:
         "raw": row
     }
 
-def get_updated_since() -> str:
-    # Strategy: pull from the most recent updated_at in Supabase to do incremental sync
+def get_updated_since(db) -> str:
+    # No checkpoint yet: pull from the most recent updated_at in Supabase.
     # If empty, backfill last 90 days.
-    sb: Client = create_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
-    res = sb.table("applicants").select("updated_at").order("updated_at", desc=True).limit(1).execute()
+    res = db.table("applicants").select("updated_at").order("updated_at", desc=True).limit(1).execute()
     if res.data:
         dt = isoparse(res.data[0]["updated_at"])
         return dt.astimezone(timezone.utc).isoformat()
     return (datetime.now(timezone.utc) - timedelta(days=90)).isoformat()
 
-def upsert_batch(rows: list[dict]):
+def content_hash(record: dict) -> str:
+    """Hash of what we'd write, minus the fields normalize() stamps with now()."""
+    stable = {k: v for k, v in record.items() if k not in ("updated_at", "content_hash")}
+    if not (record.get("raw") or {}).get("created_at"):
+        stable.pop("created_at", None)
+    return hashlib.sha1(json.dumps(stable, sort_keys=True, default=str).encode()).hexdigest()
+
+def upsert_batch(db, rows: List[dict]):
     if not rows:
         return
-    sb: Client = create_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
-    # upsert by primary key id
-    sb.table("applicants").upsert(rows, on_conflict="id").execute()
-
-def fetch_axiscare_page(client: httpx.Client, offset: int, updated_since: str | None):
-    params = {"limit": PAGE_SIZE, "offset": offset}
-    if updated_since:
-        params["updated_since"] = updated_since
-    r = client.get(f"{AXISCARE_BASE}/applicants", params=params)
-    r.raise_for_status()
-    data = r.json()
-    if isinstance(data, dict) and "results" in data:
-        return data["results"]
-    if isinstance(data, list):
-        return data
-    return []
+    # upsert by primary key id, in large coalesced chunks
+    for i in range(0, len(rows), SYNC_UPSERT_BATCH):
+        db.table("applicants").upsert(rows[i:i + SYNC_UPSERT_BATCH], on_conflict="id").execute()
 
-def main():
-    updated_since = get_updated_since()
-    print(f"[sync] incremental since: {updated_since}")
 
-    with httpx.Client(timeout=30, headers=axis_headers()) as c:
-        offset = 0
-        total = 0
+# ---------- Rate limiting ----------
+
+class RateLimiter:
+    """Async token bucket: at most `rate` acquisitions per second, bursts up to `burst`."""
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        self.rate = rate
+        self.capacity = float(burst or max(1, int(rate)))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+# ---------- Checkpoint ----------
+
+class Checkpoint:
+    """
+    Resume state, written atomically after every committed window:
+      updated_since  - lower bound of the run in progress (or of the next run)
+      next_offset    - first AxisCare offset not yet upserted
+      run_started_at - becomes the next run's updated_since once this one completes
+    """
+
+    def __init__(self, path: str = SYNC_CHECKPOINT_PATH):
+        self.path = path
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"[sync] ignoring unreadable checkpoint {self.path}: {e}")
+            return None
+
+    def save(self, state: Dict[str, Any]):
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp, self.path)
+
+
+# ---------- Change detection ----------
+
+class HashIndex:
+    """Local id → content_hash of the last row written, so unchanged rows are skipped."""
+
+    def __init__(self, path: str = SYNC_HASH_INDEX_PATH):
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("pragma journal_mode=wal")
+        self.conn.execute("create table if not exists hashes (id text primary key, hash text not null)")
+
+    def get_many(self, ids: List[str]) -> Dict[str, str]:
+        found: Dict[str, str] = {}
+        for i in range(0, len(ids), 500):
+            chunk = ids[i:i + 500]
+            marks = ",".join("?" * len(chunk))
+            found.update(self.conn.execute(f"select id, hash from hashes where id in ({marks})", chunk))
+        return found
+
+    def put_many(self, items: List[tuple]):
+        with self.conn:
+            self.conn.executemany(
+                "insert into hashes (id, hash) values (?, ?) on conflict(id) do update set hash = excluded.hash",
+                items,
+            )
+
+    def __len__(self) -> int:
+        return self.conn.execute("select count(*) from hashes").fetchone()[0]
+
+    def seed_from(self, db, page: int = 1000) -> int:
+        """Rebuild a lost index from applicants.content_hash so a new host doesn't rewrite everything."""
+        seeded = 0
         while True:
-            batch = fetch_axiscare_page(c, offset, updated_since)
-            if not batch:
-                break
-            normalized = [normalize(b) for b in batch if b.get("id")]
-            upsert_batch(normalized)
-            count = len(normalized)
-            total += count
-            print(f"[sync] upserted {count} (offset={offset})")
-            if len(batch) < PAGE_SIZE:
-                break
-            offset += PAGE_SIZE
-            time.sleep(0.2)  # polite pacing
-    print(f"[sync] done. total upserted: {total}")
+            rows = (
+                db.table("applicants").select("id, content_hash")
+                .order("id").range(seeded, seeded + page - 1).execute().data or []
+            )
+            self.put_many([(r["id"], r["content_hash"]) for r in rows if r.get("content_hash")])
+            seeded += len(rows)
+            if len(rows) < page:
+                return seeded
+
+
+# ---------- Engine ----------
+
+class ApplicantSync:
+    def __init__(self, http: httpx.AsyncClient, db=None, checkpoint: Optional[Checkpoint] = None,
+                 hashes: Optional[HashIndex] = None, on_change: Optional[Callable[[List[dict]], Any]] = None,
+                 concurrency: int = SYNC_CONCURRENCY, rate_per_s: float = SYNC_RATE_PER_S):
+        self.http = http
+        self._db = db
+        self.checkpoint = checkpoint or Checkpoint()
+        self.hashes = hashes if hashes is not None else HashIndex()
+        self.on_change = on_change   # called (in a worker thread) with each batch of written rows
+        self.concurrency = max(1, concurrency)
+        self.limiter = RateLimiter(rate_per_s, burst=self.concurrency)
+        self.stats = {"pages": 0, "fetched": 0, "upserted": 0, "inserted": 0, "updated": 0,
+                      "skipped": 0, "retries": 0}
+
+    @property
+    def db(self):
+        if self._db is None:
+            self._db = clients.get("supabase_service")
+        return self._db
+
+    async def fetch_axiscare_page(self, offset: int, updated_since: Optional[str]) -> List[dict]:
+        params = {"limit": PAGE_SIZE, "offset": offset}
+        if updated_since:
+            params["updated_since"] = updated_since
+        for attempt in range(SYNC_MAX_RETRIES + 1):
+            await self.limiter.acquire()
+            try:
+                r = await self.http.get(f"{AXISCARE_BASE}/applicants", params=params)
+            except httpx.TransportError as e:
+                if attempt == SYNC_MAX_RETRIES:
+                    raise
+                reason, retry_after = str(e) or type(e).__name__, None
+            else:
+                # 429 and 5xx are transient; other errors fail the run (it resumes later)
+                if r.status_code != 429 and r.status_code < 500 or attempt == SYNC_MAX_RETRIES:
+                    r.raise_for_status()
+                    break
+                reason, retry_after = f"HTTP {r.status_code}", r.headers.get("Retry-After")
+            self.stats["retries"] += 1
+            delay = float(retry_after) if retry_after and retry_after.isdigit() else \
+                min(30.0, 0.5 * 2 ** attempt) * (0.5 + random.random())
+            logger.warning(f"[sync] offset={offset} attempt {attempt + 1} failed ({reason}); retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+        data = r.json()
+        self.stats["pages"] += 1
+        if isinstance(data, dict) and "results" in data:
+            return data["results"]
+        if isinstance(data, list):
+            return data
+        return []
+
+    def _start_state(self) -> Dict[str, Any]:
+        state = self.checkpoint.load()
+        if state and state.get("next_offset") is not None:
+            logger.info(f"[sync] resuming at offset {state['next_offset']} since {state['updated_since']}")
+            return state
+        updated_since = (state or {}).get("updated_since") or get_updated_since(self.db)
+        if not len(self.hashes):
+            try:
+                logger.info(f"[sync] hash index seeded with {self.hashes.seed_from(self.db)} rows")
+            except Exception as e:
+                logger.warning(f"[sync] could not seed hash index, every row will be written: {e}")
+        return {
+            "updated_since": updated_since,
+            "next_offset": 0,
+            "run_started_at": datetime.now(timezone.utc).isoformat(),
+        }
+
+    async def run(self) -> Dict[str, Any]:
+        """
+        Fetch pages `concurrency` at a time under the rate limiter; upsert each
+        window while the next one downloads; checkpoint after each upsert lands.
+        """
+        started = time.monotonic()
+        state = await asyncio.to_thread(self._start_state)
+        self.checkpoint.save(state)
+        since = state["updated_since"]
+        offset = state["next_offset"]
+        logger.info(f"[sync] incremental since: {since}")
+
+        pending: Optional[asyncio.Task] = None
+        done = False
+        while not done:
+            offsets = [offset + i * PAGE_SIZE for i in range(self.concurrency)]
+            try:
+                pages = await asyncio.gather(*(self.fetch_axiscare_page(o, since) for o in offsets))
+            except Exception:
+                if pending:
+                    await pending  # keep the previous window's progress
+                raise
+            rows: List[dict] = []
+            for page in pages:
+                rows.extend(normalize(b) for b in page if b.get("id"))
+                self.stats["fetched"] += len(page)
+                if len(page) < PAGE_SIZE:
+                    done = True
+                    break
+            if pending:
+                await pending
+            offset = offsets[-1] + PAGE_SIZE
+            pending = asyncio.create_task(self._commit(rows, {**state, "next_offset": offset}))
+        await pending
+
+        # Completed: the next run starts from when this one began
+        self.checkpoint.save({"updated_since": state["run_started_at"], "next_offset": None})
+        self.stats["elapsed_s"] = round(time.monotonic() - started, 2)
+        logger.info(f"[sync] done. {self.stats}")
+        return self.stats
+
+    def _write_changed(self, rows: List[dict]) -> Dict[str, int]:
+        """Upsert only new or changed rows; record their hashes once the write lands."""
+        known = self.hashes.get_many([r["id"] for r in rows])
+        changed, hashes = [], []
+        counts = {"inserted": 0, "updated": 0, "skipped": 0}
+        for row in rows:
+            digest = content_hash(row)
+            previous = known.get(row["id"])
+            if previous == digest:
+                counts["skipped"] += 1
+                continue
+            counts["updated" if previous else "inserted"] += 1
+            changed.append({**row, "content_hash": digest})
+            hashes.append((row["id"], digest))
+        upsert_batch(self.db, changed)
+        self.hashes.put_many(hashes)
+        if changed and self.on_change:
+            try:
+                self.on_change(changed)
+            except Exception as e:
+                logger.warning(f"[sync] change hook failed: {e}")
+        counts["upserted"] = len(changed)
+        return counts
+
+    async def _commit(self, rows: List[dict], state: Dict[str, Any]):
+        counts = await asyncio.to_thread(self._write_changed, rows)
+        for key, n in counts.items():
+            self.stats[key] += n
+        self.checkpoint.save(state)
+        if rows:
+            logger.info(
+                f"[sync] through offset={state['next_offset']}: {counts['inserted']} inserted, "
+                f"{counts['updated']} updated, {counts['skipped']} unchanged"
+            )
+
+
+async def run_sync(**kwargs) -> Dict[str, Any]:
+    limits = httpx.Limits(max_connections=SYNC_CONCURRENCY, max_keepalive_connections=SYNC_CONCURRENCY)
+    async with httpx.AsyncClient(timeout=30, headers=axis_headers(), limits=limits) as http:
+        return await ApplicantSync(http, **kwargs).run()
+
+
+def main():
+    missing = [k for k in ("SUPABASE_URL", "SUPABASE_SERVICE_KEY", "AXISCARE_SITE", "AXISCARE_TOKEN") if not os.getenv(k)]
+    if missing:
+        raise SystemExit(f"[sync] missing environment: {', '.join(missing)}")
+    if "--watch" in sys.argv[1:]:
+        # Long-running: poll on an interval instead of exiting after one pass
+        # Publishes changed phones on the shared pub/sub so the API workers refresh them
+        from app.core.pubsub import build_pubsub
+        from app.services.applicant_sync import applicant_sync
+        asyncio.run(applicant_sync.serve(build_pubsub()))
+    else:
+        asyncio.run(run_sync())
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,84 @@
+import asyncio
+
+import pytest
+
+from app.services.applicant_sync import APPLICANT_PHONES_CHANNEL, ApplicantSyncDaemon
+
+
+class FakeLookup:
+    def __init__(self):
+        self.refreshed = []
+
+    def refresh_phones(self, phones):
+        phones = [p for p in phones if p]
+        self.refreshed.extend(phones)
+        return len(phones)
+
+
+class FakePubSub:
+    """Delivers every publish to the other workers' subscribers."""
+
+    def __init__(self):
+        self.published = []
+        self.handlers = {}
+
+    def subscribe(self, channel, handler):
+        self.handlers.setdefault(channel, []).append(handler)
+
+    async def publish(self, channel, payload):
+        self.published.append((channel, payload))
+
+
+def _daemon(runs, **kwargs):
+    async def fake_sync(checkpoint, hashes, on_change):
+        runs.append(asyncio.get_running_loop().time())
+        on_change([{"id": "1", "phone": "501-444-5566"}, {"id": "2", "phone": None}])
+        return {"upserted": 2}
+
+    daemon = ApplicantSyncDaemon(sync=fake_sync, lookup=FakeLookup(), **kwargs)
+    daemon.checkpoint = daemon.hashes = object()   # skip opening the on-disk state
+    return daemon
+
+
+@pytest.mark.asyncio
+async def test_notifications_coalesce_into_one_run():
+    runs = []
+    daemon = _daemon(runs, interval=3600, jitter=0, debounce=0.05)
+    daemon.start()
+    await asyncio.sleep(0.1)
+    assert len(runs) == 1                      # initial pass
+
+    for _ in range(5):
+        daemon.notify()
+    await asyncio.sleep(0.15)
+    await daemon.stop()
+
+    assert len(runs) == 2
+    assert daemon.lookup.refreshed == ["501-444-5566"] * 2
+    assert daemon.snapshot()["notifications"] == 5
+
+
+@pytest.mark.asyncio
+async def test_changed_phones_reach_other_workers():
+    syncing, pubsub = _daemon([], interval=3600, debounce=0), FakePubSub()
+    syncing.start(pubsub)
+    await asyncio.sleep(0.05)
+    await syncing.stop()
+    assert pubsub.published == [(APPLICANT_PHONES_CHANNEL, '["5014445566"]')]
+
+    other = ApplicantSyncDaemon(sync=None, lookup=FakeLookup())   # a worker not running the sync
+    other_bus = FakePubSub()
+    other.listen(other_bus)
+    for handler in other_bus.handlers[APPLICANT_PHONES_CHANNEL]:
+        await handler(pubsub.published[0][1])
+    assert other.lookup.refreshed == ["5014445566"]
+
+
+@pytest.mark.asyncio
+async def test_failures_back_off_with_jitter():
+    daemon = ApplicantSyncDaemon(sync=None, interval=10, jitter=0.2)
+    assert 8 <= daemon.next_delay() <= 12
+    daemon.failures = 3
+    assert 64 <= daemon.next_delay() <= 96
+    daemon.failures = 20
+    assert daemon.next_delay() <= 900 * 1.2
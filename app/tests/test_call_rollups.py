@@ -0,0 +1,134 @@
+from app.services.call_rollups import CallRollups
+
+
+class FakeRollupDB:
+    """
+    increment_call_rollup (idempotent per batch id) + a select over the rows.
+    fail="before" raises without applying; fail="after" applies, then raises
+    (a commit whose response never arrived).
+    """
+
+    def __init__(self, fail=None):
+        self.rows = {}
+        self.batches = set()
+        self.fail = fail
+
+    def rpc(self, name, params):
+        self._params = params
+        return self
+
+    def execute(self):
+        if hasattr(self, "_params"):
+            p = self.__dict__.pop("_params")
+            if self.fail == "before":
+                raise RuntimeError("db down")
+            if p["p_batch_id"] not in self.batches:
+                self._apply(p)
+            self.batches.add(p["p_batch_id"])
+            if self.fail == "after":
+                raise TimeoutError("read timed out")
+            return None
+        return type("Result", (), {"data": list(self.rows.values())})()
+
+    def _apply(self, p):
+        row = self.rows.setdefault((p["p_company_id"], p["p_office_id"], p["p_hour"]), {
+            "company_id": p["p_company_id"], "office_id": p["p_office_id"], "hour": p["p_hour"],
+            "calls": 0, "turns": 0, "urgent_calls": 0, "latency_ms_sum": 0.0, "latency_samples": 0,
+            "intents": {}, "closed_by": {},
+        })
+        for field in ("calls", "turns", "urgent_calls", "latency_ms_sum", "latency_samples"):
+            row[field] += p[f"p_{field}"]
+        for field in ("intents", "closed_by"):
+            for k, v in p[f"p_{field}"].items():
+                row[field][k] = row[field].get(k, 0) + v
+
+    def table(self, name):
+        return self
+
+    def select(self, *_):
+        return self
+
+    def eq(self, *_):
+        return self
+
+    def gte(self, *_):
+        return self
+
+    def lt(self, *_):
+        return self
+
+    def order(self, *_):
+        return self
+
+
+def _session(office, hour, urgent=False, closed_by="caller_initiated", latencies=(800, 1200)):
+    return {
+        "company_id": "acme", "office_id": office, "start_time": f"2025-03-01T{hour:02d}:17:00",
+        "messages": [{"transcript": "hi", "latency_ms": ms} for ms in latencies],
+        "analysis": {"main_intent": "inquiry", "urgent": urgent, "closed_by": closed_by},
+    }
+
+
+def test_sessions_roll_up_once_and_survive_flush():
+    db = FakeRollupDB()
+    rollups = CallRollups(client=db)
+    assert rollups.record_session("s1", _session("o1", 9))
+    assert not rollups.record_session("s1", _session("o1", 9))      # end_session then mark_closed
+    rollups.record_session("s2", _session("o1", 9, urgent=True, closed_by="escalated_to_admin"))
+    rollups.record_session("s3", _session("o2", 10, latencies=()))
+    assert not rollups.record_session("mock", {"messages": []})      # no tenant, nothing to roll up
+
+    before = rollups.query("acme", since="2025-03-01T00:00:00")
+    assert rollups.flush() == 2 and not rollups.pending
+    after = rollups.query("acme", since="2025-03-01T00:00:00")
+    assert before == after
+
+    totals = after["totals"]
+    assert totals["calls"] == 3 and totals["turns"] == 4 and totals["urgent_calls"] == 1
+    assert totals["closed_by"] == {"caller_initiated": 2, "escalated_to_admin": 1}
+    assert totals["avg_turn_latency_ms"] == 1000.0
+    assert [(b["office_id"], b["hour"], b["calls"]) for b in after["buckets"]] == [
+        ("o1", "2025-03-01T09:00:00", 2), ("o2", "2025-03-01T10:00:00", 1),
+    ]
+
+
+def test_failed_flush_keeps_deltas_in_flight():
+    db = FakeRollupDB(fail="before")
+    rollups = CallRollups(client=db)
+    rollups.record_session("s1", _session("o1", 9))
+    assert rollups.flush() == 0
+    assert [delta["calls"] for _, delta in rollups.inflight.values()] == [1]
+    assert rollups.query("acme", since="2025-03-01T00:00:00")["totals"]["calls"] == 1
+
+    db.fail = None
+    assert rollups.flush() == 1 and not rollups.inflight
+    assert rollups.query("acme", since="2025-03-01T00:00:00")["totals"]["calls"] == 1
+
+
+def test_retry_after_committed_but_failed_rpc_does_not_double_count():
+    db = FakeRollupDB(fail="after")
+    rollups = CallRollups(client=db)
+    rollups.record_session("s1", _session("o1", 9))
+    assert rollups.flush() == 0                       # committed, but the response was lost
+
+    rollups.record_session("s2", _session("o1", 9))   # new delta for the same bucket, separate batch
+    db.fail = None
+    assert rollups.flush() == 2
+    assert not rollups.inflight and not rollups.pending
+    assert rollups.query("acme", since="2025-03-01T00:00:00")["totals"]["calls"] == 2
+
+
+def test_query_sees_deltas_while_they_flush():
+    db = FakeRollupDB()
+    rollups = CallRollups(client=db)
+    rollups.record_session("s1", _session("o1", 9))
+    seen = []
+    rpc = db.rpc
+
+    def rpc_while_querying(name, params):
+        seen.append(rollups.query("acme", since="2025-03-01T00:00:00")["totals"]["calls"])
+        return rpc(name, params)
+
+    db.rpc = rpc_while_querying
+    rollups.flush()
+    assert seen == [1]
@@ -0,0 +1,36 @@
+import subprocess
+import sys
+import threading
+
+from app.core.clients import ClientRegistry
+
+
+class Service:
+    created = 0
+
+    def __init__(self):
+        Service.created += 1
+
+    def ping(self):
+        return "pong"
+
+
+def test_lazy_client_created_once_on_first_use():
+    registry = ClientRegistry()
+    registry.register("svc", Service)
+    proxy = registry.lazy("svc")
+    assert Service.created == 0 and "pending" in repr(proxy)
+
+    threads = [threading.Thread(target=proxy.ping) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert proxy.ping() == "pong"
+    assert Service.created == 1
+
+
+def test_importing_app_does_not_load_heavy_sdks():
+    code = "import sys, app.main; print(','.join(m for m in ('deepgram', 'supabase') if m in sys.modules))"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    assert out.strip() == ""
@@ -0,0 +1,137 @@
+import json
+
+import pytest
+
+from app.services import prompt_manager as pm
+from app.services.config_watcher import EPOCH, ConfigWatcher, FileConfigSource, SupabaseConfigSource, _rewind
+
+
+class FakeConfigs:
+    """service_configs stand-in: returns the current tone for a company."""
+
+    def __init__(self):
+        self.tones = {}
+        self.queries = 0
+
+    def table(self, name):
+        return self
+
+    def select(self, *_):
+        self.filters = {}
+        return self
+
+    def eq(self, column, value):
+        self.filters[column] = value
+        return self
+
+    def execute(self):
+        self.queries += 1
+        tone = self.tones.get(self.filters["company_id"])
+        return type("Result", (), {"data": [{"tone": tone}] if tone else []})()
+
+
+def write_rows(path, rows):
+    path.write_text(json.dumps(rows))
+
+
+@pytest.mark.asyncio
+async def test_watcher_refreshes_changed_tenants_in_background(tmp_path, monkeypatch):
+    db = FakeConfigs()
+    db.tones = {"acme": "Warm", "globex": "Formal"}
+    monkeypatch.setattr(pm, "supabase", db)
+    manager = pm.PromptManager(ttl=3600)
+    feed = tmp_path / "service_configs.json"
+    write_rows(feed, [
+        {"company_id": "acme", "office_id": "o1", "updated_at": "2024-01-01T00:00:00"},
+        {"company_id": "globex", "office_id": "o2", "updated_at": "2024-01-01T00:00:01"},
+    ])
+    watcher = ConfigWatcher(manager, FileConfigSource(str(feed)), interval=0.01)
+
+    assert await watcher.poll_once() == 0          # first poll only records the high-water mark
+    assert (await manager.get_prompt("acme", "o1"))["tone"] == "Warm"
+    await manager.get_prompt("globex", "o2")
+    queries = db.queries
+
+    db.tones["acme"] = "Playful"
+    write_rows(feed, [
+        {"company_id": "acme", "office_id": "o1", "updated_at": "2024-01-01T00:05:00"},
+        {"company_id": "globex", "office_id": "o2", "updated_at": "2024-01-01T00:00:01"},
+    ])
+    assert await watcher.poll_once() == 1
+    assert manager.version == 1
+    assert db.queries == queries + 1                # only the changed tenant was refetched
+
+    # The edit is visible immediately and the caller never triggered a fetch
+    assert (await manager.get_prompt("acme", "o1"))["tone"] == "Playful"
+    assert db.queries == queries + 1
+    assert await watcher.poll_once() == 0
+
+
+class FakeChangeFeed:
+    """service_configs change-feed queries; records the cursor each poll sends."""
+
+    def __init__(self):
+        self.rows = []
+        self.cursors = []
+
+    def table(self, name):
+        return self
+
+    def select(self, *_):
+        self.after = None
+        return self
+
+    def gte(self, column, value):
+        self.cursors.append(value)
+        self.after = value
+        return self
+
+    def order(self, column, desc=False):
+        self.desc = desc
+        return self
+
+    def limit(self, n):
+        return self
+
+    def execute(self):
+        rows = sorted(self.rows, key=lambda r: r["updated_at"], reverse=self.desc)
+        if self.after is not None:
+            rows = [r for r in rows if r["updated_at"] >= self.after]
+        return type("Result", (), {"data": rows})()
+
+
+@pytest.mark.asyncio
+async def test_watcher_starting_on_empty_table_picks_up_first_row(monkeypatch):
+    db = FakeConfigs()
+    db.tones = {"acme": "Warm"}
+    monkeypatch.setattr(pm, "supabase", db)
+    feed = FakeChangeFeed()
+    watcher = ConfigWatcher(pm.PromptManager(ttl=3600), SupabaseConfigSource(client=feed))
+
+    assert await watcher.poll_once() == 0
+    assert watcher.cursor == EPOCH                   # a valid timestamptz, not ""
+    assert await watcher.poll_once() == 0
+
+    feed.rows.append({"company_id": "acme", "office_id": "o1", "updated_at": "2024-01-01T00:00:00+00:00"})
+    assert await watcher.poll_once() == 1
+    assert watcher.cursor == "2024-01-01T00:00:00+00:00"
+    assert feed.cursors == [_rewind(EPOCH, 10), _rewind(EPOCH, 10)]
+
+
+@pytest.mark.asyncio
+async def test_watcher_catches_rows_that_commit_out_of_order(monkeypatch):
+    db = FakeConfigs()
+    db.tones = {"acme": "Warm", "globex": "Formal"}
+    monkeypatch.setattr(pm, "supabase", db)
+    feed = FakeChangeFeed()
+    feed.rows.append({"company_id": "acme", "office_id": "o1", "updated_at": "2024-01-01T00:00:00+00:00"})
+    watcher = ConfigWatcher(pm.PromptManager(ttl=3600), SupabaseConfigSource(client=feed, overlap=10))
+    assert await watcher.poll_once() == 0
+
+    # globex's transaction started first (earlier now()) but commits after acme's later edit was seen
+    feed.rows.append({"company_id": "acme", "office_id": "o1", "updated_at": "2024-01-01T00:00:05+00:00"})
+    assert await watcher.poll_once() == 1
+    feed.rows.append({"company_id": "globex", "office_id": "o2", "updated_at": "2024-01-01T00:00:03+00:00"})
+    assert await watcher.poll_once() == 1            # picked up despite being older than the cursor
+    assert watcher.cursor == "2024-01-01T00:00:05+00:00"
+    assert await watcher.poll_once() == 0            # re-read rows are not refreshed twice
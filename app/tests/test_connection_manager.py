@@ -0,0 +1,78 @@
+import asyncio
+import json
+
+import pytest
+
+from app.core.connection_manager import ConnectionManager
+from app.core.pubsub import LocalPubSub
+
+
+class FakeSocket:
+    def __init__(self, stalled=False):
+        self.sent = []
+        self.closed = False
+        self.gate = asyncio.Event()
+        if not stalled:
+            self.gate.set()
+
+    async def accept(self, subprotocol=None):
+        pass
+
+    async def send_text(self, data):
+        await self.gate.wait()
+        self.sent.append(json.loads(data))
+
+    async def close(self, code=1000):
+        self.closed = True
+
+
+@pytest.mark.asyncio
+async def test_broadcast_only_reaches_matching_topics():
+    manager = ConnectionManager(pubsub=LocalPubSub())
+    everything, acme, office, call, other = (FakeSocket() for _ in range(5))
+    await manager.connect(everything)
+    await manager.connect(acme, company_id="acme")
+    await manager.connect(office, office_id="o1")
+    await manager.connect(call, session_id="s1")
+    await manager.connect(other, company_id="globex")
+
+    await manager.broadcast({"type": "message", "session_id": "s1"}, company_id="acme", office_id="o1")
+    await manager.broadcast({"type": "message", "session_id": "s2"}, company_id="acme", office_id="o2")
+    await asyncio.sleep(0)
+
+    assert [m["session_id"] for m in everything.sent] == ["s1", "s2"]
+    assert [m["session_id"] for m in acme.sent] == ["s1", "s2"]
+    assert [m["session_id"] for m in office.sent] == ["s1"]
+    assert [m["session_id"] for m in call.sent] == ["s1"]
+    assert other.sent == []
+
+    manager.subscribe(other, company_id="acme")
+    await manager.broadcast({"type": "message", "session_id": "s3"}, company_id="acme")
+    await asyncio.sleep(0)
+    assert [m["session_id"] for m in other.sent] == ["s3"]
+
+
+@pytest.mark.asyncio
+async def test_slow_client_drops_interims_then_is_disconnected():
+    manager = ConnectionManager(pubsub=LocalPubSub())
+    slow, fast = FakeSocket(stalled=True), FakeSocket()
+    await manager.connect(slow)
+    await manager.connect(fast)
+    manager.subscribers[slow].maxsize = 3
+
+    for i in range(5):
+        await manager.broadcast({"type": "transcript", "is_final": False, "transcript": str(i)})
+    await manager.broadcast({"type": "message", "ai_response": "final"})
+    await asyncio.sleep(0)
+
+    assert len(fast.sent) == 6                  # a stalled dashboard never holds up the others
+    queued = [out.message for out in manager.subscribers[slow].queue]
+    assert [m.get("transcript") for m in queued][-2:] == ["4", None]
+    assert queued[-1]["ai_response"] == "final"
+
+    for i in range(3):
+        await manager.broadcast({"type": "message", "ai_response": str(i)})
+    await asyncio.sleep(0)
+    assert slow not in manager.subscribers       # a full queue of finals means it is gone
+    assert slow.closed
+    assert fast in manager.subscribers
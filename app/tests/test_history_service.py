@@ -0,0 +1,135 @@
+import pytest
+
+from app.services import history_service
+
+
+class FakeConversations:
+    """Applies the keyset filters the service sends so pages can be walked end to end."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = []
+
+    def table(self, name):
+        self.calls = [("table", name)]
+        self._filters = []
+        return self
+
+    def select(self, columns):
+        self.calls.append(("select", columns))
+        return self
+
+    def eq(self, column, value):
+        self._filters.append(lambda r: r.get(column) == value)
+        return self
+
+    def gte(self, column, value):
+        self._filters.append(lambda r: r.get(column) >= value)
+        return self
+
+    def lt(self, column, value):
+        self._filters.append(lambda r: r.get(column) < value)
+        return self
+
+    def or_(self, expr):
+        self.calls.append(("or", expr))
+        ts = expr.split('"')[1]
+        last_id = expr.rsplit("id.lt.", 1)[1].rstrip(")")
+        self._filters.append(lambda r: (r["started_at"], r["id"]) < (ts, last_id))
+        return self
+
+    def order(self, column, desc=False, foreign_table=None):
+        self.calls.append(("order", column, foreign_table))
+        return self
+
+    def limit(self, n):
+        self._limit = n
+        return self
+
+    def execute(self):
+        rows = [r for r in self.rows if all(f(r) for f in self._filters)]
+        rows.sort(key=lambda r: (r["started_at"], r["id"]), reverse=True)
+        return type("Result", (), {"data": rows[: self._limit]})()
+
+
+def _rows():
+    return [
+        {
+            "id": f"c{i}", "company_id": "acme", "office_id": "o1" if i % 2 else "o2",
+            "status": "closed", "started_at": f"2025-01-01T00:00:{i % 3:02d}", "ended_at": None,
+            "metadata": {"caller_id": f"+1555000{i:04d}"},
+            "intent_summary": {"main_intent": "inquiry"} if i != 3 else None,
+            "messages": [{"intent": "care_need"}, {"intent": "goodbye"}],
+        }
+        for i in range(7)
+    ]
+
+
+def test_walks_all_pages_once_in_order():
+    db = FakeConversations(_rows())
+    seen, cursor = [], None
+    while True:
+        page = history_service.fetch_page(db, company_id="acme", cursor=cursor, limit=3)
+        seen += [c["id"] for c in page["conversations"]]
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+    assert len(seen) == 7 and len(set(seen)) == 7
+    assert seen == [r["id"] for r in sorted(_rows(), key=lambda r: (r["started_at"], r["id"]), reverse=True)]
+
+
+def test_summary_only_skips_messages_and_uses_persisted_analysis():
+    db = FakeConversations(_rows())
+    page = history_service.fetch_page(db, office_id="o1", summary_only=True)
+    assert "messages" not in db.calls[1][1]
+    assert all("messages" not in c for c in page["conversations"])
+    assert {c["analysis"]["main_intent"] for c in page["conversations"] if c["id"] != "c3"} == {"inquiry"}
+
+    full = history_service.fetch_page(db, session_id="c3")["conversations"][0]
+    assert full["analysis"]["ended_with_closure"]          # legacy row: computed from messages
+    assert full["analysis"]["metrics"]["total_messages"] == 2   # same shape as persisted rows
+    assert "total_messages" not in full["analysis"]
+    assert full["caller_id"] == "+15550000003"
+
+
+def test_since_until_bound_started_at():
+    db = FakeConversations(_rows())
+    page = history_service.fetch_page(db, since="2025-01-01T00:00:01", until="2025-01-01T00:00:02")
+    assert sorted(c["id"] for c in page["conversations"]) == ["c1", "c4"]
+    assert history_service.fetch_page(db, until="2025-01-01T00:00:00")["conversations"] == []
+
+
+def test_rejects_tampered_cursor():
+    bad = history_service.encode_cursor('2025-01-01",id.gt.0', "x")
+    with pytest.raises(history_service.InvalidCursor):
+        history_service.decode_cursor(bad)
+    with pytest.raises(history_service.InvalidCursor):
+        history_service.decode_cursor("not-a-cursor")
+
+
+def test_export_streams_every_row_with_resume_cursor(monkeypatch):
+    monkeypatch.setattr(history_service, "EXPORT_PAGE_SIZE", 2)
+    db = FakeConversations(_rows())
+    chunks = list(history_service.export_csv(
+        history_service.iter_export_rows(db, company_id="acme"),
+        history_service.CONVERSATION_EXPORT_FIELDS,
+    ))
+    lines = "".join(chunks).splitlines()
+    assert lines[0].startswith("id,company_id") and len(lines) == 8
+    assert len(chunks) > 2                      # flushed page by page, not built up front
+
+    rows = list(history_service.iter_export_rows(db, kind="messages", company_id="acme"))
+    assert len(rows) == 14
+    resume = rows[5]["cursor"]                  # last message of the third conversation
+    rest = list(history_service.iter_export_rows(db, kind="messages", company_id="acme", cursor=resume))
+    assert rows[6:] == rest
+
+
+def test_export_reads_message_count_from_persisted_summary():
+    rows = _rows()[:2]
+    rows[0]["intent_summary"] = {"main_intent": "inquiry", "urgent": False,
+                                 "metrics": {"total_messages": 2, "intents_distribution": {}}}
+    rows[1]["intent_summary"] = {"main_intent": "inquiry", "total_messages": 5}
+    exported = {r["id"]: r for r in history_service.iter_export_rows(FakeConversations(rows))}
+    assert exported["c0"]["total_messages"] == 2
+    assert exported["c1"]["total_messages"] == 5
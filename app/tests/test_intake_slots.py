@@ -0,0 +1,48 @@
+from app.services import intake_slots
+from app.services.conversation_manager import ConversationManager
+
+
+def test_slots_fill_incrementally_on_add_message():
+    manager = ConversationManager()
+    sid = manager.start_session("+15550001111")
+    slots = manager.sessions[sid]["slots"]
+
+    manager.add_message(sid, {"transcript": "Hi, my name is maria"})
+    assert slots["caller_name"] == "Maria"
+    assert not intake_slots.is_intake_complete(slots)
+
+    manager.add_message(sid, {"transcript": "My mother needs medication reminders"})
+    manager.add_message(sid, {"ai_response": "How many hours?"})
+    manager.add_message(sid, {"transcript": "About 20 hours per week, monday to friday, 555-123-4567"})
+
+    assert slots["messages_seen"] == 4
+    assert intake_slots.is_intake_complete(slots)
+    assert intake_slots.intake_info(slots) == {
+        "caller_name": "Maria",
+        "care_recipient": "Mother",
+        "care_needs": ["medication_reminders"],
+        "schedule_preference": "20 hours per week",
+        "contact_phone": "555-123-4567",
+    }
+    assert slots["days"] == ["monday", "friday"]
+
+
+def test_days_are_canonical_and_whole_words():
+    slots = intake_slots.new_slots()
+    intake_slots.update_slots(slots, "Lunes y miércoles, and maybe Wed or a weekday")
+    intake_slots.update_slots(slots, "also mon, the money is fine")
+    assert slots["days"] == ["monday", "wednesday", "weekdays"]
+
+
+def test_sync_only_folds_new_messages():
+    session = {"messages": [{"transcript": "this is joe"}]}
+    slots = intake_slots.sync_slots(session)
+    assert slots["caller_name"] == "Joe" and slots["messages_seen"] == 1
+
+    # Already-folded messages are not rescanned
+    session["messages"][0]["transcript"] = "my name is someone else"
+    session["messages"].append({"transcript": "care for my dad, companionship"})
+    intake_slots.sync_slots(session)
+    assert slots["caller_name"] == "Joe"
+    assert slots["care_recipient"] == "Dad"
+    assert intake_slots.is_intake_complete(slots)
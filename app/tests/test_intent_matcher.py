@@ -0,0 +1,36 @@
+from app.services import intent_matcher
+
+
+def test_overlapping_keywords_are_all_found():
+    features = intent_matcher.analyze("Goodbye, thanks so much!")
+    assert {"goodbye", "bye", "thanks so much"} <= features.keywords
+    # "mon" is a prefix of "monday"; "weekday" is a prefix of "weekdays"
+    assert {"monday", "mon", "weekdays", "weekday"} <= intent_matcher.analyze("monday and weekdays").keywords
+
+
+def test_keyword_scan_matches_substring_semantics():
+    samples = [
+        "My name is Ana and I'm calling for my mother, she needs medication reminders",
+        "I applied for the caregiver job last week, do you want my number?",
+        "sunday works, call me back tomorrow",
+        "",
+    ]
+    for text in samples:
+        lower = text.lower()
+        expected = {k for k in intent_matcher._ALL_KEYWORDS if k in lower}
+        assert intent_matcher.analyze(text).keywords == expected
+
+
+def test_structured_features():
+    features = intent_matcher.analyze("My name is john smith, call 555 123 4567, 20 hours a week from 8 am to 12 pm")
+    assert features.phone == "555-123-4567"
+    assert features.caller_name.startswith("John Smith")
+    assert features.hours_per_week_loose == "20"
+    assert features.hours_per_week is None  # strict form needs "hours week" / "hours per week"
+    assert features.time_range == ("8", "12")
+    assert features.has_time_window and features.has_specific_time
+
+
+def test_analysis_is_cached_per_utterance():
+    text = "my dad needs companionship on weekends"
+    assert intent_matcher.analyze(text) is intent_matcher.analyze(text)
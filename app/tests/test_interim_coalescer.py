@@ -0,0 +1,36 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.services.interim_coalescer import InterimCoalescer
+
+
+@pytest.mark.asyncio
+async def test_partials_coalesced_and_finals_flush_immediately():
+    loop = asyncio.get_running_loop()
+    sent = []
+
+    async def emit(message):
+        sent.append(message["transcript"])
+
+    coalescer = InterimCoalescer(loop, emit, hz=20)
+
+    def deepgram_thread():
+        for i in range(50):
+            coalescer.interim({"transcript": f"partial {i}"})
+
+    worker = threading.Thread(target=deepgram_thread)
+    worker.start()
+    worker.join()
+    await asyncio.sleep(0.12)
+
+    assert coalescer.received == 50
+    assert sent[-1] == "partial 49"          # the latest partial always wins
+    assert len(sent) <= 3
+
+    coalescer.interim({"transcript": "stale partial"})
+    coalescer.final({"transcript": "final"})
+    await asyncio.sleep(0.12)
+    assert sent[-1] == "final"
+    assert "stale partial" not in sent
@@ -0,0 +1,102 @@
+import pytest
+
+from app.services.job_lookup import JobApplicationLookup, normalize_phone
+
+
+class FakeAPIError(Exception):
+    """Shape of postgrest's APIError: a message plus the PostgREST/Postgres code."""
+
+    def __init__(self, message, code):
+        super().__init__(message)
+        self.code = code
+
+
+class FakeApplications:
+    """job_applications without migration 004: no phone_key column, no trigram RPC."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = 0
+
+    def rpc(self, name, params):
+        raise FakeAPIError("function search_job_applications_by_name does not exist", "PGRST202")
+
+    def table(self, name):
+        self._filter = None
+        return self
+
+    def select(self, *_):
+        return self
+
+    def eq(self, column, value):
+        if column == "phone_key":
+            raise FakeAPIError("column job_applications.phone_key does not exist", "42703")
+        self._filter = (column, [value])
+        return self
+
+    def in_(self, column, values):
+        self._filter = (column, values)
+        return self
+
+    def execute(self):
+        self.queries += 1
+        rows = self.rows
+        if self._filter:
+            column, values = self._filter
+            rows = [r for r in rows if r.get(column) in values]
+        return type("Result", (), {"data": rows})()
+
+
+ROWS = [
+    {"id": 1, "name": "Maria Johnson", "phone_number": "501-444-5566", "status": "in review"},
+    {"id": 2, "name": "Mario Jones", "phone_number": "(501) 444-7788", "status": "hired"},
+    {"id": 3, "name": "Kathleen O'Brien", "phone_number": "5015550000", "status": "new"},
+]
+
+
+def test_normalize_phone():
+    assert normalize_phone("+1 (501) 444-5566") == normalize_phone("501.444.5566") == "5014445566"
+    assert normalize_phone("444-5566") is None
+
+
+def test_phone_and_misspelled_name_fall_back_and_cache():
+    db = FakeApplications(ROWS)
+    lookup = JobApplicationLookup(client=db)
+
+    assert [r["id"] for r in lookup.search(phone="+15014445566")] == [1]
+    assert [r["id"] for r in lookup.search(name="Mariah Jonson")][:1] == [1]
+    assert [r["id"] for r in lookup.search(name="kathleen obrien")] == [3]
+    assert lookup.search(name="Zebulon Quark") == []
+
+    queries = db.queries
+    lookup.search(phone="501 444 5566")
+    lookup.search(name="MARIAH  JONSON")
+    lookup.search(name="Zebulon Quark")               # misses are cached too
+    assert db.queries == queries
+
+    lookup.prime([{"id": 4, "name": "Zebulon Quark", "phone_number": "5017770000", "status": "new"}])
+    assert [r["id"] for r in lookup.search(name="Zebulon Quark")] == [4]
+    assert [r["id"] for r in lookup.search(phone="501-777-0000")] == [4]
+
+
+def test_refresh_phones_rereads_changed_applicants():
+    db = FakeApplications([dict(r) for r in ROWS])
+    lookup = JobApplicationLookup(client=db)
+    assert lookup.by_phone("5014445566")[0]["status"] == "in review"
+
+    db.rows[0]["status"] = "hired"
+    assert lookup.refresh_phones(["+1 501 444 5566", None]) == 1
+    queries = db.queries
+    assert lookup.by_phone("501-444-5566")[0]["status"] == "hired"
+    assert db.queries == queries               # warmed, not read on demand
+
+
+def test_transient_errors_keep_the_db_search_paths():
+    db = FakeApplications(ROWS)
+    db.rpc = lambda name, params: (_ for _ in ()).throw(TimeoutError("read timed out"))
+    lookup = JobApplicationLookup(client=db)
+
+    with pytest.raises(TimeoutError):
+        lookup.search(name="Mariah Jonson")
+    assert lookup._db_trigram
+    assert not lookup._names_loaded          # no full-table scan after a blip
@@ -0,0 +1,44 @@
+import json
+
+from app.utils.llm_output import (
+    JSONObjectExtractor,
+    extract_json_object,
+    iter_json_objects,
+    normalize_ai_response,
+    strip_inline_fillers,
+)
+
+REPLY = {"intent": "scheduling", "ai_response": 'Use "quotes" and {braces} \\ safely', "urgent": False}
+
+
+def test_extract_clean_and_wrapped_json():
+    raw = json.dumps(REPLY)
+    assert extract_json_object(raw) == REPLY
+    assert extract_json_object(f"Sure! Here you go:\n{raw}\nAnything {{else}}?") == REPLY
+    assert extract_json_object("no json here") is None
+
+
+def test_incremental_extractor_handles_any_chunking():
+    text = "prefix " + json.dumps(REPLY) + " middle " + json.dumps({"n": 2}) + " }"
+    for size in range(1, len(text) + 1):
+        chunks = [text[i:i + size] for i in range(0, len(text), size)]
+        assert list(iter_json_objects(chunks)) == [REPLY, {"n": 2}]
+
+
+def test_extractor_skips_malformed_objects():
+    extractor = JSONObjectExtractor()
+    assert extractor.feed("{not json} then ") == []
+    assert extractor.feed('{"ok": true}') == [{"ok": True}]
+
+
+def test_normalize_ai_response():
+    assert normalize_ai_response("Perfect! — Thank you for that information.  we  can\nhelp.") == "We can help."
+    assert normalize_ai_response("Perfecto. Gracias por esa información. ¿Qué días?") == "¿Qué días?"
+    assert normalize_ai_response("Got it— sounds good") == "Sounds good"
+    assert normalize_ai_response("Perfectly normal request") == "Perfectly normal request"
+    assert normalize_ai_response("") == ""
+
+
+def test_strip_inline_fillers():
+    assert strip_inline_fillers("Thanks. Perfect - see you Monday. Got it— bye") == "Thanks. see you Monday. bye"
+    assert strip_inline_fillers("Nothing to strip") == "Nothing to strip"
@@ -0,0 +1,114 @@
+import threading
+import time
+
+import pytest
+
+from app.services.llm_router import LLMRouter, LLMRoute, LatencyTracker
+
+
+class MockLLMBackend:
+    """Local stand-in for Groq: fast replies with a deterministic slow tail."""
+
+    def __init__(self, fast=0.005, slow=0.25, slow_every=20, failing_models=()):
+        self.fast = fast
+        self.slow = slow
+        self.slow_every = slow_every
+        self.failing_models = set(failing_models)
+        self.calls = []
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, route, payload):
+        with self._lock:
+            self._count += 1
+            n = self._count
+            self.calls.append(route.model)
+        if route.model in self.failing_models:
+            raise RuntimeError(f"{route.model} unavailable")
+        time.sleep(self.slow if n % self.slow_every == 0 else self.fast)
+        return {"model": route.model, "payload": payload}
+
+
+def _turn_latencies(router, turns):
+    latencies = []
+    for _ in range(turns):
+        started = time.perf_counter()
+        router.post({"messages": []})
+        latencies.append(time.perf_counter() - started)
+    return sorted(latencies)
+
+
+def _pct(ordered, pct):
+    return ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))]
+
+
+def test_latency_tracker_percentiles():
+    tracker = LatencyTracker(min_samples=5)
+    assert tracker.percentile("m@u", 50) is None
+    for ms in range(1, 101):
+        tracker.record("m@u", ms / 1000)
+    assert tracker.percentile("m@u", 50) == pytest.approx(0.050)
+    assert tracker.percentile("m@u", 90) == pytest.approx(0.090)
+    assert tracker.snapshot()["m@u"]["samples"] == 100
+
+
+def test_hedging_brings_p99_close_to_p50():
+    routes = [LLMRoute("primary", "mock://a"), LLMRoute("secondary", "mock://b")]
+
+    unhedged = LLMRouter(routes, MockLLMBackend(), default_hedge_delay=60)
+    unhedged.hedge_delay = lambda route: None
+    baseline = _turn_latencies(unhedged, 200)
+
+    hedged = LLMRouter(
+        routes,
+        MockLLMBackend(),
+        tracker=LatencyTracker(min_samples=20),
+        default_hedge_delay=0.02,
+        min_hedge_delay=0.001,
+    )
+    hedged_latencies = _turn_latencies(hedged, 200)
+
+    assert _pct(baseline, 99) >= 0.25
+    assert _pct(hedged_latencies, 99) < 0.05
+    assert _pct(hedged_latencies, 99) < 4 * _pct(hedged_latencies, 50)
+
+
+def test_falls_back_across_model_list():
+    backend = MockLLMBackend(failing_models={"primary"})
+    router = LLMRouter(
+        [LLMRoute("primary", "mock://a"), LLMRoute("secondary", "mock://a")],
+        backend,
+        default_hedge_delay=5,
+    )
+    assert router.post({})["model"] == "secondary"
+    assert backend.calls == ["primary", "secondary"]
+
+
+def test_fallback_primary_is_hedged():
+    calls = []
+
+    def send(route, payload):
+        calls.append(route.model)
+        if route.model in ("a", "b"):
+            time.sleep(0.1 if route.model == "a" else 0)   # a is hedged to b, then both fail
+            raise RuntimeError(f"{route.model} unavailable")
+        time.sleep(1.0 if route.model == "c" else 0.005)
+        return {"model": route.model}
+
+    router = LLMRouter(
+        [LLMRoute(m, "mock://") for m in ("a", "b", "c", "d")],
+        send,
+        default_hedge_delay=0.05,
+        min_hedge_delay=0.001,
+    )
+    started = time.perf_counter()
+    assert router.post({})["model"] == "d"          # slow fallback c is hedged to d
+    assert time.perf_counter() - started < 0.5
+    assert calls == ["a", "b", "c", "d"]
+
+
+def test_raises_last_error_when_every_route_fails():
+    backend = MockLLMBackend(failing_models={"a", "b"})
+    router = LLMRouter([LLMRoute("a", "mock://"), LLMRoute("b", "mock://")], backend)
+    with pytest.raises(RuntimeError, match="b unavailable"):
+        router.post({})
@@ -0,0 +1,88 @@
+import asyncio
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.loop_monitor import LoopMonitor
+from app.core.metrics import registry
+from app.routers import mock_routes
+
+
+def _blocking_call():
+    time.sleep(0.3)
+
+
+@pytest.mark.asyncio
+async def test_stall_is_attributed_to_blocking_call_site():
+    monitor = LoopMonitor(interval_ms=10, threshold_ms=100)
+    monitor.start()
+    try:
+        await asyncio.sleep(0.05)
+        _blocking_call()
+        await asyncio.sleep(0.05)
+    finally:
+        await monitor.stop()
+
+    snapshot = monitor.snapshot()
+    assert snapshot["stalls"] == 1
+    site = snapshot["sites"][0]
+    assert site["site"].startswith("app/tests/test_loop_monitor.py:")
+    assert site["site"].endswith(" _blocking_call")
+    assert site["max_ms"] >= 200
+    assert "time.sleep(0.3)" in site["stack"][-1]
+    assert "servoice_event_loop_stalls_total{site=" in registry.render()
+
+
+@pytest.mark.asyncio
+async def test_short_awaits_are_not_stalls():
+    monitor = LoopMonitor(interval_ms=10, threshold_ms=100)
+    monitor.start()
+    await asyncio.sleep(0.1)
+    await monitor.stop()
+
+    snapshot = monitor.snapshot()
+    assert snapshot["beats"] > 3
+    assert snapshot["stalls"] == 0
+
+
+@pytest.mark.asyncio
+async def test_runtime_toggle():
+    monitor = LoopMonitor(interval_ms=10, threshold_ms=100)
+    await monitor.configure(enabled=True, threshold_ms=50)
+    assert monitor.enabled
+    assert monitor.snapshot()["threshold_ms"] == 50
+
+    await monitor.configure(enabled=False, reset=True)
+    assert not monitor.enabled
+    assert monitor._watchdog is None
+    assert monitor.snapshot()["beats"] == 0
+
+
+@pytest.mark.asyncio
+async def test_threshold_has_a_floor():
+    monitor = LoopMonitor(interval_ms=10, threshold_ms=100)
+    with pytest.raises(ValueError):
+        await monitor.configure(threshold_ms=0)
+    assert monitor.snapshot()["threshold_ms"] == 100
+
+
+def test_debug_endpoint_is_guarded_and_validated(monkeypatch):
+    app = FastAPI()
+    app.include_router(mock_routes.router)
+    client = TestClient(app)
+    monkeypatch.setattr(mock_routes, "loop_monitor", LoopMonitor(interval_ms=10, threshold_ms=100))
+
+    monkeypatch.delenv("DEBUG_API_TOKEN", raising=False)
+    assert client.post("/debug/loop-monitor", json={"reset": True}).status_code == 401
+
+    monkeypatch.setenv("DEBUG_API_TOKEN", "s3cret")
+    headers = {"x-debug-token": "s3cret"}
+    assert client.post("/debug/loop-monitor", json={"reset": True}).status_code == 401
+    assert client.get("/debug/loop-monitor", headers=headers).status_code == 200
+    for body in ({"threshold_ms": 0}, {"threshold_ms": "fast"}, {"enabled": "yes"}, {"interval": 1}):
+        assert client.post("/debug/loop-monitor", json=body, headers=headers).status_code == 422
+    response = client.post("/debug/loop-monitor", json={"threshold_ms": 250, "reset": True}, headers=headers)
+    assert response.status_code == 200
+    assert response.json()["threshold_ms"] == 250
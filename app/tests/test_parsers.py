@@ -0,0 +1,41 @@
+import random
+
+import pytest
+
+from app.benchmarks.bench_parsers import TRANSCRIPTS, legacy_smart_extract_info
+from app.utils.parsers import extract_name, extract_phone, smart_extract_info
+
+# Vocabulary that exercises every pattern: triggers, noise words next to
+# digits, odd separators, and non-ASCII letters that IGNORECASE folds.
+TOKENS = [
+    "my", "name", "is", "i", "am", "I'm", "im", "this", "name's", "applied", "as", "for",
+    "application", "under", "the", "Maria", "JOHNSON", "o'brien", "José", "ſam", "İvan", "Kelvin",
+    "job", "role", "position", "nurse", "aide", "Technician", "status", "interview", "hiring",
+    "call", "phone", "number", "at", "reach", "contact", "text", "email", "mail",
+    "urgent", "ASAP", "soon", "today", "last week", "3", "days", "ago", "Monday", "friday",
+    "501", "444", "5566", "(501)", "+1", "1", "501-444-5566", "5014445566", "15014445566",
+    "555.123.4567", "٥٠١", ".", ",", "-", "  ", "\n", "um", "uh",
+]
+
+
+def test_known_transcripts():
+    info = smart_extract_info(TRANSCRIPTS[0])
+    assert info["phone"] == "5014445566"
+    assert info["name"] == "Maria Johnson and"       # greedy by design, kept as-is
+    assert info["context"]["timeframe_mentioned"] == "last week"
+    assert extract_phone("call me at (501)  555   0000") == "5015550000"
+    assert extract_phone("+1 501 444 7788") == "5014447788"
+    assert extract_name("Thanks, bye") is None
+
+
+@pytest.mark.parametrize("text", TRANSCRIPTS)
+def test_matches_previous_implementation(text):
+    assert smart_extract_info(text) == legacy_smart_extract_info(text)
+
+
+def test_matches_previous_implementation_on_random_text():
+    rng = random.Random(47)
+    for _ in range(3000):
+        words = rng.choices(TOKENS, k=rng.randint(0, 18))
+        text = "".join(w + rng.choice([" ", " ", "", "-", ", "]) for w in words)
+        assert smart_extract_info(text) == legacy_smart_extract_info(text), text
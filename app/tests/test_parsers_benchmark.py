@@ -0,0 +1,19 @@
+import pytest
+
+from app.benchmarks.bench_parsers import TRANSCRIPTS, legacy_smart_extract_info
+from app.utils.parsers import smart_extract_info
+
+
+def _run(fn):
+    for text in TRANSCRIPTS:
+        fn(text)
+
+
+@pytest.mark.benchmark(group="parsers")
+def test_bench_smart_extract_info(benchmark):
+    benchmark(_run, smart_extract_info)
+
+
+@pytest.mark.benchmark(group="parsers")
+def test_bench_legacy_smart_extract_info(benchmark):
+    benchmark(_run, legacy_smart_extract_info)
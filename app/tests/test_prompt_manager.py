@@ -0,0 +1,191 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.services import prompt_manager as pm
+
+
+class FakeSupabase:
+    """Records service_configs queries; "slow" blocks until released, "ghost" has no config."""
+
+    def __init__(self):
+        self.calls = []
+        self.release_slow = threading.Event()
+
+    def table(self, name):
+        return FakeQuery(self)
+
+
+class FakeQuery:
+    def __init__(self, db):
+        self.db = db
+        self.filters = {}
+
+    def select(self, *_):
+        return self
+
+    def eq(self, column, value):
+        self.filters[column] = value
+        return self
+
+    def execute(self):
+        company_id = self.filters["company_id"]
+        self.db.calls.append(company_id)
+        if company_id == "slow":
+            self.db.release_slow.wait(5)
+        else:
+            time.sleep(0.02)
+        rows = [] if company_id == "ghost" else [
+            {"tone": f"tone-{company_id}-{len(self.db.calls)}", "business_type": "caregiving"}
+        ]
+        return type("Result", (), {"data": rows})()
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    db = FakeSupabase()
+    monkeypatch.setattr(pm, "supabase", db)
+    yield db
+    db.release_slow.set()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_fetch(fake_db):
+    manager = pm.PromptManager()
+    results = await asyncio.gather(*(manager.get_prompt("acme") for _ in range(20)))
+    assert fake_db.calls == ["acme"]
+    assert all(r is results[0] for r in results)
+
+
+@pytest.mark.asyncio
+async def test_slow_tenant_does_not_block_other_tenants(fake_db):
+    manager = pm.PromptManager()
+    await manager.get_prompt("fast")
+
+    slow = asyncio.ensure_future(manager.get_prompt("slow"))
+    await asyncio.sleep(0.01)
+    started = time.perf_counter()
+    assert (await manager.get_prompt("fast"))["tone"] == "tone-fast-1"
+    await manager.get_prompt("other")
+    assert time.perf_counter() - started < 0.5
+    assert not slow.done()
+
+    fake_db.release_slow.set()
+    assert (await slow)["tone"].startswith("tone-slow")
+
+
+@pytest.mark.asyncio
+async def test_stale_entry_served_while_refreshing(fake_db):
+    manager = pm.PromptManager(ttl=0.01, stale_ttl=60)
+    first = await manager.get_prompt("acme")
+    await asyncio.sleep(0.02)
+
+    stale = await manager.get_prompt("acme")
+    assert stale is first                      # returned without waiting
+    await asyncio.sleep(0.1)                   # background refresh lands
+    fresh = await manager.get_prompt("acme")
+    assert fresh["tone"] == "tone-acme-2"
+    assert fake_db.calls == ["acme", "acme"]
+
+
+@pytest.mark.asyncio
+async def test_cache_is_keyed_by_office_and_bounded(fake_db):
+    manager = pm.PromptManager(maxsize=2)
+    a = await manager.get_prompt("acme", "office-a")
+    b = await manager.get_prompt("acme", "office-b")
+    assert a is not b
+    assert await manager.get_prompt("acme", "office-a") is a
+
+    await manager.get_prompt("acme", "office-c")   # evicts least recently used (office-b)
+    stats = manager.cache_stats()
+    assert stats["size"] == 2 and stats["evictions"] == 1 and stats["hits"] == 1
+
+    await manager.get_prompt("acme", "office-b")
+    assert fake_db.calls.count("acme") == 4
+
+
+@pytest.mark.asyncio
+async def test_missing_config_is_negatively_cached(fake_db):
+    manager = pm.PromptManager()
+    for _ in range(3):
+        assert (await manager.get_prompt("ghost"))["prompt_template"] is None
+    assert fake_db.calls == ["ghost"]
+
+
+@pytest.mark.asyncio
+async def test_invalidate_drops_all_offices_of_a_company(fake_db):
+    manager = pm.PromptManager()
+    await manager.get_prompt("acme", "office-a")
+    await manager.get_prompt("acme", "office-b")
+    await manager.get_prompt("other")
+
+    assert manager.invalidate("acme") == 2
+    assert manager.cache_stats()["size"] == 1
+    assert (await manager.get_prompt("acme", "office-a"))["tone"] == "tone-acme-4"
+
+
+@pytest.mark.asyncio
+async def test_invalidating_one_tenant_keeps_other_in_flight_fetches(fake_db):
+    manager = pm.PromptManager()
+    slow = asyncio.ensure_future(manager.get_prompt("slow"))
+    await asyncio.sleep(0.01)
+
+    manager.invalidate("acme")
+    fake_db.release_slow.set()
+    await slow
+    await manager.get_prompt("slow")
+    assert fake_db.calls == ["slow"]           # the in-flight result was still cached
+
+
+
+class GatedConfigs:
+    """Every service_configs query blocks until its gate opens; the tone says which query it was."""
+
+    def __init__(self):
+        self.gates = []
+
+    def table(self, name):
+        return self
+
+    def select(self, *_):
+        return self
+
+    def eq(self, column, value):
+        return self
+
+    def execute(self):
+        gate = threading.Event()
+        self.gates.append(gate)
+        tone = f"v{len(self.gates)}"
+        gate.wait(5)
+        return type("Result", (), {"data": [{"tone": tone}]})()
+
+    async def started(self, n):
+        while len(self.gates) < n:
+            await asyncio.sleep(0.005)
+
+    async def opened(self, n):
+        await self.started(n)
+        self.gates[n - 1].set()
+
+
+@pytest.mark.asyncio
+async def test_refresh_wins_over_an_older_fetch_that_finishes_later(monkeypatch):
+    db = GatedConfigs()
+    monkeypatch.setattr(pm, "supabase", db)
+    manager = pm.PromptManager()
+    first = asyncio.ensure_future(manager.get_prompt("acme"))
+    await db.opened(1)
+    assert (await first)["tone"] == "v1"
+
+    old_fetch = manager._start_fetch(("acme", None))   # e.g. a stale refresh that read the pre-change row
+    await db.started(2)
+    refresh = asyncio.ensure_future(manager.refresh("acme"))
+    await db.opened(3)
+    await refresh
+    await db.opened(2)
+    await old_fetch
+
+    assert (await manager.get_prompt("acme"))["tone"] == "v3"
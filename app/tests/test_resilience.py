@@ -0,0 +1,69 @@
+import time
+
+import requests
+
+from app.services.groq_client import GroqClient
+from app.services.resilience import AIMDLimiter, CircuitBreaker
+
+
+def test_breaker_opens_then_probes_and_closes():
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=0.05)
+    for _ in range(2):
+        assert breaker.allow()
+        breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+
+    time.sleep(0.06)
+    assert breaker.allow()          # single half-open probe
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_failed_probe_reopens_circuit():
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=0.01)
+    breaker.record_failure()
+    time.sleep(0.02)
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+def test_aimd_limiter_adapts_and_rejects_when_full():
+    limiter = AIMDLimiter("test", initial=2, min_limit=1, max_limit=4, max_wait=0.01)
+    assert limiter.acquire() and limiter.acquire()
+    assert not limiter.acquire()
+
+    limiter.release(False)
+    assert limiter.limit == 1
+    limiter.release(None)
+    for _ in range(4):
+        assert limiter.acquire()
+        limiter.release(True)
+    assert 1 < limiter.limit <= 4
+
+
+def test_open_circuit_returns_fallback_without_calling_groq():
+    client = GroqClient()
+    calls = []
+
+    def failing_send(route, payload):
+        calls.append(route.model)
+        raise requests.exceptions.ConnectionError("groq down")
+
+    client.router.send = failing_send
+    client.breaker = CircuitBreaker("groq", failure_threshold=1, reset_timeout=60)
+    client._post_with_retry = lambda payload, retries=2, backoff=2: GroqClient._post_with_retry(
+        client, payload, retries=0, backoff=0
+    )
+
+    first = client.detect_intent("I need a caregiver for my mom")
+    assert first["intent"] == "clarification_needed"
+    assert client.breaker.state == CircuitBreaker.OPEN
+
+    started = time.perf_counter()
+    second = client.detect_intent("Hello?")
+    assert time.perf_counter() - started < 0.05
+    assert "repeat" in second["ai_response"]
+    assert len(calls) == 1
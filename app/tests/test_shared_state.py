@@ -0,0 +1,85 @@
+import asyncio
+import json
+
+import pytest
+
+from app.core.connection_manager import ConnectionManager
+from app.core.pubsub import SQLitePubSub
+from app.core.session_store import SQLiteSessionStore
+from app.services.conversation_manager import ConversationManager
+
+
+class FakeSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def accept(self, subprotocol=None):
+        pass
+
+    async def send_text(self, data):
+        self.sent.append(json.loads(data))
+
+
+@pytest.mark.asyncio
+async def test_sessions_visible_across_workers(tmp_path):
+    path = str(tmp_path / "state.db")
+    worker_a = ConversationManager(store=SQLiteSessionStore(path))
+    worker_b = ConversationManager(store=SQLiteSessionStore(path))
+
+    sid = worker_a.start_session("+15550001111")
+    worker_a.add_message(sid, {"user_transcript": "my mother needs help", "ai_response": "Of course."})
+
+    worker_a.store.flush()
+    assert sid not in worker_b.sessions   # the call stays owned by worker A
+    remote = await worker_b.get_history(sid)
+    assert remote["conversation"]["caller_id"] == "+15550001111"
+    assert len(remote["conversation"]["messages"]) == 1
+    assert sid in await worker_b.get_history(status="active")
+
+    worker_a.end_session(sid)
+    worker_a.store.flush()
+    assert sid in await worker_b.get_history(status="closed")
+    assert sid not in await worker_b.get_history(status="active")
+
+
+@pytest.mark.asyncio
+async def test_broadcast_reaches_other_workers_once(tmp_path):
+    path = str(tmp_path / "state.db")
+    worker_a = ConnectionManager(pubsub=SQLitePubSub(path))
+    worker_b = ConnectionManager(pubsub=SQLitePubSub(path))
+    sock_a, sock_b = FakeSocket(), FakeSocket()
+    await worker_a.connect(sock_a)
+    await worker_b.connect(sock_b)
+
+    await worker_a.broadcast({"type": "transcript", "transcript": "hello"})
+    await asyncio.sleep(0)
+    assert sock_a.sent == [{"type": "transcript", "transcript": "hello"}]
+    assert sock_b.sent == []
+
+    assert await worker_b.pubsub.poll_once() == 1
+    assert await worker_a.pubsub.poll_once() == 0   # own events are not echoed back
+    await asyncio.sleep(0)
+    assert sock_b.sent == [{"type": "transcript", "transcript": "hello"}]
+    assert len(sock_a.sent) == 1
+
+
+def test_saves_coalesce_and_only_write_new_messages(tmp_path):
+    store = SQLiteSessionStore(str(tmp_path / "state.db"), write_behind=0.5)
+    manager = ConversationManager(store=store)
+    sid = manager.start_session("+15550001111")
+    for i in range(3):
+        manager.add_message(sid, {"transcript": f"turn {i}"})
+    store.flush()
+
+    entry = {"transcript": "turn 3"}
+    manager.add_message(sid, entry)
+    entry["latency_ms"] = 900.0   # updated after add_message, as turn timing does
+    manager._persist(sid)
+    queued = store._pending[sid]["messages"]
+    assert sorted(queued) == [2, 3]
+    store.flush()
+
+    loaded = SQLiteSessionStore(str(tmp_path / "state.db")).load(sid)
+    assert [m["transcript"] for m in loaded["messages"]] == ["turn 0", "turn 1", "turn 2", "turn 3"]
+    assert loaded["messages"][-1]["latency_ms"] == 900.0
+    assert loaded["caller_id"] == "+15550001111"
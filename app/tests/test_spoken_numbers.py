@@ -0,0 +1,58 @@
+import pytest
+
+from app.services.intent_matcher import analyze
+from app.utils.parsers import extract_phone
+from app.utils.spoken_numbers import normalize_spoken_numbers
+
+
+@pytest.mark.parametrize("said, language, expected", [
+    ("my number is five five five, one two three, four five six seven.", "en",
+     "my number is 5551234567."),
+    ("it's five oh one, double four, triple six two", "en", "it's 501446662"),
+    ("eight hundred, five five five, twelve thirty four", "en", "8005551234"),
+    ("call 555 one two one two please", "en", "call 5551212 please"),
+    ("five-oh-one, four four four, fifty five sixty six and thanks", "en", "5014445566 and thanks"),
+    ("mi número es cinco cinco cinco, doce treinta y cuatro, cero nueve", "es",
+     "mi número es 555123409"),
+    ("doble cinco, ocho, siete siete, uno dos tres", "es", "55877123"),
+])
+def test_dictated_numbers_become_digits(said, language, expected):
+    assert normalize_spoken_numbers(said, language) == expected
+
+
+@pytest.mark.parametrize("said, language", [
+    ("Oh, I have two kids and need twenty hours a week", "en"),
+    ("we need twenty four seven care", "en"),
+    ("I called once two weeks ago", "en"),
+    ("fui una vez y dos veces", "es"),
+    ("Oh okay", "en"),
+    ("I have one, two, three kids", "en"),
+    ("I can work five six seven days", "en"),
+    ("five five five one two three four five six seven eight nine", "en"),
+])
+def test_ordinary_numbers_are_left_alone(said, language):
+    assert normalize_spoken_numbers(said, language) == said
+
+
+def test_dictated_phone_is_captured():
+    said = "sure, it's five oh one four four four five five six six"
+    assert extract_phone(normalize_spoken_numbers(said, "en")) == "5014445566"
+    assert analyze(said).phone == "501-444-5566"
+    assert analyze("es el cinco cinco cinco, uno dos tres, cuatro cinco seis siete", "es").phone == "555-123-4567"
+    assert analyze("I have one, two, three kids").phone is None
+
+
+@pytest.mark.parametrize("said, language", [
+    ("five five five one two three four five six seven, two kids", "en"),
+    ("five five five one two three four five six seven. one more thing", "en"),
+    ("five five five, one two three, four five six seven, and three days a week", "en"),
+    ("I called once, five five five one two three four five six seven", "en"),
+    ("cinco cinco cinco uno dos tres cuatro cinco seis siete, dos niños", "es"),
+])
+def test_phone_followed_or_preceded_by_number_words(said, language):
+    assert analyze(said, language).phone == "555-123-4567"
+
+
+def test_overlong_run_keeps_longest_phone_prefix():
+    said = "five five five, one two three, four five six seven, two kids"
+    assert normalize_spoken_numbers(said, "en") == "5551234567, two kids"
@@ -0,0 +1,101 @@
+import httpx
+import pytest
+
+from app import sync_applicants
+from app.sync_applicants import ApplicantSync, Checkpoint, HashIndex, PAGE_SIZE
+
+TOTAL = 5 * PAGE_SIZE + 37
+
+
+class FakeApplicantsDB:
+    def __init__(self):
+        self.rows = {}
+        self.upserts = 0
+
+    def table(self, name):
+        return self
+
+    def upsert(self, rows, on_conflict):
+        self._rows = rows
+        return self
+
+    def execute(self):
+        self.upserts += 1
+        self.rows.update((r["id"], r) for r in self._rows)
+
+
+class AxisCare:
+    def __init__(self, fail_offsets=()):
+        self.fail_offsets = set(fail_offsets)
+        self.requested = []
+
+    def __call__(self, request):
+        offset = int(request.url.params["offset"])
+        self.requested.append(offset)
+        if offset in self.fail_offsets:
+            self.fail_offsets.discard(offset)
+            return httpx.Response(400, json={"error": "bad gateway config"})
+        ids = range(offset + 1, min(offset + PAGE_SIZE, TOTAL) + 1)
+        return httpx.Response(200, json={"results": [{"id": i, "status": {"active": True}} for i in ids]})
+
+
+async def _run(axis, db, checkpoint, hashes=None):
+    hashes = hashes if hashes is not None else HashIndex(str(checkpoint.path) + ".hashes.db")
+    async with httpx.AsyncClient(transport=httpx.MockTransport(axis)) as http:
+        sync = ApplicantSync(http, db=db, checkpoint=checkpoint, hashes=hashes, concurrency=2, rate_per_s=1000)
+        return await sync.run()
+
+
+@pytest.mark.asyncio
+async def test_sync_resumes_from_last_committed_window(tmp_path, monkeypatch):
+    monkeypatch.setattr(sync_applicants, "get_updated_since", lambda db: "2025-01-01T00:00:00+00:00")
+    checkpoint = Checkpoint(str(tmp_path / "cp.json"))
+    db = FakeApplicantsDB()
+
+    axis = AxisCare(fail_offsets={3 * PAGE_SIZE})
+    with pytest.raises(httpx.HTTPStatusError):
+        await _run(axis, db, checkpoint)
+    assert checkpoint.load()["next_offset"] == 2 * PAGE_SIZE
+    assert len(db.rows) == 2 * PAGE_SIZE
+
+    axis = AxisCare()
+    stats = await _run(axis, db, checkpoint)
+    assert min(axis.requested) == 2 * PAGE_SIZE          # committed pages are not refetched
+    assert len(db.rows) == TOTAL
+    assert stats["upserted"] == TOTAL - 2 * PAGE_SIZE
+
+    state = checkpoint.load()
+    assert state["next_offset"] is None and state["updated_since"] > "2025-01-01"
+
+
+@pytest.mark.asyncio
+async def test_transient_errors_are_retried(tmp_path, monkeypatch):
+    monkeypatch.setattr(sync_applicants, "get_updated_since", lambda db: "2025-01-01T00:00:00+00:00")
+    calls = {"n": 0}
+
+    def flaky(request):
+        calls["n"] += 1
+        if calls["n"] == 1:
+            return httpx.Response(503, headers={"Retry-After": "0"})
+        return httpx.Response(200, json=[{"id": 1, "status": {}}])
+
+    db = FakeApplicantsDB()
+    stats = await _run(flaky, db, Checkpoint(str(tmp_path / "cp.json")))
+    assert stats["retries"] == 1 and list(db.rows) == ["1"]
+
+
+@pytest.mark.asyncio
+async def test_unchanged_rows_are_not_rewritten(tmp_path, monkeypatch):
+    monkeypatch.setattr(sync_applicants, "get_updated_since", lambda db: "2025-01-01T00:00:00+00:00")
+    checkpoint = Checkpoint(str(tmp_path / "cp.json"))
+    hashes = HashIndex(str(tmp_path / "hashes.db"))
+    db = FakeApplicantsDB()
+
+    first = await _run(AxisCare(), db, checkpoint, hashes)
+    assert first["inserted"] == TOTAL and first["skipped"] == 0
+
+    db.rows.clear()
+    checkpoint.save({})
+    second = await _run(AxisCare(), db, checkpoint, hashes)
+    assert second["fetched"] == TOTAL and second["skipped"] == TOTAL
+    assert second["upserted"] == 0 and not db.rows
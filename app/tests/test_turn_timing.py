@@ -0,0 +1,68 @@
+import time
+
+from app.core.metrics import Histogram
+from app.services import turn_timing
+from app.services.conversation_manager import ConversationManager
+
+
+def test_histogram_renders_cumulative_buckets():
+    h = Histogram("test_seconds", "Test.", ["stage"], buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.7, 3.0):
+        h.observe(value, stage="tts")
+
+    lines = h.render()
+    assert lines[:2] == ["# HELP test_seconds Test.", "# TYPE test_seconds histogram"]
+    assert 'test_seconds_bucket{stage="tts",le="0.1"} 1' in lines
+    assert 'test_seconds_bucket{stage="tts",le="1.0"} 3' in lines
+    assert 'test_seconds_bucket{stage="tts",le="+Inf"} 4' in lines
+    assert 'test_seconds_sum{stage="tts"} 4.25' in lines
+    assert 'test_seconds_count{stage="tts"} 4' in lines
+
+
+def test_groq_split_adds_up_to_wall_time():
+    trace = turn_timing.TurnTrace()
+    submitted = time.monotonic()
+    timings = {"started": submitted + 0.05, "queue_s": 0.1, "server_queue_s": 0.02, "generation_s": 0.3}
+    trace.add_groq(submitted, submitted + 0.6, timings)
+
+    assert round(trace.spans["groq_queue"], 3) == 170.0
+    assert round(trace.spans["groq_generation"], 3) == 300.0
+    assert round(trace.spans["groq_network"], 3) == 130.0
+
+
+def test_groq_split_never_exceeds_wall_time():
+    trace = turn_timing.TurnTrace()
+    trace.add_groq(0.0, 0.2, {"queue_s": 0.5, "generation_s": 1.0})
+    assert sum(trace.spans.values()) == 200.0
+    assert trace.spans["groq_generation"] == 0.0
+
+
+def test_finish_includes_stt_from_speech_end():
+    trace = turn_timing.start_turn(time.monotonic() - 0.25)
+    assert turn_timing.current_turn() is trace
+    trace.add("tts", 120)
+
+    timings = trace.finish()
+    assert timings["stt_ms"] >= 250
+    assert timings["tts_ms"] == 120
+    assert timings["total_ms"] >= timings["stt_ms"]
+    assert "servoice_turn_seconds_count" in turn_timing.registry.render()
+
+
+def test_record_turn_timing_summarizes_session_without_extra_writes():
+    manager = ConversationManager()
+    sid = manager.start_session("+15555550100")
+    writes = []
+    manager._persist = writes.append
+    for total in (800.0, 1200.0):
+        entry = {"id": str(total), "transcript": "hi"}
+        manager.add_message(sid, entry)
+        manager.record_turn_timing(sid, entry, {"tts_ms": 100.0, "total_ms": total})
+
+    assert entry["latency_ms"] == 1200.0
+    assert entry["metadata"]["timings"]["total_ms"] == 1200.0
+    latency = manager.sessions[sid]["metadata"]["latency"]
+    assert latency["turns"] == 2
+    assert latency["total_ms"] == {"avg": 1000.0, "p50": 1200.0, "p95": 1200.0, "max": 1200.0}
+    assert "groq_queue_ms" not in latency
+    assert writes == [sid, sid]                 # one per add_message, none for the timings
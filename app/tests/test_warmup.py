@@ -0,0 +1,98 @@
+import asyncio
+
+import pytest
+
+from app.services import warmup
+from app.services.tenant_directory import TenantDirectory
+
+
+class FakePhoneNumbers:
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = 0
+
+    def table(self, name):
+        self.filters = {}
+        return self
+
+    def select(self, *_):
+        return self
+
+    def eq(self, column, value):
+        self.filters[column] = value
+        return self
+
+    def execute(self):
+        self.queries += 1
+        rows = [r for r in self.rows if all(r.get(k) == v for k, v in self.filters.items())]
+        return type("Result", (), {"data": rows})()
+
+
+def test_tenant_directory_serves_lines_from_memory():
+    db = FakePhoneNumbers([
+        {"id": "p1", "company_id": "c1", "office_id": "o1", "e164": "+15550001111"},
+        {"id": "p2", "company_id": "c1", "office_id": "o2", "e164": "+15550002222"},
+    ])
+    directory = TenantDirectory(client=db)
+    assert directory.load_all() == 2
+    assert directory.lookup("+15550002222")["office_id"] == "o2"
+    assert db.queries == 1
+    assert sorted(t["office_id"] for t in directory.tenants()) == ["o1", "o2"]
+
+    db.rows.append({"id": "p3", "company_id": "c2", "office_id": "o3", "e164": "+15550003333"})
+    assert directory.lookup("+15550003333")["company_id"] == "c2"   # miss falls back to the DB once
+    assert directory.lookup("+15550003333")["company_id"] == "c2"
+    assert db.queries == 2
+
+
+
+@pytest.mark.asyncio
+async def test_tenant_directory_reloads_moved_and_deleted_lines():
+    db = FakePhoneNumbers([
+        {"id": "p1", "company_id": "c1", "office_id": "o1", "e164": "+15550001111"},
+        {"id": "p2", "company_id": "c1", "office_id": "o2", "e164": "+15550002222"},
+    ])
+    directory = TenantDirectory(client=db, ttl=0.05)
+    directory.load_all()
+    assert (await directory.lookup_async("+15550001111"))["office_id"] == "o1"
+
+    db.rows[0] = {**db.rows[0], "office_id": "o9"}   # line moved to another office
+    del db.rows[1]                     # line deleted
+    assert (await directory.lookup_async("+15550001111"))["office_id"] == "o1"   # still fresh
+    await asyncio.sleep(0.06)
+    await directory.lookup_async("+15550001111")   # past the TTL: one background reload
+    await directory._reload
+
+    assert (await directory.lookup_async("+15550001111"))["office_id"] == "o9"
+    assert await directory.lookup_async("+15550002222") is None
+
+@pytest.mark.asyncio
+async def test_warmup_flips_ready_even_when_degraded(monkeypatch):
+    monkeypatch.setattr(warmup, "warmup_state", warmup.WarmupState())
+    calls = []
+
+    async def ok():
+        calls.append("ok")
+        return 3
+
+    async def boom():
+        raise RuntimeError("deepgram unavailable")
+
+    async def hang():
+        await asyncio.sleep(10)
+
+    monkeypatch.setattr(warmup, "_load_tenants", ok)
+    monkeypatch.setattr(warmup, "_load_configs", ok)
+    monkeypatch.setattr(warmup, "_render_prompts", ok)
+    monkeypatch.setattr(warmup, "_synthesize_greeting", boom)
+    monkeypatch.setattr(warmup, "_warm_groq", hang)
+
+    assert not warmup.warmup_state.ready
+    await warmup.run_warmup(timeout=0.2)
+
+    state = warmup.warmup_state.snapshot()
+    assert state["ready"]
+    assert calls == ["ok", "ok", "ok"]
+    assert state["steps"]["system_prompts"]["ok"]
+    assert not state["steps"]["greeting_audio"]["ok"]
+    assert "groq_connections" not in state["steps"]
@@ -0,0 +1,85 @@
+import asyncio
+
+import pytest
+
+msgpack = pytest.importorskip("msgpack")
+
+from app.core.connection_manager import ConnectionManager
+from app.core.pubsub import LocalPubSub
+from app.core.wire_format import BASE, FIELD_IDS, KEEP, SEQ, SID
+
+
+class BinarySocket:
+    def __init__(self):
+        self.frames = []
+
+    async def accept(self, subprotocol=None):
+        self.subprotocol = subprotocol
+
+    async def send_bytes(self, data):
+        self.frames.append(msgpack.unpackb(data, strict_map_key=False))
+
+
+def decode(frames):
+    """Minimal client: rebuild interim text from deltas, map field ids back to names."""
+    names = {i: name for i, name in enumerate(frames[0]["fields"])}
+    texts, out = {}, []
+    for frame in frames[1:]:
+        sid = frame.get(SID)
+        text = frame.get(FIELD_IDS["transcript"])
+        if KEEP in frame:
+            assert texts[sid][0] == frame[BASE]
+            text = texts[sid][1][:frame[KEEP]] + text
+        if SEQ in frame:
+            texts[sid] = (frame[SEQ], text)
+        msg = {names.get(k, k): v for k, v in frame.items() if k not in (SID, SEQ, BASE, KEEP)}
+        if text is not None:
+            msg["transcript"] = text
+        out.append(msg)
+    return out
+
+
+@pytest.mark.asyncio
+async def test_compact_stream_uses_ids_deltas_and_drops_duplicates():
+    manager = ConnectionManager(pubsub=LocalPubSub())
+    sock = BinarySocket()
+    await manager.connect(sock, compact=True, subprotocol="servoice.msgpack.v1")
+
+    for text in ("my mom", "my mom needs", "my mom needs help"):
+        await manager.broadcast({"type": "transcript", "session_id": "s1", "transcript": text, "is_final": False})
+    await manager.broadcast({
+        "type": "message", "session_id": "s1", "transcript": "my mom needs help",
+        "ai_response": "Of course.", "ai_response_translated": "Of course.", "audio_id": None,
+    })
+    await asyncio.sleep(0)
+
+    assert sock.frames[0]["type"] == "hello"
+    assert sock.frames[1][FIELD_IDS["session_id"]] == "s1"          # announced once
+    delta = sock.frames[3]
+    assert delta[KEEP] == len("my mom") and delta[FIELD_IDS["transcript"]] == " needs"
+    final = sock.frames[-1]
+    assert FIELD_IDS["ai_response_translated"] not in final
+    assert FIELD_IDS["audio_id"] not in final
+
+    decoded = decode(sock.frames)
+    assert [m["transcript"] for m in decoded[1:]] == [
+        "my mom", "my mom needs", "my mom needs help", "my mom needs help",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_dropped_interim_falls_back_to_full_frame():
+    manager = ConnectionManager(pubsub=LocalPubSub())
+    sock = BinarySocket()
+    await manager.connect(sock, compact=True)
+    sub = manager.subscribers[sock]
+    sub.maxsize = 1
+    sub.task.cancel()          # stall the writer so the queue overflows
+
+    for text in ("a", "ab", "abc"):
+        await manager.broadcast({"type": "transcript", "session_id": "s1", "transcript": text, "is_final": False})
+    assert len(sub.queue) == 1
+    await sub._send(sub.queue.popleft())
+
+    frame = sock.frames[-1]
+    assert KEEP not in frame and frame[FIELD_IDS["transcript"]] == "abc"
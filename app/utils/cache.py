@@ -0,0 +1,113 @@
+# cache.py - Bounded LRU cache with per-entry TTL and hit/miss counters
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+
+@dataclass
+class CacheEntry:
+    value: Any
+    stored_at: float
+    expires_at: float
+    negative: bool = False   # cached "not found" result
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.stored_at
+
+
+class LRUTTLCache:
+    """
+    Size-bounded LRU map whose entries also expire after a TTL.
+
+    Expired entries are dropped lazily on access; the least recently used
+    entry is evicted when `maxsize` is exceeded. Negative results can be
+    stored with their own (usually shorter) TTL.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 600.0, negative_ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._data: "OrderedDict[Hashable, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get_entry(self, key: Hashable) -> Optional[CacheEntry]:
+        """Return the live entry for key (refreshing its recency), or None."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if time.monotonic() >= entry.expires_at:
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self.get_entry(key)
+        return default if entry is None or entry.negative else entry.value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        self._store(key, value, self.ttl if ttl is None else ttl, negative=False)
+
+    def set_negative(self, key: Hashable, ttl: Optional[float] = None):
+        """Remember that key has no value, so repeated lookups skip the backend."""
+        self._store(key, None, self.negative_ttl if ttl is None else ttl, negative=True)
+
+    def invalidate(self, key: Hashable) -> bool:
+        with self._lock:
+            return self._data.pop(key, None) is not None
+
+    def invalidate_where(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Drop every key matching predicate; returns how many were removed."""
+        with self._lock:
+            doomed = [k for k in self._data if predicate(k)]
+            for k in doomed:
+                del self._data[k]
+            return len(doomed)
+
+    def keys(self) -> List[Hashable]:
+        """Snapshot of cached keys (including ones not yet lazily expired)."""
+        with self._lock:
+            return list(self._data)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+    def _store(self, key: Hashable, value: Any, ttl: float, negative: bool):
+        now = time.monotonic()
+        with self._lock:
+            self._data[key] = CacheEntry(value, now, now + ttl, negative)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
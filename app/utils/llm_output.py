@@ -0,0 +1,141 @@
+# llm_output.py - Parsing and cleanup of LLM chat completion output
+
+import json
+import re
+from typing import Any, Dict, Iterable, List, Optional
+
+# Formal openers the model likes to prepend ("Perfect! —", "Got it—", ...).
+# Matched repeatedly at the start of the response, in any order.
+_LEADING_FILLER = (
+    r"(?:Perfecto?\b[.!]*\s*[\-—]?\s*"
+    r"|Got it[\-—]\s*"
+    r"|Entendido[\-—]\s*"
+    r"|Thank you for that information\.?\s*"
+    r"|Gracias por esa información\.?\s*)+"
+)
+
+_LEADING_FILLER_RE = re.compile(rf"^{_LEADING_FILLER}")
+_FILLER_OPENERS = ("Perfect", "Got it", "Entendido", "Thank you for that", "Gracias por esa")
+
+# Filler fragments removed anywhere in the response
+_INLINE_FILLER_RE = re.compile(r"Perfect - |Perfect\. |Got it[\-—]\s*|Entendido[\-—]\s*")
+_INLINE_FILLER_WORDS = ("Perfect", "Got it", "Entendido")
+
+# Characters that can change JSON nesting state; everything else is skipped
+_STRUCTURAL_RE = re.compile(r'[{}"\\]')
+_DECODER = json.JSONDecoder()
+
+
+def normalize_ai_response(text: str) -> str:
+    """
+    Drop leading formal filler, collapse whitespace and capitalize the first
+    letter. The filler regex only runs when the reply opens with a known
+    opener, so the common case is a single split/join over the text.
+    """
+    if not text:
+        return ""
+    if text.startswith(_FILLER_OPENERS):
+        text = _LEADING_FILLER_RE.sub("", text, count=1)
+    cleaned = " ".join(text.split())
+    return cleaned[:1].upper() + cleaned[1:]
+
+
+def strip_inline_fillers(text: str) -> str:
+    """Remove filler fragments ("Perfect - ", "Got it—") wherever they appear."""
+    if not text or not any(word in text for word in _INLINE_FILLER_WORDS):
+        return text or ""
+    return _INLINE_FILLER_RE.sub("", text)
+
+
+class JSONObjectExtractor:
+    """
+    Incremental extractor for top-level JSON objects embedded in text.
+
+    Feed it chunks as they arrive (streamed completions) or the whole output
+    at once. It tracks brace depth outside of string literals, so it never
+    rescans text it has already seen and is not fooled by braces in prose
+    after the object, unlike a greedy ``{.*}`` search.
+    """
+
+    def __init__(self):
+        self._buffer: List[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False  # previous chunk ended on a backslash inside a string
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        """Consume a chunk and return any objects completed by it."""
+        found = []
+        start = 0 if self._depth else None
+        # A backslash that ended the previous chunk escapes this chunk's first char
+        skip = 0 if self._escaped else -1
+        self._escaped = False
+
+        for match in _STRUCTURAL_RE.finditer(chunk):
+            i = match.start()
+            if i == skip:
+                continue
+            ch = match.group()
+
+            if self._depth == 0:
+                if ch == "{":
+                    self._depth = 1
+                    start = i
+                continue
+
+            if self._in_string:
+                if ch == "\\":
+                    skip = i + 1
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch == "{":
+                self._depth += 1
+            elif ch == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._buffer.append(chunk[start:i + 1])
+                    candidate = "".join(self._buffer)
+                    self._buffer = []
+                    start = None
+                    try:
+                        parsed = json.loads(candidate)
+                    except json.JSONDecodeError:
+                        continue
+                    if isinstance(parsed, dict):
+                        found.append(parsed)
+
+        if skip == len(chunk):
+            self._escaped = True
+        if self._depth and start is not None:
+            self._buffer.append(chunk[start:])
+        return found
+
+
+def iter_json_objects(chunks: Iterable[str]):
+    """Yield JSON objects from an iterable of streamed text chunks."""
+    extractor = JSONObjectExtractor()
+    for chunk in chunks:
+        yield from extractor.feed(chunk)
+
+
+def extract_json_object(text: str) -> Optional[Dict[str, Any]]:
+    """
+    Return the first JSON object in a complete reply. Decodes straight from
+    each candidate "{" with the C decoder, so trailing prose (even prose with
+    braces) is ignored; use JSONObjectExtractor for streamed output.
+    """
+    if not text:
+        return None
+    start = text.find("{")
+    while start != -1:
+        try:
+            parsed, _ = _DECODER.raw_decode(text, start)
+        except json.JSONDecodeError:
+            start = text.find("{", start + 1)
+            continue
+        if isinstance(parsed, dict):
+            return parsed
+        start = text.find("{", start + 1)
+    return None
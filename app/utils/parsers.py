@@ -1,69 +1,216 @@
 # parsers.py - Enhanced version
+#
+# Patterns are compiled once, and smart_extract_info() prepares the text a
+# single time for every extractor. For ASCII transcripts, cheap substring
+# checks on the lowered text skip patterns that cannot match, and the rest
+# run case-sensitively on the lowered text (several times faster than
+# IGNORECASE) with groups sliced back out of the original. Pattern order and
+# precedence are unchanged, so the output is the same as running each
+# pattern in turn (that version is kept in app/benchmarks/bench_parsers.py).
 
 import re
 from typing import Optional, List
 
+# ---------- Patterns ----------
+
+_PHONE_NOISE = re.compile(r'\b(phone|number|call|contact|reach|at)\b')
+# US format with optional +1. Every match is 10 digits (11 with the leading 1),
+# which also makes the stricter XXX-XXX-XXXX / 10-digit patterns redundant.
+_PHONE = re.compile(r'(\+?1[-.\s]?)?(\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4})')
+_PHONE_SPACED = re.compile(r'(\(?\d{3}\)?)\s*(\d{3})\s*(\d{4})')    # (XXX)  XXX  XXXX
+_NON_DIGIT = re.compile(r'\D')
+_ANY_DIGIT = re.compile(r'[0-9]')
+
+
+class _Pattern:
+    """
+    A case-insensitive pattern plus its fast form for ASCII text: the same
+    regex, case-sensitive, run on the lowered text. Only valid for patterns
+    written in lowercase whose letter classes are [A-Z]/[a-z].
+    """
+    __slots__ = ("words", "exact", "fast")
+
+    def __init__(self, pattern: str, words=()):
+        self.words = words   # one of these must occur in the lowered text
+        self.exact = re.compile(pattern, re.IGNORECASE)
+        self.fast = re.compile(pattern.replace("[A-Z]", "[a-z]"))
+
+
+_NAME = r"([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)"
+# (substrings one of which must be present, pattern), in priority order
+_NAME_PATTERNS = (
+    # Direct statements
+    _Pattern(r"(?:my name is|i am|this is|i'm|im)\s+" + _NAME, ("my name is", "i am", "this is", "i'm", "im")),
+    # Possessive forms
+    _Pattern(r"(?:my name's|name's)\s+" + _NAME, ("name's",)),
+    # Application context
+    _Pattern(r"(?:applied as|application for|under the name)\s+" + _NAME,
+             ("applied as", "application for", "under the name")),
+    # General capitalized names (be careful with this one)
+    _Pattern(r"\b([A-Z][a-z]+\s+[A-Z][a-z]+)\b"),
+)
+
+_NON_NAMES = {
+    'help', 'please', 'thank', 'thanks', 'hello', 'hi', 'yes', 'no',
+    'okay', 'ok', 'sure', 'application', 'status', 'job', 'position',
+    'phone', 'number', 'email', 'address', 'today', 'yesterday',
+    'monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday'
+}
+
+_TITLES = ('nurse', 'doctor', 'assistant', 'manager', 'supervisor', 'coordinator', 'technician', 'aide')
+_WEEKDAYS = ('monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday')
+
+_POSITION_PATTERNS = (
+    _Pattern(r"(?:applied for|position|job|role)\s+([a-zA-Z\s]+?)(?:\s|$|\.)",
+             ("applied for", "position", "job", "role")),
+    # No title starts inside "the ", so an optional "the " prefix never changes the group
+    _Pattern(r"(" + "|".join(_TITLES) + ")", _TITLES),
+)
+_TIMEFRAME_PATTERNS = (
+    _Pattern(r"(yesterday|today|tomorrow|this week|last week|next week)",
+             ("yesterday", "today", "tomorrow", "this week", "last week", "next week")),
+    _Pattern(r"(\d+\s+(?:days?|weeks?|months?)\s+ago)", ("ago",)),
+    _Pattern(r"(" + "|".join(_WEEKDAYS) + ")", _WEEKDAYS),
+)
+_CONTACT_PHONE = _Pattern(r'\b(?:call|phone|text)\b', ("call", "phone", "text"))
+_CONTACT_EMAIL = _Pattern(r'\b(?:email|mail)\b', ("mail",))
+
+_URGENCY_WORDS = ['urgent', 'asap', 'immediately', 'soon', 'quickly', 'emergency']
+_NAME_INDICATORS = ['my name is', 'i am', 'this is', 'i\'m']
+_JOB_KEYWORDS = ['application', 'applied', 'job', 'position', 'status', 'interview', 'hiring']
+_CONFIDENT_PHONE = re.compile(r'\d{3}[-.\s]?\d{3}[-.\s]?\d{4}')
+_TEN_DIGITS = re.compile(r'\d{10}')
+_CAPITALIZED_PAIR = re.compile(r'\b[A-Z][a-z]+\s+[A-Z][a-z]+\b')
+
+
+class _Text:
+    """A transcript prepared once for every extractor."""
+    __slots__ = ("raw", "lower", "ascii", "first_digit")
+
+    def __init__(self, raw: str):
+        self.raw = raw
+        self.lower = raw.lower()
+        # The fast path is exact only for ASCII: IGNORECASE also folds a few
+        # non-ASCII letters onto ASCII ones (e.g. 'ſ' matches 's'), and
+        # lower() can change the length of non-ASCII text.
+        self.ascii = raw.isascii()
+        # Every phone pattern needs a digit: start scanning at the first one
+        digit = _ANY_DIGIT.search(raw) if self.ascii else None
+        self.first_digit = digit.start() if digit else (0 if not self.ascii else None)
+
+    @property
+    def has_digit(self) -> bool:
+        return self.first_digit is not None
+
+    def search(self, pattern: _Pattern):
+        if not self.ascii:
+            return pattern.exact.search(self.raw)
+        if pattern.words and not any(word in self.lower for word in pattern.words):
+            return None
+        return pattern.fast.search(self.lower)
+
+    def group(self, match) -> str:
+        # Fast-path matches ran on the lowered text; same offsets in the original
+        return self.raw[match.start(1):match.end(1)] if self.ascii else match.group(1)
+
+
+def _first_group(t: _Text, patterns) -> Optional[str]:
+    for pattern in patterns:
+        match = t.search(pattern)
+        if match:
+            return t.group(match)
+    return None
+
+
+# ---------- Extractors ----------
+
+def _phone(t: _Text) -> Optional[str]:
+    if not t.has_digit:
+        return None
+    # A match starts at most one char ('+' or '(') before its first digit, and
+    # a noise word touching a digit is never removed (no \b between them),
+    # so the text before that point can be dropped.
+    # Remove common words that might interfere
+    cleaned_text = _PHONE_NOISE.sub('', t.lower[max(0, t.first_digit - 1):])
+    match = _PHONE.search(cleaned_text) or _PHONE_SPACED.search(cleaned_text)
+    if not match:
+        return None
+    phone_digits = _NON_DIGIT.sub('', match.group())
+    # Handle US numbers (remove leading 1 if present)
+    if len(phone_digits) == 11 and phone_digits.startswith('1'):
+        phone_digits = phone_digits[1:]
+    return phone_digits if len(phone_digits) == 10 else None
+
+
+def _name(t: _Text) -> Optional[str]:
+    for pattern in _NAME_PATTERNS:
+        match = t.search(pattern)
+        if match:
+            potential_name = t.group(match).strip()
+            if _is_valid_name(potential_name):
+                return potential_name
+    return None
+
+
+def _context(t: _Text) -> dict:
+    position = _first_group(t, _POSITION_PATTERNS)
+    if t.search(_CONTACT_PHONE):
+        contact_preference = 'phone'
+    elif t.search(_CONTACT_EMAIL):
+        contact_preference = 'email'
+    else:
+        contact_preference = None
+    return {
+        'position_mentioned': position.strip() if position is not None else None,
+        'urgency_indicators': [word for word in _URGENCY_WORDS if word in t.lower],
+        'timeframe_mentioned': _first_group(t, _TIMEFRAME_PATTERNS),
+        'contact_preference': contact_preference,
+    }
+
+
+def _confidence(t: _Text) -> dict:
+    confidence = {
+        'has_phone': 0.0,
+        'has_name': 0.0,
+        'is_job_inquiry': 0.0
+    }
+
+    # Phone confidence
+    if t.has_digit and _CONFIDENT_PHONE.search(t.raw, t.first_digit):
+        confidence['has_phone'] = 0.9
+    elif t.has_digit and _TEN_DIGITS.search(t.raw, t.first_digit):
+        confidence['has_phone'] = 0.8
+    elif t.has_digit if t.ascii else any(char.isdigit() for char in t.raw):
+        confidence['has_phone'] = 0.3
+
+    # Name confidence
+    if any(indicator in t.lower for indicator in _NAME_INDICATORS):
+        confidence['has_name'] = 0.8
+    elif (not t.ascii or t.raw != t.lower) and _CAPITALIZED_PAIR.search(t.raw):
+        confidence['has_name'] = 0.6
+
+    # Job inquiry confidence
+    keyword_count = sum(1 for keyword in _JOB_KEYWORDS if keyword in t.lower)
+    confidence['is_job_inquiry'] = min(keyword_count * 0.3, 1.0)
+
+    return confidence
+
+
+# ---------- Public API ----------
+
 def extract_phone(text: str) -> Optional[str]:
     """
     Enhanced phone number extraction with better pattern matching.
     Accepts various formats and returns normalized digits-only format.
     """
-    # Remove common words that might interfere
-    cleaned_text = re.sub(r'\b(phone|number|call|contact|reach|at)\b', '', text.lower())
-    
-    # Comprehensive phone pattern
-    phone_patterns = [
-        r'(\+?1[-.\s]?)?(\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4})',  # US format with optional +1
-        r'(\d{3})[-.\s]?(\d{3})[-.\s]?(\d{4})',  # XXX-XXX-XXXX or similar
-        r'(\(?\d{3}\)?)\s*(\d{3})\s*(\d{4})',    # (XXX) XXX XXXX
-        r'\b(\d{10})\b',                         # 10 digits together
-    ]
-    
-    for pattern in phone_patterns:
-        matches = re.finditer(pattern, cleaned_text)
-        for match in matches:
-            # Extract all digits
-            phone_digits = re.sub(r'\D', '', match.group())
-            
-            # Handle US numbers (remove leading 1 if present)
-            if len(phone_digits) == 11 and phone_digits.startswith('1'):
-                phone_digits = phone_digits[1:]
-            
-            # Validate length
-            if len(phone_digits) == 10:
-                return phone_digits
-    
-    return None
+    return _phone(_Text(text))
 
 
 def extract_name(text: str) -> Optional[str]:
     """
     Enhanced name extraction with multiple patterns and validation.
     """
-    # Clean the text - remove common filler words
-    cleaned_text = re.sub(r'\b(um|uh|like|you know|well)\b', '', text, flags=re.IGNORECASE)
-    
-    name_patterns = [
-        # Direct statements
-        r"(?:my name is|i am|this is|i'm|im)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)",
-        # Possessive forms
-        r"(?:my name's|name's)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)",
-        # Application context
-        r"(?:applied as|application for|under the name)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)",
-        # General capitalized names (be careful with this one)
-        r"\b([A-Z][a-z]+\s+[A-Z][a-z]+)\b"
-    ]
-    
-    for pattern in name_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            potential_name = match.group(1).strip()
-            
-            # Validate the extracted name
-            if _is_valid_name(potential_name):
-                return potential_name
-    
-    return None
+    return _name(_Text(text))
 
 
 def _is_valid_name(name: str) -> bool:
@@ -73,23 +220,15 @@ def _is_valid_name(name: str) -> bool:
     # Basic checks
     if not name or len(name.split()) > 4:  # Too many words
         return False
-    
-    # Common words that aren't names
-    non_names = {
-        'help', 'please', 'thank', 'thanks', 'hello', 'hi', 'yes', 'no',
-        'okay', 'ok', 'sure', 'application', 'status', 'job', 'position',
-        'phone', 'number', 'email', 'address', 'today', 'yesterday',
-        'monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday'
-    }
-    
+
     name_words = name.lower().split()
-    if any(word in non_names for word in name_words):
+    if any(word in _NON_NAMES for word in name_words):
         return False
-    
+
     # Should have at least 2 characters per word
     if any(len(word) < 2 for word in name_words):
         return False
-    
+
     return True
 
 
@@ -97,61 +236,21 @@ def extract_application_context(text: str) -> dict:
     """
     Extract additional context that might be relevant for job applications.
     """
-    context = {
-        'position_mentioned': None,
-        'urgency_indicators': [],
-        'timeframe_mentioned': None,
-        'contact_preference': None
-    }
-    
-    # Position/job titles
-    position_patterns = [
-        r"(?:applied for|position|job|role)\s+([a-zA-Z\s]+?)(?:\s|$|\.)",
-        r"(?:the\s+)?(nurse|doctor|assistant|manager|supervisor|coordinator|technician|aide)",
-    ]
-    
-    for pattern in position_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            context['position_mentioned'] = match.group(1).strip()
-            break
-    
-    # Urgency indicators
-    urgency_words = ['urgent', 'asap', 'immediately', 'soon', 'quickly', 'emergency']
-    context['urgency_indicators'] = [word for word in urgency_words if word in text.lower()]
-    
-    # Timeframe mentions
-    timeframe_patterns = [
-        r"(yesterday|today|tomorrow|this week|last week|next week)",
-        r"(\d+\s+(?:days?|weeks?|months?)\s+ago)",
-        r"(monday|tuesday|wednesday|thursday|friday|saturday|sunday)"
-    ]
-    
-    for pattern in timeframe_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            context['timeframe_mentioned'] = match.group(1)
-            break
-    
-    # Contact preference
-    if re.search(r'\b(?:call|phone|text)\b', text, re.IGNORECASE):
-        context['contact_preference'] = 'phone'
-    elif re.search(r'\b(?:email|mail)\b', text, re.IGNORECASE):
-        context['contact_preference'] = 'email'
-    
-    return context
+    return _context(_Text(text))
 
 
 def smart_extract_info(text: str) -> dict:
     """
     Smart extraction that combines all methods and provides confidence scores.
+    The text is prepared once and shared by every extractor.
     """
+    t = _Text(text)
     return {
-        'phone': extract_phone(text),
-        'name': extract_name(text),
-        'context': extract_application_context(text),
+        'phone': _phone(t),
+        'name': _name(t),
+        'context': _context(t),
         'original_text': text.strip(),
-        'confidence': _calculate_confidence(text)
+        'confidence': _confidence(t)
     }
 
 
@@ -159,30 +258,4 @@ def _calculate_confidence(text: str) -> dict:
     """
     Calculate confidence scores for different types of information.
     """
-    confidence = {
-        'has_phone': 0.0,
-        'has_name': 0.0,
-        'is_job_inquiry': 0.0
-    }
-    
-    # Phone confidence
-    if re.search(r'\d{3}[-.\s]?\d{3}[-.\s]?\d{4}', text):
-        confidence['has_phone'] = 0.9
-    elif re.search(r'\d{10}', text):
-        confidence['has_phone'] = 0.8
-    elif any(char.isdigit() for char in text):
-        confidence['has_phone'] = 0.3
-    
-    # Name confidence
-    name_indicators = ['my name is', 'i am', 'this is', 'i\'m']
-    if any(indicator in text.lower() for indicator in name_indicators):
-        confidence['has_name'] = 0.8
-    elif re.search(r'\b[A-Z][a-z]+\s+[A-Z][a-z]+\b', text):
-        confidence['has_name'] = 0.6
-    
-    # Job inquiry confidence
-    job_keywords = ['application', 'applied', 'job', 'position', 'status', 'interview', 'hiring']
-    keyword_count = sum(1 for keyword in job_keywords if keyword in text.lower())
-    confidence['is_job_inquiry'] = min(keyword_count * 0.3, 1.0)
-    
-    return confidence
\ No newline at end of file
+    return _confidence(_Text(text))
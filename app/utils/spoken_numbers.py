@@ -0,0 +1,189 @@
+# spoken_numbers.py - Spoken digits ("five five five, oh one two") → digit strings
+#
+# Deepgram's smart_format doesn't always turn a dictated phone number into
+# digits, and every phone pattern only matches digits. intent_matcher runs
+# this over a copy of each utterance for phone capture (the transcript
+# itself keeps the caller's words): one tokenizing pass, dictionary lookups,
+# and a small parser per run of number words. Only runs that come out as
+# 7-11 digits (a phone number, with or without area code / country code)
+# are rewritten, so "one, two, three kids", "five six seven days" or
+# "twenty four seven" stay as said. A run that is too long is cut back at its
+# last separator that leaves a phone ("..., four five six seven, two kids").
+
+import re
+from typing import Dict, List, Optional
+
+_UNITS_EN = {
+    "zero": 0, "one": 1, "two": 2, "three": 3, "four": 4,
+    "five": 5, "six": 6, "seven": 7, "eight": 8, "nine": 9,
+}
+_TEENS_EN = {
+    "ten": 10, "eleven": 11, "twelve": 12, "thirteen": 13, "fourteen": 14,
+    "fifteen": 15, "sixteen": 16, "seventeen": 17, "eighteen": 18, "nineteen": 19,
+}
+_TENS_EN = {
+    "twenty": 20, "thirty": 30, "forty": 40, "fifty": 50,
+    "sixty": 60, "seventy": 70, "eighty": 80, "ninety": 90,
+}
+_UNITS_ES = {
+    "cero": 0, "uno": 1, "una": 1, "dos": 2, "tres": 3, "cuatro": 4,
+    "cinco": 5, "seis": 6, "siete": 7, "ocho": 8, "nueve": 9,
+}
+_TEENS_ES = {
+    "diez": 10, "once": 11, "doce": 12, "trece": 13, "catorce": 14, "quince": 15,
+    "dieciséis": 16, "dieciseis": 16, "diecisiete": 17, "dieciocho": 18, "diecinueve": 19,
+    "veintiuno": 21, "veintiún": 21, "veintidós": 22, "veintidos": 22, "veintitrés": 23,
+    "veintitres": 23, "veinticuatro": 24, "veinticinco": 25, "veintiséis": 26,
+    "veintiseis": 26, "veintisiete": 27, "veintiocho": 28, "veintinueve": 29,
+}
+_TENS_ES = {
+    "veinte": 20, "treinta": 30, "cuarenta": 40, "cincuenta": 50,
+    "sesenta": 60, "setenta": 70, "ochenta": 80, "noventa": 90,
+}
+_HUNDREDS_ES = {
+    "cien": 100, "ciento": 100, "doscientos": 200, "trescientos": 300, "cuatrocientos": 400,
+    "quinientos": 500, "seiscientos": 600, "setecientos": 700, "ochocientos": 800, "novecientos": 900,
+}
+
+# token kinds
+UNIT, TEEN, TENS, HUNDREDS, HUNDRED, REPEAT, OH, JOIN = range(8)
+
+
+def _vocabulary(spanish: bool) -> Dict[str, tuple]:
+    vocab: Dict[str, tuple] = {}
+    for kind, table in ((UNIT, _UNITS_EN), (TEEN, _TEENS_EN), (TENS, _TENS_EN)):
+        vocab.update((word, (kind, value)) for word, value in table.items())
+    vocab.update({"hundred": (HUNDRED, 100), "double": (REPEAT, 2), "triple": (REPEAT, 3),
+                  "oh": (OH, 0), "and": (JOIN, 0)})
+    if spanish:
+        for kind, table in ((UNIT, _UNITS_ES), (TEEN, _TEENS_ES), (TENS, _TENS_ES), (HUNDREDS, _HUNDREDS_ES)):
+            vocab.update((word, (kind, value)) for word, value in table.items())
+        vocab.update({"doble": (REPEAT, 2), "y": (JOIN, 0)})
+    return vocab
+
+
+_VOCAB = {False: _vocabulary(False), True: _vocabulary(True)}
+_TOKEN = re.compile(r"\d+|[^\W\d_]+|\s+|[^\w\s]")
+_RUN_SEPARATORS = frozenset(",-.")
+_MIN_DIGITS = 7
+_MAX_DIGITS = 11
+
+
+def _tail(words: List[tuple], i: int, after_hundred: bool):
+    """Value below 100 at words[i:] ("thirty", "thirty four", "treinta y dos", "twelve")."""
+    if i < len(words) and words[i][0] == JOIN:
+        # "five hundred and five" / "treinta y dos"
+        if i + 1 < len(words) and words[i + 1][0] in (UNIT, TEEN, TENS):
+            i += 1
+        else:
+            return 0, i
+    if i >= len(words):
+        return 0, i
+    kind, value = words[i]
+    if kind == TEEN:
+        return value, i + 1
+    if kind == TENS:
+        i += 1
+        if i < len(words) and words[i][0] == UNIT and words[i][1]:
+            return value + words[i][1], i + 1
+        if i + 1 < len(words) and words[i][0] == JOIN and words[i + 1][0] == UNIT:
+            return value + words[i + 1][1], i + 2
+        return value, i
+    # A bare digit after "hundred" starts the next group: "eight hundred, five five five"
+    if kind == UNIT and not after_hundred:
+        return value, i + 1
+    return 0, i
+
+
+def _digits(words: List[tuple]) -> Optional[str]:
+    """Digits for one run of (kind, value) words, or None if it isn't dictation."""
+    out: List[str] = []
+    i = 0
+    while i < len(words):
+        kind, value = words[i]
+        if kind == "digits":
+            out.append(value)
+            i += 1
+        elif kind == REPEAT:
+            if i + 1 >= len(words) or words[i + 1][0] not in (UNIT, OH):
+                return None
+            out.append(str(words[i + 1][1]) * value)
+            i += 2
+        elif kind == OH:
+            if not out:
+                return None   # "Oh, ..." is an interjection
+            out.append("0")
+            i += 1
+        elif kind == UNIT:
+            if i + 1 < len(words) and words[i + 1][0] == HUNDRED:
+                tail, i = _tail(words, i + 2, after_hundred=True)
+                out.append(str(value * 100 + tail))
+            else:
+                out.append(str(value))
+                i += 1
+        elif kind == HUNDREDS:
+            tail, i = _tail(words, i + 1, after_hundred=True)
+            out.append(str(value + tail))
+        elif kind in (TEEN, TENS):
+            number, i = _tail(words, i, after_hundred=False)
+            out.append(str(number))
+        else:
+            return None
+    digits = "".join(out)
+    if len(digits) == _MAX_DIGITS and not digits.startswith("1"):
+        return None   # 11 digits is a country code plus ten, not a phone and a stray "two"
+    if _MIN_DIGITS <= len(digits) <= _MAX_DIGITS:
+        return digits
+    return None
+
+
+def normalize_spoken_numbers(text: str, language: Optional[str] = "en") -> str:
+    """Rewrite dictated numbers as digits; everything else is returned untouched."""
+    if not text:
+        return text
+    vocab = _VOCAB[(language or "").lower().startswith("es")]
+    tokens = _TOKEN.findall(text)
+    out: List[str] = []
+    run: List[str] = []           # original tokens of the current run
+    words: List[tuple] = []       # (kind, value) of its number words
+    run_end = words_end = 0       # lengths up to the last number word (not a trailing "and")
+    cuts: List[tuple] = []        # (run_end, words_end) at each separator inside the run
+    has_word = False
+
+    def close():
+        nonlocal run, words, run_end, words_end, cuts, has_word
+        digits = None
+        if has_word:
+            # Whole run first, then the longest prefix ending at a separator
+            for cut_run, cut_words in [(run_end, words_end)] + cuts[::-1]:
+                digits = _digits(words[:cut_words])
+                if digits is not None:
+                    out.append(digits)
+                    out.extend(run[cut_run:])
+                    break
+        if digits is None:
+            out.extend(run)
+        run, words, run_end, words_end, cuts, has_word = [], [], 0, 0, [], False
+
+    for token in tokens:
+        entry = vocab.get(token.lower())
+        if token.isdigit():
+            entry = ("digits", token)
+        if entry is not None and (run or entry[0] not in (OH, JOIN, HUNDRED)):
+            run.append(token)
+            words.append(entry)
+            if entry[0] != JOIN:
+                run_end, words_end = len(run), len(words)
+                has_word = has_word or entry[0] != "digits"
+            continue
+        if run and (token.isspace() or token in _RUN_SEPARATORS):
+            if token in _RUN_SEPARATORS:
+                cuts.append((run_end, words_end))
+            run.append(token)
+            continue
+        if run:
+            close()
+        out.append(token)
+    if run:
+        close()
+    return "".join(out)